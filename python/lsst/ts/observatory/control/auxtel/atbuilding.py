@@ -82,6 +82,12 @@ class ATBuilding(RemoteGroup):
         used to limit the resources allocated by the class by gathering some
         knowledge about the usage intention. By default allocates all
         resources.
+    lazy : `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared : `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
 
     Attributes
     ----------
@@ -93,6 +99,8 @@ class ATBuilding(RemoteGroup):
         domain: typing.Optional[salobj.Domain] = None,
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
 
         super().__init__(
@@ -102,6 +110,8 @@ class ATBuilding(RemoteGroup):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
     @property
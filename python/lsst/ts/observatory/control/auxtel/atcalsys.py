@@ -22,7 +22,6 @@ __all__ = ["ATCalsys", "ATCalsysUsages"]
 
 import asyncio
 import logging
-import time
 import typing
 from dataclasses import dataclass
 
@@ -32,7 +31,7 @@ from lsst.ts.xml.enums.ATMonochromator import Grating
 
 from ..base_calsys import BaseCalsys
 from ..remote_group import Usages
-from ..utils import CalibrationType
+from ..utils import CalibrationType, traced
 from . import LATISS
 
 
@@ -114,6 +113,12 @@ class ATCalsys(BaseCalsys):
         knowledge about the usage intention. By default allocates all
         resources.
     latiss: LATISS
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -122,6 +127,8 @@ class ATCalsys(BaseCalsys):
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
         latiss: typing.Optional[LATISS] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         self.electrometer_index = 201
         self.fiberspectrograph_index = 3
@@ -136,6 +143,8 @@ class ATCalsys(BaseCalsys):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
         self.latiss = latiss
@@ -395,6 +404,7 @@ class ATCalsys(BaseCalsys):
                 fiberspectrograph_exptimes.append(None)
         return fiberspectrograph_exptimes
 
+    @traced
     async def run_calibration_sequence(
         self, sequence_name: str, exposure_metadata: dict
     ) -> dict:
@@ -664,8 +674,8 @@ class ATCalsys(BaseCalsys):
         Taken from power_on_atcalsys.py
         PAF: I think this can be improved.
         """
-        start_chill_time = time.time()
-        while time.time() - start_chill_time < self.long_long_timeout * 8:
+        start_chill_time = self.clock.time()
+        while self.clock.time() - start_chill_time < self.long_long_timeout * 8:
             chiller_temps = await self.rem.atwhitelight.tel_chillerTemperatures.next(
                 flush=True, timeout=self.long_timeout
             )
@@ -679,7 +689,7 @@ class ATCalsys(BaseCalsys):
                 / chiller_temps.setTemperature
                 <= self.chiller_temp_tolerance_relative
             ):
-                chill_time = time.time() - start_chill_time
+                chill_time = self.clock.time() - start_chill_time
                 self.log.info(
                     f"Chiller reached target temperature, {tel_chiller_temp:0.1f} deg "
                     f"within tolerance, in {chill_time:0.1f} s."
@@ -24,6 +24,7 @@ import asyncio
 import copy
 import enum
 import logging
+import pathlib
 import typing
 
 import astropy.units as u
@@ -36,7 +37,7 @@ from lsst.ts.xml.enums import ATMCS, ATDome, ATPneumatics, ATPtg
 from ..base_tcs import BaseTCS
 from ..constants import atcs_constants
 from ..remote_group import Usages, UsagesResources
-from ..utils import InstrumentFocus
+from ..utils import AxisLimits, InstrumentFocus, SlewPosition, SlewTimeModel
 
 
 class ATCSUsages(Usages):
@@ -99,6 +100,20 @@ class ATCS(BaseTCS):
         used to limit the resources allocated by the class by gathering some
         knowledge about the usage intention. By default allocates all
         resources.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
+    iers_path : `str`, `pathlib.Path` or `None`, optional
+        Local IERS-A file used for the sidereal time and coordinate
+        transformations. If given, astropy IERS downloads are disabled, the
+        table is read from this file (or the IERS-B table bundled with
+        astropy is used if the file does not exist) and the sidereal time
+        grid is computed, so the first slew does not stall on a download.
+        See `TimeService.load_iers`. If `None` (default) astropy handles the
+        IERS table as configured.
 
     Attributes
     ----------
@@ -117,6 +132,9 @@ class ATCS(BaseTCS):
         domain: typing.Optional[salobj.Domain] = None,
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
+        lazy: bool = False,
+        shared: bool = False,
+        iers_path: typing.Union[str, pathlib.Path, None] = None,
     ) -> None:
         super().__init__(
             components=[
@@ -131,6 +149,9 @@ class ATCS(BaseTCS):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
+            iers_path=iers_path,
         )
 
         self.instrument_focus = InstrumentFocus.Nasmyth
@@ -139,6 +160,16 @@ class ATCS(BaseTCS):
         # it should read this from events.
         self.rotator_limits = [-270.0, +270.0]
 
+        # Nominal kinematic limits; fit the model to recorded slews for the
+        # actual performance.
+        self.slew_time_model = SlewTimeModel(
+            az=AxisLimits(velocity=3.0, acceleration=1.0),
+            el=AxisLimits(velocity=3.0, acceleration=1.0),
+            rot=AxisLimits(velocity=3.0, acceleration=1.0),
+            dome=AxisLimits(velocity=1.0, acceleration=0.5),
+            settle_time=self.tel_settle_time,
+        )
+
         self.open_dome_shutter_time = 600.0
         self.open_dropout_door_time = 300.0
 
@@ -276,7 +307,7 @@ class ATCS(BaseTCS):
         assert self._tel_position_updated is not None
 
         self._tel_position_updated.clear()
-        await asyncio.wait_for(self._tel_position_updated.wait(), timeout=timeout)
+        await self.clock.wait_for(self._tel_position_updated.wait(), timeout=timeout)
         return self._tel_position
 
     async def next_telescope_target(
@@ -303,7 +334,7 @@ class ATCS(BaseTCS):
         assert self._tel_target_updated is not None
 
         self._tel_target_updated.clear()
-        await asyncio.wait_for(self._tel_target_updated.wait(), timeout=timeout)
+        await self.clock.wait_for(self._tel_target_updated.wait(), timeout=timeout)
         return self._tel_target
 
     @property
@@ -361,6 +392,10 @@ class ATCS(BaseTCS):
         if timeout is None:
             timeout = self.long_long_timeout
 
+        # Dome following stays disabled after this move, so it is no longer
+        # resumed after a previous pre-positioning of the dome.
+        self._dome_pre_positioned = False
+
         await self.disable_dome_following(_check)
 
         self.rem.atdome.evt_azimuthInPosition.flush()
@@ -409,6 +444,31 @@ class ATCS(BaseTCS):
 
             await monitor_position_task
 
+    async def _move_dome_azimuth(self, az: float, check: typing.Any = None) -> None:
+        """Command the dome to move in azimuth, without waiting for it to
+        get in position.
+
+        Parameters
+        ----------
+        az : `float`
+            Azimuth angle for the dome (in deg).
+        check : `types.SimpleNamespace` or `None`
+            Override `self.check` for defining which resources are used.
+
+        Raises
+        ------
+        RuntimeError
+            If the dome is deactivated in ``check``.
+        """
+        if not (self.check if check is None else check).atdome:
+            raise RuntimeError("ATDome is deactivated. Cannot move the dome.")
+
+        self.rem.atdome.evt_azimuthInPosition.flush()
+
+        await self.rem.atdome.cmd_moveAzimuth.set_start(
+            azimuth=az, timeout=self.long_long_timeout
+        )
+
     async def prepare_for_flatfield(self, check: typing.Any = None) -> None:
         """A high level method to position the telescope and dome for flat
         field operations.
@@ -507,6 +567,8 @@ class ATCS(BaseTCS):
                     flush=False, timeout=self.long_timeout
                 )
 
+        await self._resume_dome_following()
+
     async def stop_all(self) -> None:
         """Stop telescope and dome."""
 
@@ -586,7 +648,7 @@ class ATCS(BaseTCS):
                 f"Waiting {self.dome_vent_open_shutter_time}s for the dome to open."
             )
 
-            await asyncio.sleep(self.dome_vent_open_shutter_time)
+            await self.clock.sleep(self.dome_vent_open_shutter_time)
 
             await self.stop_dome()
 
@@ -849,7 +911,7 @@ class ATCS(BaseTCS):
                 )
             )
 
-            self.rem.atdome.evt_summaryState.flush()
+            self.flush_summary_state("atdome")
             task_list = [
                 asyncio.create_task(self.check_component_state("atdome")),
                 asyncio.create_task(
@@ -895,7 +957,7 @@ class ATCS(BaseTCS):
 
         await self.rem.atdome.cmd_homeAzimuth.start()
 
-        await asyncio.sleep(self.fast_timeout)  # Give the dome time to start moving
+        await self.clock.sleep(self.fast_timeout)  # Give the dome time to start moving
 
         # Work around for when the atdome is pressing the limit switch when
         # we issue a home command.
@@ -1029,7 +1091,7 @@ class ATCS(BaseTCS):
                 )
             )
 
-            self.rem.atdome.evt_summaryState.flush()
+            self.flush_summary_state("atdome")
             task_list = [
                 asyncio.create_task(self.check_component_state("atdome")),
                 asyncio.create_task(
@@ -1072,7 +1134,7 @@ class ATCS(BaseTCS):
                 )
             )
 
-            self.rem.atdome.evt_summaryState.flush()
+            self.flush_summary_state("atdome")
 
             task_list = [
                 asyncio.create_task(self.check_component_state("atdome")),
@@ -1568,6 +1630,8 @@ class ATCS(BaseTCS):
 
         _check = self.check if check is None else check
 
+        await self._resume_dome_following()
+
         if stop_before_slew:
             try:
                 await self.stop_tracking()
@@ -1611,7 +1675,7 @@ class ATCS(BaseTCS):
         try:
             for comp in self.components_attr:
                 if getattr(_check, comp):
-                    getattr(self.rem, comp).evt_summaryState.flush()
+                    self.flush_summary_state(comp)
                     self.scheduled_coro.append(
                         asyncio.create_task(self.check_component_state(comp))
                     )
@@ -1665,6 +1729,31 @@ class ATCS(BaseTCS):
 
         return angle
 
+    async def get_slew_position(self) -> SlewPosition:
+        """Get the current position of the telescope axes and dome, as
+        used by the slew time estimates.
+
+        Returns
+        -------
+        position : `SlewPosition`
+            Mount azimuth and elevation, selected nasmyth rotator and dome
+            azimuth (deg).
+        """
+        tel_position = await self.rem.atmcs.tel_mount_AzEl_Encoders.aget(
+            timeout=self.fast_timeout
+        )
+        nasmyth_angle = await self.get_selected_nasmyth_angle()
+        dome_position = await self.rem.atdome.tel_position.aget(
+            timeout=self.fast_timeout
+        )
+
+        return SlewPosition(
+            az=tel_position.azimuthCalculatedAngle[-1],
+            el=tel_position.elevationCalculatedAngle[-1],
+            rot=nasmyth_angle,
+            dome_az=dome_position.azimuthPosition,
+        )
+
     async def get_selected_nasmyth_angle(self) -> float:
         """Get selected nasmyth angle.
 
@@ -1757,7 +1846,7 @@ class ATCS(BaseTCS):
 
         if in_position.inPosition:
             self.log.debug("ATMCS in position, handling potential race condition.")
-            await asyncio.sleep(self.tel_settle_time)
+            await self.settle(self.tel_settle_time, component="atmcs")
             in_position = await self.rem.atmcs.evt_allAxesInPosition.aget(
                 timeout=self.long_timeout
             )
@@ -1839,7 +1928,7 @@ class ATCS(BaseTCS):
             self.log.debug(
                 f"Wait additional {self.tel_settle_time}s for telescope to settle."
             )
-            await asyncio.sleep(self.tel_settle_time)
+            await self.settle(self.tel_settle_time)
 
         return status
 
@@ -1899,7 +1988,7 @@ class ATCS(BaseTCS):
             self.log.debug(
                 "Dome following enabled. Waiting for dome to get in position."
             )
-            await asyncio.wait_for(self.dome_az_in_position.wait(), timeout=timeout)
+            await self.clock.wait_for(self.dome_az_in_position.wait(), timeout=timeout)
         self.log.info("ATDome in position.")
         return "ATDome in position."
 
@@ -2041,7 +2130,7 @@ class ATCS(BaseTCS):
             else:
                 break
 
-            await asyncio.sleep(1.0)
+            await self.clock.sleep(1.0)
 
         if in_position:
             self.log.debug("Axes in position.")
@@ -20,7 +20,6 @@
 
 __all__ = ["ATCalSys"]
 
-import asyncio
 import logging
 import typing
 
@@ -49,6 +48,12 @@ class ATCalSys(RemoteGroup):
         used to limit the resources allocated by the class by gathering some
         knowledge about the usage intention. By default allocates all
         resources.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -58,6 +63,8 @@ class ATCalSys(RemoteGroup):
         domain: typing.Optional[salobj.Domain] = None,
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         self.electrometer_index = electrometer_index
         self.fiber_spectrograph_index = fiber_spectrograph_index
@@ -71,6 +78,8 @@ class ATCalSys(RemoteGroup):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
     async def setup_monochromator(
@@ -164,7 +173,7 @@ class ATCalSys(RemoteGroup):
         """
         if wait_for is not None:
             await wait_for
-        await asyncio.sleep(delay)
+        await self.clock.sleep(delay)
 
         timeout = integration_time + self.long_timeout
 
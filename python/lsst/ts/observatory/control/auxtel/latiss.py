@@ -88,6 +88,12 @@ class LATISS(BaseCamera):
     tcs_ready_to_take_data: `coroutine`
         A coroutine that waits for the telescope control system to be ready
         to take data.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -98,6 +104,8 @@ class LATISS(BaseCamera):
         tcs_ready_to_take_data: typing.Optional[
             typing.Callable[[], typing.Awaitable]
         ] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         super().__init__(
             components=["ATCamera", "ATSpectrograph", "ATHeaderService", "ATOODS"],
@@ -105,6 +113,8 @@ class LATISS(BaseCamera):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
             tcs_ready_to_take_data=tcs_ready_to_take_data,
         )
 
@@ -56,6 +56,12 @@ class BaseCalsys(RemoteGroup, metaclass=abc.ABCMeta):
         used to limit the resources allocated by the class by gathering some
         knowledge about the usage intention. By default allocates all
         resources.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -64,12 +70,16 @@ class BaseCalsys(RemoteGroup, metaclass=abc.ABCMeta):
         domain: typing.Optional[salobj.Domain] = None,
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         super().__init__(
             components=components,
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
         self.calibration_config: dict[str, dict[str, typing.Any]] = dict()
@@ -31,7 +31,7 @@ import astropy
 from lsst.ts import salobj
 
 from .remote_group import RemoteGroup
-from .utils import CameraExposure, ROISpec
+from .utils import CameraExposure, ROISpec, traced
 
 
 class CameraSubstate(enum.IntEnum):
@@ -63,6 +63,12 @@ class BaseCamera(RemoteGroup, metaclass=abc.ABCMeta):
     tcs_ready_to_take_data: `coroutine`
         A coroutine that waits for the telescope control system to be ready
         to take data.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -73,12 +79,16 @@ class BaseCamera(RemoteGroup, metaclass=abc.ABCMeta):
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
         tcs_ready_to_take_data: typing.Callable[[], typing.Awaitable] | None = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         super().__init__(
             components=components,
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
         self.read_out_time = 2.0  # readout time (sec)
@@ -1280,6 +1290,7 @@ class BaseCamera(RemoteGroup, metaclass=abc.ABCMeta):
             **kwargs,
         )
 
+    @traced
     async def take_imgtype(
         self,
         imgtype: str,
@@ -1377,7 +1388,7 @@ class BaseCamera(RemoteGroup, metaclass=abc.ABCMeta):
         if imgtype in tcs_ready_imgtypes and self.ready_to_take_data is not None:
             self.log.debug(f"imagetype: {imgtype}, wait for TCS to be ready.")
             try:
-                await asyncio.wait_for(
+                await self.clock.wait_for(
                     self.ready_to_take_data(),
                     timeout=self.max_tcs_wait_time,
                 )
@@ -1824,14 +1835,14 @@ class BaseCamera(RemoteGroup, metaclass=abc.ABCMeta):
             self.log.debug(
                 f"Exposing {i+1} of {camera_exposure.n_shift} for {camera_exposure.exp_time} seconds."
             )
-            await asyncio.sleep(camera_exposure.exp_time)
+            await self.clock.sleep(camera_exposure.exp_time)
             self.log.debug(f"Shifting {camera_exposure.row_shift} rows.")
             await self.camera.cmd_discardRows.set_start(
                 nRows=camera_exposure.row_shift, timeout=self.long_timeout
             )
 
         self.log.debug("Last shift-expose sequence.")
-        await asyncio.sleep(camera_exposure.exp_time)
+        await self.clock.sleep(camera_exposure.exp_time)
 
     async def next_exposure_id(self) -> int:
         """Get the exposure id from the next endReadout event.
@@ -25,6 +25,7 @@ import asyncio
 import contextlib
 import enum
 import logging
+import pathlib
 import typing
 import warnings
 from functools import partial
@@ -40,18 +41,30 @@ from astropy.time import Time
 from astroquery.simbad import Simbad
 from lsst.ts import salobj
 from lsst.ts.utils import (
+    angle_diff,
     angle_wrap_center,
     astropy_time_from_tai_unix,
-    current_tai,
     index_generator,
 )
 
 from .remote_group import RemoteGroup
 from .utils import (
+    CATALOG_FORMATS,
+    CatalogIndex,
+    CoordinateEngine,
     InstrumentFocus,
+    NameResolverCache,
+    NoTargetError,
     RotType,
+    SlewPlan,
+    SlewPosition,
+    SlewTimeModel,
+    TimeService,
     calculate_parallactic_angle,
     get_catalogs_path,
+    order_by_cost,
+    read_catalog,
+    traced,
 )
 from .utils.extras.dm_target_catalog import DM_STACK_AVAILABLE
 from .utils.type_hints import (
@@ -83,6 +96,20 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
     concurrent_operation : `bool`, optional
         If `False`, tasks like `enable` and other concurrent tasks will be done
         sequentially. Default=True.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
+    iers_path : `str`, `pathlib.Path` or `None`, optional
+        Local IERS-A file used for the sidereal time and coordinate
+        transformations. If given, astropy IERS downloads are disabled, the
+        table is read from this file (or the IERS-B table bundled with
+        astropy is used if the file does not exist) and the sidereal time
+        grid is computed, so the first slew does not stall on a download.
+        See `TimeService.load_iers`. If `None` (default) astropy handles the
+        IERS table as configured.
     """
 
     def __init__(
@@ -92,12 +119,17 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         log: logging.Logger | None = None,
         intended_usage: int | None = None,
         concurrent_operation: bool = True,
+        lazy: bool = False,
+        shared: bool = False,
+        iers_path: typing.Union[str, pathlib.Path, None] = None,
     ) -> None:
         super().__init__(
             components=components,
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
             concurrent_operation=concurrent_operation,
         )
 
@@ -105,6 +137,16 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             lon=-70.747698 * u.deg, lat=-30.244728 * u.deg, height=2663.0 * u.m
         )
 
+        # Fast approximate coordinate transformations, see
+        # enable_coordinate_engine.
+        self.coordinate_engine: typing.Optional[CoordinateEngine] = None
+
+        # Interpolated sidereal time and IERS handling.
+        self.time_service = TimeService(location=self.location, log=self.log)
+        if iers_path is not None:
+            self.time_service.load_iers(iers_path)
+            self.time_service.prepare(self.clock.tai())
+
         self.track_id_gen = index_generator()
 
         self.instrument_focus = InstrumentFocus.Prime
@@ -115,6 +157,39 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         # it should read this from events.
         self.rotator_limits = [-90.0, +90.0]
 
+        # Predict which rotator angle alternative stays within the rotator
+        # limits for the whole track before slewing, instead of trying them
+        # in turn, see get_feasible_rot_angle_alternatives.
+        self.rotator_feasibility_check = False
+        # Margin to the rotator limits used by the prediction (deg) and
+        # spacing of the track samples (sec).
+        self.rotator_feasibility_margin = 1.0
+        self.rotator_feasibility_step = 60.0
+
+        # Slew time estimates, see estimate_slew_time and order_targets. If
+        # slew_time_recording is set, slew_icrs records the duration of the
+        # slews so the model can be fit with slew_time_model.fit.
+        self.slew_time_model = SlewTimeModel(settle_time=self.tel_settle_time)
+        self.slew_time_recording = False
+
+        # How long a slew plan from prepare_slew can be used before or after
+        # the time it was computed for (sec). Plans for SkyAuto and
+        # Parallactic rotation types are valid for less time if the rotator
+        # angle would change within that time, see _get_rot_angle_validity.
+        self.slew_plan_validity = 60.0
+        # Number of samples on each side of the time of a slew plan used to
+        # check the rotator angle over its validity, and tolerance of the
+        # Parallactic rotator angle over it (deg).
+        self.slew_plan_validity_samples = 10
+        self.slew_plan_rot_tolerance = 0.1
+
+        # Tolerance of the dome azimuth with respect to the telescope.
+        self.dome_slew_tolerance = Angle(1.5 * u.deg)
+        # Margin to dome_slew_tolerance used when pre-positioning the dome
+        # for the next target (deg), see pre_position_dome.
+        self.dome_pre_position_margin = 0.5
+        self._dome_pre_positioned = False
+
         # Parity of x and y axis. These can be 1 or -1 depending on how the
         # x axis in the boresight is aligned with the telescope axis. For
         # instance, Nasmyth angle right has parity 1 and Nasmyth angle left has
@@ -133,8 +208,35 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         # Dictionary to store name->coordinates of objects
         self._object_list: typing.Dict[str, ICRS] = dict()
 
+        # Persistent name->coordinates cache shared between processes, see
+        # enable_name_resolver_cache.
+        self.name_resolver_cache: typing.Optional[NameResolverCache] = None
+
+        # Sources used by find_target, in order of priority, with how long
+        # to wait for each of them (sec).
+        self.find_target_deadlines: typing.Dict[str, float] = dict(
+            local_catalog=self.fast_timeout,
+            simbad=self.long_long_timeout,
+            dm_butler=2.0 * self.long_long_timeout,
+        )
+        # How long find_target waits for a higher priority source before
+        # taking the result of a lower priority one (sec).
+        self.find_target_latency_budget = 10.0
+        # How long find_target remembers that a source has no target in a
+        # region of the sky (sec).
+        self.find_target_negative_cache_ttl = 600.0
+        # How far a search cone can extend outside of a cone that had no
+        # target and still be skipped (deg). This covers the drift of the
+        # sky between repeated searches at the same Az/El.
+        self.find_target_negative_cache_tolerance = 0.01
+        # Searches that found no target, by source, as
+        # (region, expiration time) with regions from _get_find_target_region.
+        self._find_target_negative_cache: typing.Dict[
+            str, typing.List[typing.Tuple[typing.Tuple, float]]
+        ] = dict()
+
         self._catalog: pandas.DataFrame = pandas.DataFrame([])
-        self._catalog_coordinates: typing.Union[None, SkyCoord] = None
+        self._catalog_index: typing.Union[None, CatalogIndex] = None
 
     def object_list_clear(self) -> None:
         """Remove all objects stored in the internal object list."""
@@ -179,6 +281,11 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
     def object_list_get(self, name: str) -> ICRS:
         """Get an object from the list or query Simbad and return it.
 
+        If the object is not in the list, it is looked up in the internal
+        catalog, if loaded, and then in the persistent name resolver cache,
+        if enabled, before querying Simbad. This method blocks while querying
+        Simbad; use `object_list_aget` from coroutines.
+
         Parameters
         ----------
         name: `str`
@@ -190,31 +297,195 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             Table row with object information.
         """
 
-        if name not in self._object_list:
-            object_table = self._query_object(name)
+        if name in self._object_list:
+            return self._object_list[name]
 
-            if len(object_table) > 1:
-                self.log.warning(
-                    f"Found more than one entry for {name}. Using first one."
-                )
+        radec_icrs = (
+            self._resolve_object(name)
+            if self._is_in_catalog(name)
+            else self._get_cached_object(name)
+        )
 
-            # Get RA and DEC keyword from table
-            ra_key, ra_coordinates = (
-                ("RA", u.hourangle) if "RA" in object_table.columns else ("ra", u.deg)
-            )
-            dec_key = "DEC" if "DEC" in object_table.columns else "dec"
+        if radec_icrs is None:
+            try:
+                radec_icrs = self._resolve_object(name)
+            except Exception:
+                radec_icrs = self._get_cached_object(name, allow_expired=True)
+                if radec_icrs is None:
+                    raise
 
-            ra = Angle(object_table[0][ra_key], unit=ra_coordinates)
-            dec = Angle(object_table[0][dec_key], unit=u.deg)
+        self.object_list_add(name, radec_icrs)
 
-            radec_icrs = ICRS(
-                ra=ra.to(u.hourangle),
-                dec=dec,
-            )
+        return radec_icrs
 
+    async def object_list_aget(self, name: str) -> ICRS:
+        """Get an object from the list or query Simbad and return it, without
+        blocking the event loop.
+
+        Same as `object_list_get`, but the name resolver cache lookups and
+        the Simbad query run in an executor.
+
+        Parameters
+        ----------
+        name: `str`
+            Name of the object.
+
+        Returns
+        -------
+        radec: `ICRS`
+            Object coordinates.
+        """
+
+        if name in self._object_list:
+            return self._object_list[name]
+
+        loop = asyncio.get_running_loop()
+
+        # The internal catalog is in memory, so there is no need to use the
+        # executor or the name resolver cache.
+        radec_icrs = (
+            self._resolve_object(name)
+            if self._is_in_catalog(name)
+            else await loop.run_in_executor(None, self._get_cached_object, name)
+        )
+
+        if radec_icrs is None:
+            try:
+                radec_icrs = await loop.run_in_executor(
+                    None, self._resolve_object, name
+                )
+            except Exception:
+                radec_icrs = await loop.run_in_executor(
+                    None, partial(self._get_cached_object, name, allow_expired=True)
+                )
+                if radec_icrs is None:
+                    raise
+
+        if name not in self._object_list:
             self.object_list_add(name, radec_icrs)
+
+        return self._object_list[name]
+
+    def enable_name_resolver_cache(
+        self,
+        path: typing.Union[str, pathlib.Path, None] = None,
+        ttl: float = 30.0 * 86400.0,
+    ) -> NameResolverCache:
+        """Keep resolved object names in a persistent cache.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`, optional
+            Cache database file. Processes using the same file share the
+            cache. By default use the file in `get_default_cache_path`.
+        ttl : `float`, optional
+            Time to live of the cache entries (sec). Expired entries are
+            still used if the object cannot be resolved otherwise, e.g.
+            during network outages.
+
+        Returns
+        -------
+        name_resolver_cache : `NameResolverCache`
+            The cache, which can be used to pre-seed it.
+        """
+        self.name_resolver_cache = NameResolverCache(path=path, ttl=ttl)
+        return self.name_resolver_cache
+
+    def _get_cached_object(
+        self, name: str, allow_expired: bool = False
+    ) -> typing.Optional[ICRS]:
+        """Get an object from the persistent name resolver cache.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the object.
+        allow_expired : `bool`, optional
+            Use expired entries?
+
+        Returns
+        -------
+        radec : `ICRS` or `None`
+            Object coordinates, or `None` if the cache is not enabled or does
+            not have the object.
+        """
+        if self.name_resolver_cache is None:
+            return None
+
+        radec = self.name_resolver_cache.get(name, allow_expired=allow_expired)
+
+        if radec is None:
+            return None
+
+        if allow_expired:
+            self.log.warning(f"Could not resolve {name}; using cached coordinates.")
         else:
-            radec_icrs = self._object_list[name]
+            self.log.debug(f"Found {name} in name resolver cache.")
+
+        return ICRS(
+            ra=Angle(radec[0], unit=u.deg).to(u.hourangle),
+            dec=Angle(radec[1], unit=u.deg),
+        )
+
+    def _is_in_catalog(self, name: str) -> bool:
+        """Is an object in the internal catalog?
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the object.
+
+        Returns
+        -------
+        in_catalog : `bool`
+            `True` if the catalog is loaded and has the object.
+        """
+        return self.is_catalog_loaded() and bool(name in self._catalog["MAIN_ID"])
+
+    def _resolve_object(self, name: str) -> ICRS:
+        """Resolve an object name in the internal catalog or with Simbad.
+
+        Objects resolved with Simbad are stored in the persistent name
+        resolver cache, if enabled. Objects in the internal catalog are not,
+        since the catalog is loaded by each process and the cache may be
+        shared with processes that use a different catalog.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the object.
+
+        Returns
+        -------
+        radec : `ICRS`
+            Object coordinates.
+        """
+        object_table = self._query_object(name)
+
+        if len(object_table) > 1:
+            self.log.warning(f"Found more than one entry for {name}. Using first one.")
+
+        # Get RA and DEC keyword from table
+        ra_key, ra_coordinates = (
+            ("RA", u.hourangle) if "RA" in object_table.columns else ("ra", u.deg)
+        )
+        dec_key = "DEC" if "DEC" in object_table.columns else "dec"
+
+        ra = Angle(object_table[0][ra_key], unit=ra_coordinates)
+        dec = Angle(object_table[0][dec_key], unit=u.deg)
+
+        radec_icrs = ICRS(
+            ra=ra.to(u.hourangle),
+            dec=dec,
+        )
+
+        if self.name_resolver_cache is not None and not self._is_in_catalog(name):
+            self.name_resolver_cache.put(
+                name,
+                ra=ra.deg,
+                dec=dec.deg,
+                source="simbad",
+            )
 
         return radec_icrs
 
@@ -262,18 +533,24 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
                 f"Must be one of {available_catalogs}."
             )
 
-        self.log.info(f"Loading {catalog_name}...")
-
-        self._catalog = Table.read(
-            get_catalogs_path() / f"{catalog_name}.pd",
-            format="pandas.json",
+        catalog_path = next(
+            path
+            for path in (
+                get_catalogs_path() / f"{catalog_name}{extension}"
+                for extension in CATALOG_FORMATS
+            )
+            if path.exists()
         )
 
-        self.log.debug("Creating coordinate catalog...")
-        self._catalog_coordinates = SkyCoord(
-            Angle(self._catalog["RA"], unit=u.hourangle),
-            Angle(self._catalog["DEC"], unit=u.deg),
-            frame="icrs",
+        self.log.info(f"Loading {catalog_name} from {catalog_path.name}...")
+
+        self._catalog = read_catalog(catalog_path)
+
+        self.log.debug("Creating catalog index...")
+        self._catalog_index = CatalogIndex(
+            ra=Angle(self._catalog["RA"], unit=u.hourangle).deg,
+            dec=Angle(self._catalog["DEC"], unit=u.deg).deg,
+            mag=self._catalog["FLUX_V"],
         )
 
         self.log.debug(f"Loaded catalog with {len(self._catalog)} targets.")
@@ -281,6 +558,9 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
     def list_available_catalogs(self) -> typing.Set[str]:
         """List of available catalogs to load.
 
+        Catalogs can be either binary (".npy") or pandas json (".pd") files,
+        see `convert_catalog`. If both exist, the binary file is loaded.
+
         Returns
         -------
         catalog_names : `set`
@@ -293,7 +573,8 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         return set(
             [
                 splitext(file_name.name)[0]
-                for file_name in get_catalogs_path().glob("*.pd")
+                for extension in CATALOG_FORMATS
+                for file_name in get_catalogs_path().glob(f"*{extension}")
             ]
         )
 
@@ -305,10 +586,10 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             self.log.debug(f"Removing catalog with {len(self._catalog)} targets.")
 
             del self._catalog
-            del self._catalog_coordinates
+            del self._catalog_index
 
             self._catalog = pandas.DataFrame([])
-            self._catalog_coordinates = None
+            self._catalog_index = None
 
     def is_catalog_loaded(self) -> bool:
         """Check if catalog is loaded.
@@ -449,7 +730,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
 
         """
 
-        radec_icrs = self.object_list_get(name)
+        radec_icrs = await self.object_list_aget(name)
 
         self.log.info(
             f"Slewing to {name}: {radec_icrs.ra.to_string()} {radec_icrs.dec.to_string()}"
@@ -470,6 +751,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             slew_timeout=slew_timeout,
         )
 
+    @traced
     async def slew_icrs(
         self,
         ra: float,
@@ -486,6 +768,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         slew_timeout: float = 600.0,
         stop_before_slew: bool = False,
         wait_settle: bool = True,
+        plan: typing.Optional[SlewPlan] = None,
     ) -> typing.Tuple[ICRS, Angle]:
         """Slew the telescope and start tracking an Ra/Dec target in ICRS
         coordinate frame.
@@ -542,6 +825,10 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             additional sleep of `self.tel_settle_time` to the telescope
             positioning algorithm. Otherwise the algorithm will return as soon
             as it receives `allAxesInPosition` event from the ATMCS.
+        plan : `SlewPlan`, optional
+            Slew plan computed in advance with `prepare_slew`, so the slew
+            command can be sent right away. It is ignored, and the plan is
+            recomputed, if it was prepared for a different target or time.
 
         Returns
         -------
@@ -558,16 +845,233 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         """
         radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
 
-        rot_angle = Angle(rot, unit=u.deg)
+        tai = self.clock.tai()
+
+        if plan is not None and not plan.matches(
+            radec_icrs=radec_icrs,
+            rot=Angle(rot, unit=u.deg).deg,
+            rot_type=rot_type,
+            time_on_target=time_on_target,
+        ):
+            self.log.warning("Slew plan is for a different target. Recomputing.")
+            plan = None
+        elif plan is not None and not plan.is_valid(tai):
+            self.log.warning(
+                f"Slew plan computed for {plan.tai - tai:+.1f}s from now, outside "
+                f"its validity of {plan.validity}s. Recomputing."
+            )
+            plan = None
+
+        if plan is None:
+            plan = self._compute_slew_plan(
+                radec_icrs=radec_icrs,
+                rot=rot,
+                rot_type=rot_type,
+                time_on_target=time_on_target,
+                tai=tai,
+            )
 
-        current_time = astropy_time_from_tai_unix(current_tai())
+        rot_angle = plan.rot_angle
+        rot_frame = plan.rot_frame
+        rot_track_frame = plan.rot_track_frame
+        rot_angle_alternatives = plan.rot_angle_alternatives
 
-        current_time.location = self.location
+        slew_exception: typing.Union[None, Exception] = None
 
-        par_angle = calculate_parallactic_angle(
-            self.location,
-            current_time.sidereal_time("mean"),
-            radec_icrs,
+        slew_start: typing.Optional[SlewPosition] = None
+        if self.slew_time_recording and wait_settle:
+            slew_start = await self.get_slew_position()
+            slew_start_time = self.clock.time()
+
+        for rot_angle_to_try in rot_angle_alternatives:
+            try:
+                await self.slew(
+                    radec_icrs.ra.hour,
+                    radec_icrs.dec.deg,
+                    rotPA=rot_angle_to_try,
+                    target_name=target_name,
+                    frame=self.CoordFrame.ICRS,
+                    epoch=2000,
+                    equinox=2000,
+                    parallax=0,
+                    pmRA=0,
+                    pmDec=0,
+                    rv=0,
+                    dRA=dra,
+                    dDec=ddec,
+                    rot_frame=rot_frame,
+                    rot_track_frame=rot_track_frame,
+                    az_wrap_strategy=az_wrap_strategy,
+                    time_on_target=time_on_target,
+                    rot_mode=self.RotMode.FIELD,
+                    slew_timeout=slew_timeout,
+                    stop_before_slew=stop_before_slew,
+                    wait_settle=wait_settle,
+                    offset_x=offset_x,
+                    offset_y=offset_y,
+                )
+            except salobj.AckError as ack_error:
+                if "rotator position angle out of range" in ack_error.ackcmd.result:
+                    self.log.warning(
+                        "Target out of rotator limit. Trying different angle."
+                    )
+                    continue
+                elif "Target out of rotator limit" in ack_error.ackcmd.result:
+                    self.log.warning(
+                        "Target out of rotator limit. Trying different angle."
+                    )
+                    continue
+                elif "out of slew limit margin" in ack_error.ackcmd.result:
+                    self.log.warning(
+                        "Target out of rotator slew limit margin. Trying different angle."
+                    )
+                    continue
+                else:
+                    raise ack_error
+            except Exception as e:
+                slew_exception = e
+                break
+            else:
+                if self._overslew_az:
+                    try:
+                        overslew_az = 1.5 * 3600.0 * np.cos(np.radians(plan.el))
+                        self.log.info(
+                            "Overslew Azimuth feature is enabled. Slewing past target position by"
+                            f"{(overslew_az/3600.):.1f} degrees and waiting for settle."
+                        )
+                        await self.settle(self.tel_settle_time)
+                        await self.offset_azel(az=overslew_az, el=0, relative=False)
+                        await self.settle(self.tel_settle_time)
+                        self.log.info("Slewing back to target position.")
+                        await self.offset_azel(az=0, el=0, relative=False)
+                    except salobj.AckError as ack_error:
+                        if (
+                            "out of range"
+                            or "out of slew limit" in ack_error.ackcmd.result
+                        ):
+                            self.log.warning(
+                                "Overslew is out of operational limits. Skipping overslew."
+                            )
+                            continue
+                        else:
+                            raise ack_error
+                break
+        if slew_exception is not None:
+            raise slew_exception
+
+        if slew_start is not None:
+            self.slew_time_model.add_record(
+                start=slew_start,
+                end=await self.get_slew_position(),
+                duration=self.clock.time() - slew_start_time,
+            )
+
+        return radec_icrs, rot_angle
+
+    async def prepare_slew(
+        self,
+        ra: float,
+        dec: float,
+        rot: float = 0.0,
+        rot_type: RotType = RotType.SkyAuto,
+        time_on_target: float = 0.0,
+        lead_time: float = 0.0,
+        validity: typing.Optional[float] = None,
+    ) -> SlewPlan:
+        """Compute a slew plan for `slew_icrs` in advance.
+
+        The coordinate transformations, rotator angle and rotator
+        feasibility are computed for the expected start of the slew, so they
+        can be computed ahead of time, e.g. while the current exposure is
+        taken, and taken out of the time between exposures. The computation
+        runs on the event loop, because it uses the sidereal time grid, the
+        coordinate engine anchors and the IERS table, which are shared with
+        the other coordinate transformations and are not thread safe.
+
+        Parameters
+        ----------
+        ra : `float`, `str` or `astropy.coordinates.Angle`
+            Target RA, either as a float (hour), a sexagesimal string
+            (HH:MM:SS.S or HH MM SS.S) coordinates or
+            `astropy.coordinates.Angle`.
+        dec : `float`, `str` or `astropy.coordinates.Angle`
+            Target Dec, either as a float (deg), a sexagesimal string
+            (DD:MM:SS.S or DD MM SS.S) coordinates or
+            `astropy.coordinates.Angle`.
+        rot : `float`, `str` or `astropy.coordinates.Angle`
+            Rotation angle, see `slew_icrs`.
+        rot_type :  `lsst.ts.observatory.control.utils.RotType`
+            Rotation type, see `slew_icrs`.
+        time_on_target : `float`, optional
+            Estimated time on target (sec).
+        lead_time : `float`, optional
+            Time from now when the slew is expected to start (sec).
+        validity : `float`, optional
+            How long before or after the expected start of the slew the plan
+            can be used (sec). By default use `slew_plan_validity`. For
+            `RotType.SkyAuto` and `RotType.Parallactic` the validity is
+            reduced if the rotator angle would change within it.
+
+        Returns
+        -------
+        plan : `SlewPlan`
+            Slew plan, to be passed to `slew_icrs`.
+        """
+        radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
+
+        return self._compute_slew_plan(
+            radec_icrs=radec_icrs,
+            rot=rot,
+            rot_type=rot_type,
+            time_on_target=time_on_target,
+            tai=self.clock.tai() + lead_time,
+            validity=validity,
+        )
+
+    def _compute_slew_plan(
+        self,
+        radec_icrs: ICRS,
+        rot: typing.Union[float, str, Angle],
+        rot_type: RotType,
+        time_on_target: float,
+        tai: float,
+        validity: typing.Optional[float] = None,
+    ) -> SlewPlan:
+        """Compute a slew plan.
+
+        Parameters
+        ----------
+        radec_icrs : `astropy.coordinates.ICRS`
+            Target coordinates.
+        rot : `float`, `str` or `astropy.coordinates.Angle`
+            Rotation angle, see `slew_icrs`.
+        rot_type :  `lsst.ts.observatory.control.utils.RotType`
+            Rotation type, see `slew_icrs`.
+        time_on_target : `float`
+            Estimated time on target (sec).
+        tai : `float`
+            Time of the slew, TAI unix time (sec).
+        validity : `float`, optional
+            Validity of the plan (sec). By default use `slew_plan_validity`.
+            Reduced for `RotType.SkyAuto` and `RotType.Parallactic`, see
+            `_get_rot_angle_validity`.
+
+        Returns
+        -------
+        plan : `SlewPlan`
+            Slew plan.
+
+        Raises
+        ------
+        RuntimeError
+            If ``rot_type`` is not recognized.
+        """
+        rot_angle = Angle(rot, unit=u.deg)
+
+        current_time = self.time_service.get_time(tai)
+
+        par_angle = self.parallactic_angle(
+            ra=radec_icrs.ra, dec=radec_icrs.dec, time=current_time
         )
 
         alt_az = self.azel_from_radec(
@@ -611,102 +1115,265 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
                 f"Setting rotator position with respect to parallactic angle to {rot_angle}."
             )
 
-            rot_angle = rot_phys_val + alt_az.alt - 90.0 * u.deg
+            rot_angle = rot_phys_val + alt_az.alt - 90.0 * u.deg
+
+            self.log.debug(
+                f"Parallactic angle: {par_angle.deg} | " f"Sky Angle: {rot_angle.deg}"
+            )
+        elif rot_type == RotType.Physical:
+            self.log.debug(
+                f"Setting rotator to physical fixed position {rot_angle}. Rotator will not track."
+            )
+            rot_frame = self.RotFrame.FIXED
+            rot_track_frame = self.RotFrame.FIXED
+        else:
+            valid_rottypes = ", ".join(repr(rt) for rt in RotType)
+            raise RuntimeError(
+                f"Unrecognized rottype {rot_type}. Should be one of {valid_rottypes}"
+            )
+
+        rot_angle_alternatives = (
+            self.get_feasible_rot_angle_alternatives(
+                radec_icrs=radec_icrs,
+                rot_angle=rot_angle.deg,
+                rot_frame=rot_frame,
+                rot_track_frame=rot_track_frame,
+                time_on_target=time_on_target,
+                time=current_time,
+            )
+            if self.rotator_feasibility_check
+            else list(self.get_rot_angle_alternatives(rot_angle.deg))
+        )
+
+        if validity is None:
+            validity = self.slew_plan_validity
+
+        if rot_type in {RotType.SkyAuto, RotType.Parallactic}:
+            validity = self._get_rot_angle_validity(
+                radec_icrs=radec_icrs,
+                rot=Angle(rot, unit=u.deg),
+                rot_type=rot_type,
+                rot_angle=rot_angle,
+                tai=tai,
+                validity=validity,
+            )
+
+        return SlewPlan(
+            radec_icrs=radec_icrs,
+            rot=Angle(rot, unit=u.deg).deg,
+            rot_type=rot_type,
+            time_on_target=time_on_target,
+            rot_angle=rot_angle,
+            rot_frame=rot_frame,
+            rot_track_frame=rot_track_frame,
+            rot_angle_alternatives=rot_angle_alternatives,
+            az=alt_az.az.deg,
+            el=alt_az.alt.deg,
+            dome_az=alt_az.az.deg,
+            tai=tai,
+            validity=validity,
+        )
+
+    def _get_rot_angle_validity(
+        self,
+        radec_icrs: ICRS,
+        rot: Angle,
+        rot_type: RotType,
+        rot_angle: Angle,
+        tai: float,
+        validity: float,
+    ) -> float:
+        """Get how long the rotator angle of a slew plan stays the same.
+
+        With `RotType.SkyAuto` the decision to wrap the sky angle, and with
+        `RotType.Parallactic` the sky angle itself, depend on the time of
+        the slew. The physical rotator angle is sampled within ``validity``
+        of the time of the plan (`slew_plan_validity_samples` on each side)
+        and the validity is reduced to exclude the first sample that gives a
+        different wrap, or a sky angle more than `slew_plan_rot_tolerance`
+        away from ``rot_angle``.
+
+        Parameters
+        ----------
+        radec_icrs : `astropy.coordinates.ICRS`
+            Target coordinates.
+        rot : `astropy.coordinates.Angle`
+            Rotation angle requested for the slew.
+        rot_type :  `lsst.ts.observatory.control.utils.RotType`
+            Rotation type, `RotType.SkyAuto` or `RotType.Parallactic`.
+        rot_angle : `astropy.coordinates.Angle`
+            Sky angle of the plan.
+        tai : `float`
+            Time of the plan, TAI unix time (sec).
+        validity : `float`
+            Validity of the plan (sec).
+
+        Returns
+        -------
+        validity : `float`
+            Reduced validity of the plan (sec).
+        """
+        if validity <= 0.0 or self.slew_plan_validity_samples < 1:
+            return validity
+
+        offsets = np.linspace(
+            -validity, validity, 2 * self.slew_plan_validity_samples + 1
+        )
+        time = self.time_service.get_time(tai + offsets)
+
+        par_angle = self.parallactic_angle_batch(
+            ra=radec_icrs.ra, dec=radec_icrs.dec, time=time
+        )
+        alt = self.azel_from_radec_batch(
+            ra=radec_icrs.ra, dec=radec_icrs.dec, time=time
+        ).alt
+
+        # Same as the physical rotator angle in _compute_slew_plan.
+        rot_phys_val = Angle(
+            Angle(180.0, unit=u.deg)
+            + par_angle
+            + rot
+            - (alt if self.instrument_focus == InstrumentFocus.Nasmyth else 0.0),
+            unit=u.deg,
+        ).wrap_at(180.0 * u.deg)
+
+        if rot_type == RotType.SkyAuto:
+            wrap = ~(
+                (self.rotator_limits[0] < rot_phys_val.deg)
+                & (rot_phys_val.deg < self.rotator_limits[1])
+            )
+            same = wrap == wrap[self.slew_plan_validity_samples]
+        else:
+            sky_angle = Angle(rot_phys_val + alt - 90.0 * u.deg)
+            same = (
+                np.abs((sky_angle - rot_angle).wrap_at(180.0 * u.deg).deg)
+                <= self.slew_plan_rot_tolerance
+            )
+
+        if np.all(same):
+            return validity
+
+        step = offsets[1] - offsets[0]
+
+        return max(float(np.min(np.abs(offsets[~same]))) - step, 0.0)
+
+    async def estimate_slew_time(
+        self,
+        ra: typing.Union[float, str, Angle],
+        dec: typing.Union[float, str, Angle],
+        rot: float = 0.0,
+        start: typing.Optional[SlewPosition] = None,
+        time: typing.Optional[Time] = None,
+    ) -> float:
+        """Estimate how long a slew to an ICRS target takes, including
+        settling.
+
+        Parameters
+        ----------
+        ra : `float`, `str` or `astropy.coordinates.Angle`
+            Target RA, either as a float (hour), a sexagesimal string
+            (HH:MM:SS.S or HH MM SS.S) coordinates or
+            `astropy.coordinates.Angle`.
+        dec : `float`, `str` or `astropy.coordinates.Angle`
+            Target Dec, either as a float (deg), a sexagesimal string
+            (DD:MM:SS.S or DD MM SS.S) coordinates or
+            `astropy.coordinates.Angle`.
+        rot : `float`, optional
+            Sky rotation angle (deg).
+        start : `SlewPosition`, optional
+            Position at the start of the slew. By default use the current
+            position.
+        time : `astropy.time.core.Time` or `None`, optional
+            Time of the slew. If `None` (default) use current time.
+
+        Returns
+        -------
+        slew_time : `float`
+            Estimated slew time (sec).
+        """
+        radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
+
+        _start = await self.get_slew_position() if start is None else start
+
+        az, el, rot_phys = self._get_slew_targets(
+            ra=radec_icrs.ra, dec=radec_icrs.dec, rot=rot, time=time
+        )
+
+        return float(self.slew_time_model.estimate(_start, az=az, el=el, rot=rot_phys))
+
+    async def order_targets(
+        self,
+        ra: typing.Union[npt.ArrayLike, Angle],
+        dec: typing.Union[npt.ArrayLike, Angle],
+        rot: npt.ArrayLike = 0.0,
+        start: typing.Optional[SlewPosition] = None,
+        time: typing.Optional[Time] = None,
+    ) -> typing.List[int]:
+        """Find the order to observe a list of ICRS targets that minimizes
+        the total slew time, starting from the current position.
+
+        Slew times are estimated with `slew_time_model`, with all targets at
+        their position at ``time``.
+
+        Parameters
+        ----------
+        ra : array-like or `astropy.coordinates.Angle`
+            Targets RA, either as floats (hour) or `astropy.coordinates.Angle`.
+        dec : array-like or `astropy.coordinates.Angle`
+            Targets Dec, either as floats (deg) or
+            `astropy.coordinates.Angle`.
+        rot : array-like, optional
+            Sky rotation angle of the targets (deg).
+        start : `SlewPosition`, optional
+            Position at the start of the sequence. By default use the
+            current position.
+        time : `astropy.time.core.Time` or `None`, optional
+            Time of the sequence. If `None` (default) use current time.
+
+        Returns
+        -------
+        order : `list` [`int`]
+            Indices of the targets, in the order they should be observed.
+        """
+        _start = await self.get_slew_position() if start is None else start
 
-            self.log.debug(
-                f"Parallactic angle: {par_angle.deg} | " f"Sky Angle: {rot_angle.deg}"
-            )
-        elif rot_type == RotType.Physical:
-            self.log.debug(
-                f"Setting rotator to physical fixed position {rot_angle}. Rotator will not track."
-            )
-            rot_frame = self.RotFrame.FIXED
-            rot_track_frame = self.RotFrame.FIXED
-        else:
-            valid_rottypes = ", ".join(repr(rt) for rt in RotType)
-            raise RuntimeError(
-                f"Unrecognized rottype {rot_type}. Should be one of {valid_rottypes}"
-            )
+        az, el, rot_phys = self._get_slew_targets(ra=ra, dec=dec, rot=rot, time=time)
 
-        slew_exception: typing.Union[None, Exception] = None
+        cost = self.slew_time_model.get_cost_matrix(_start, az=az, el=el, rot=rot_phys)
 
-        for rot_angle_to_try in self.get_rot_angle_alternatives(rot_angle.deg):
-            try:
-                await self.slew(
-                    radec_icrs.ra.hour,
-                    radec_icrs.dec.deg,
-                    rotPA=rot_angle_to_try,
-                    target_name=target_name,
-                    frame=self.CoordFrame.ICRS,
-                    epoch=2000,
-                    equinox=2000,
-                    parallax=0,
-                    pmRA=0,
-                    pmDec=0,
-                    rv=0,
-                    dRA=dra,
-                    dDec=ddec,
-                    rot_frame=rot_frame,
-                    rot_track_frame=rot_track_frame,
-                    az_wrap_strategy=az_wrap_strategy,
-                    time_on_target=time_on_target,
-                    rot_mode=self.RotMode.FIELD,
-                    slew_timeout=slew_timeout,
-                    stop_before_slew=stop_before_slew,
-                    wait_settle=wait_settle,
-                    offset_x=offset_x,
-                    offset_y=offset_y,
-                )
-            except salobj.AckError as ack_error:
-                if "rotator position angle out of range" in ack_error.ackcmd.result:
-                    self.log.warning(
-                        "Target out of rotator limit. Trying different angle."
-                    )
-                    continue
-                elif "Target out of rotator limit" in ack_error.ackcmd.result:
-                    self.log.warning(
-                        "Target out of rotator limit. Trying different angle."
-                    )
-                    continue
-                elif "out of slew limit margin" in ack_error.ackcmd.result:
-                    self.log.warning(
-                        "Target out of rotator slew limit margin. Trying different angle."
-                    )
-                    continue
-                else:
-                    raise ack_error
-            except Exception as e:
-                slew_exception = e
-                break
-            else:
-                if self._overslew_az:
-                    try:
-                        overslew_az = 1.5 * 3600.0 * np.cos(alt_az.alt.rad)
-                        self.log.info(
-                            "Overslew Azimuth feature is enabled. Slewing past target position by"
-                            f"{(overslew_az/3600.):.1f} degrees and waiting for settle."
-                        )
-                        await asyncio.sleep(self.tel_settle_time)
-                        await self.offset_azel(az=overslew_az, el=0, relative=False)
-                        await asyncio.sleep(self.tel_settle_time)
-                        self.log.info("Slewing back to target position.")
-                        await self.offset_azel(az=0, el=0, relative=False)
-                    except salobj.AckError as ack_error:
-                        if (
-                            "out of range"
-                            or "out of slew limit" in ack_error.ackcmd.result
-                        ):
-                            self.log.warning(
-                                "Overslew is out of operational limits. Skipping overslew."
-                            )
-                            continue
-                        else:
-                            raise ack_error
-                break
-        if slew_exception is not None:
-            raise slew_exception
+        path = order_by_cost(cost)
 
-        return radec_icrs, rot_angle
+        self.log.debug(
+            f"Target order: {[node - 1 for node in path]}. Estimated slew time: "
+            f"{np.sum(cost[[0] + path[:-1], path]):.1f}s."
+        )
+
+        return [node - 1 for node in path]
+
+    def _get_slew_targets(
+        self,
+        ra: typing.Union[npt.ArrayLike, Angle],
+        dec: typing.Union[npt.ArrayLike, Angle],
+        rot: npt.ArrayLike,
+        time: typing.Optional[Time],
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the azimuth, elevation and physical rotator angle of ICRS
+        targets (deg).
+        """
+        time = self._get_batch_time(time)
+
+        azel = self.azel_from_radec_batch(ra=ra, dec=dec, time=time)
+        par_angle = self.parallactic_angle_batch(ra=ra, dec=dec, time=time)
+
+        rot_phys = 180.0 + par_angle.deg + np.asarray(rot, dtype=float)
+        if self.instrument_focus == InstrumentFocus.Nasmyth:
+            rot_phys = rot_phys - azel.alt.deg
+
+        return (
+            np.atleast_1d(azel.az.deg),
+            np.atleast_1d(azel.alt.deg),
+            np.atleast_1d((rot_phys + 180.0) % 360.0 - 180.0),
+        )
 
     async def slew(
         self,
@@ -1335,6 +2002,8 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
 
         await self.wait_tracking_stopped()
 
+        await self._resume_dome_following()
+
     async def wait_tracking_stopped(self) -> None:
         """Task to wait until tracking has stopped.
 
@@ -1375,7 +2044,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         task_list: typing.List[asyncio.Task] = []
 
         if track_duration is not None and track_duration > 0.0:
-            task_list.append(asyncio.ensure_future(asyncio.sleep(track_duration)))
+            task_list.append(asyncio.ensure_future(self.clock.sleep(track_duration)))
 
         for cmp in self.components_attr:
             if getattr(self.check, cmp):
@@ -1407,6 +2076,8 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         """
         self.flush_offset_events()
 
+        await self._resume_dome_following()
+
         async with self.ready_to_offset():
             await offset_cmd
 
@@ -1417,7 +2088,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             self.log.debug("Timed out waiting for offset done events.")
 
         self.log.debug("Waiting for telescope to settle.")
-        await asyncio.sleep(self.tel_settle_time)
+        await self.settle(self.tel_settle_time)
         self.log.debug("Done")
 
     @contextlib.asynccontextmanager
@@ -1466,6 +2137,101 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
                 "Dome trajectory check disable. Will not disable following."
             )
 
+    async def pre_position_dome(self, az: float, check: typing.Any = None) -> float:
+        """Start moving the dome towards the azimuth of the next target.
+
+        The dome is moved as far towards ``az`` as it can go while staying
+        within `dome_slew_tolerance` (minus `dome_pre_position_margin`) of
+        the current telescope azimuth, so the current exposure is not
+        vignetted. The method returns once the dome move is commanded.
+
+        If dome following is enabled it is disabled, so the dome trajectory
+        does not move the dome back, and enabled again by the next telescope
+        motion, see `_resume_dome_following`. The dome then only
+        has to cover the rest of the way and is less likely to be the last
+        axis in position. A `slew_dome_to` in between takes over the dome
+        and leaves dome following disabled, as usual.
+
+        Parameters
+        ----------
+        az : `float`
+            Azimuth of the next target at the expected start of its slew
+            (deg), e.g. ``plan.dome_az`` from `prepare_slew`.
+        check : `types.SimpleNamespace` or `None`
+            Override `self.check` for defining which resources are used.
+
+        Returns
+        -------
+        dome_az : `float`
+            Azimuth the dome was sent to (deg).
+
+        Notes
+        -----
+        The telescope keeps tracking while the dome waits at the
+        pre-positioned azimuth, so use it near the end of the exposure, or
+        increase `dome_pre_position_margin` for long exposures.
+        """
+        position = await self.get_slew_position()
+
+        dome_az = self.get_dome_pre_position_azimuth(az=az, telescope_az=position.az)
+
+        # Dome following can only be disabled, and later enabled, if the
+        # dome trajectory is in use.
+        if (
+            getattr(self.check if check is None else check, self.dome_trajectory_name)
+            and await self.check_dome_following()
+        ):
+            await self.disable_dome_following(check)
+            self._dome_pre_positioned = True
+
+        self.log.info(
+            f"Pre-positioning dome to az = {dome_az:.2f} for next target at "
+            f"az = {az:.2f}; telescope az = {position.az:.2f}."
+        )
+
+        await self._move_dome_azimuth(az=dome_az, check=check)
+
+        return dome_az
+
+    def get_dome_pre_position_azimuth(self, az: float, telescope_az: float) -> float:
+        """Get the dome azimuth closest to a target that does not vignette
+        the telescope.
+
+        Parameters
+        ----------
+        az : `float`
+            Azimuth of the next target (deg).
+        telescope_az : `float`
+            Current telescope azimuth (deg).
+
+        Returns
+        -------
+        dome_az : `float`
+            Dome azimuth (deg), in the range [0, 360).
+        """
+        max_offset = max(
+            Angle(self.dome_slew_tolerance, unit=u.deg).deg
+            - self.dome_pre_position_margin,
+            0.0,
+        )
+        offset = np.clip(angle_diff(az, telescope_az).deg, -max_offset, max_offset)
+
+        return Angle(telescope_az + offset, unit=u.deg).wrap_at(360.0 * u.deg).deg
+
+    async def _resume_dome_following(self) -> None:
+        """Enable dome following again if it was disabled by
+        `pre_position_dome`.
+
+        Every telescope motion must call this method before it is
+        commanded: `_slew_to` implementations (used by all the slew and
+        tracking methods), `_offset`, `stop_tracking` and any motion
+        commanded directly to the mount.
+        """
+        if self._dome_pre_positioned:
+            self._dome_pre_positioned = False
+            self.log.debug("Resuming dome following after dome pre-positioning.")
+            await self.enable_dome_following()
+
     async def check_dome_following(self) -> bool:
         """Check if dome following is enabled.
 
@@ -1499,114 +2265,397 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             (DD:MM:SS.S or DD MM SS.S) coordinates or
             `astropy.coordinates.Angle`.
         time : `astropy.time.core.Time` or `None`, optional
-            The time which the coordinate trasformation is intended for. If
-            `None` (default) use current time.
+            The time which the coordinate trasformation is intended for. If
+            `None` (default) use current time.
+
+        Returns
+        -------
+        azel : `astropy.coordinates.AltAz`
+            Astropy coordinates with azimuth and elevation.
+        """
+        radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
+
+        azel = self._engine_azel_from_radec(radec_icrs, time)
+        if azel is not None:
+            return azel
+
+        if time is None:
+            time = astropy_time_from_tai_unix(self.clock.tai())
+
+        time.location = self.location
+
+        coord_frame_azel = AltAz(location=self.location, obstime=time)
+
+        azel = radec_icrs.transform_to(coord_frame_azel)
+
+        return azel
+
+    def radec_from_azel(
+        self,
+        az: typing.Union[float, str, Angle],
+        el: typing.Union[float, str, Angle],
+        time: typing.Optional[Time] = None,
+    ) -> ICRS:
+        """Calculate Ra/Dec in ICRS coordinates from Az/El.
+
+        Parameters
+        ----------
+        az : `float`, `str` or astropy.coordinates.Angle
+            Target Azimuth (degree). Accepts float (deg), sexagesimal string
+            (DD:MM:SS.S or DD MM SS.S) coordinates or
+            `astropy.coordinates.Angle`
+        el : `float` or `str`
+            Target Elevation (degree). Accepts float (deg), sexagesimal string
+            (DD:MM:SS.S or DD MM SS.S) coordinates or
+            `astropy.coordinates.Angle`
+        time : `astropy.time.core.Time` or `None`, optional
+            The time which the coordinate trasformation is intended for. If
+            `None` (default) use current time.
+
+        Returns
+        -------
+        radec_icrs : `astropy.coordinates.ICRS`
+            Astropy coordinates with azimuth and elevation.
+        """
+
+        radec_icrs = self._engine_radec_from_azel(az, el, time)
+        if radec_icrs is not None:
+            return radec_icrs
+
+        if time is None:
+            time = astropy_time_from_tai_unix(self.clock.tai())
+
+        time.location = self.location
+
+        coord_frame_azel = SkyCoord(
+            AltAz(
+                alt=Angle(el, unit=u.deg),
+                az=Angle(az, unit=u.deg),
+                location=self.location,
+                obstime=time,
+            )
+        )
+
+        radec_icrs = coord_frame_azel.transform_to(ICRS)
+
+        return radec_icrs
+
+    def parallactic_angle(
+        self,
+        ra: typing.Union[float, str, Angle],
+        dec: typing.Union[float, str, Angle],
+        time: typing.Optional[Time] = None,
+    ) -> Angle:
+        """Return parallactic angle for the given Ra/Dec coordinates.
+
+        Parameters
+        ----------
+        ra : `float`, `str` or `astropy.coordinates.Angle`
+            Target RA, either as a float (hour), a sexagesimal string
+            (HH:MM:SS.S or HH MM SS.S) coordinates or
+            `astropy.coordinates.Angle`.
+        dec : `float`, `str` or `astropy.coordinates.Angle`
+            Target Dec, either as a float (deg), a sexagesimal string
+            (DD:MM:SS.S or DD MM SS.S) coordinates or
+            `astropy.coordinates.Angle`.
+        time : `astropy.time.core.Time` or `None`, optional
+            The time which the coordinate trasformation is intended for. If
+            `None` (default) use current time.
+
+        Returns
+        -------
+        pa_angle : `astropy.coordinates.Angle`
+            Parallactic angle.
+        """
+        radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
+
+        pa_angle = self._engine_parallactic_angle(radec_icrs, time)
+        if pa_angle is not None:
+            return pa_angle
+
+        tai = self.clock.tai() if time is None else time.unix_tai
+
+        pa_angle = calculate_parallactic_angle(
+            self.location,
+            self.time_service.get_lst(tai),
+            radec_icrs,
+        )
+
+        return pa_angle
+
+    def azel_from_radec_batch(
+        self,
+        ra: typing.Union[npt.ArrayLike, Angle],
+        dec: typing.Union[npt.ArrayLike, Angle],
+        time: typing.Optional[Time] = None,
+    ) -> AltAz:
+        """Calculate Az/El coordinates for arrays of RA/Dec in ICRS.
+
+        All coordinates are transformed with a single frame, which is orders
+        of magnitude faster than calling `azel_from_radec` in a loop.
+
+        Parameters
+        ----------
+        ra : array-like or `astropy.coordinates.Angle`
+            Targets RA, either as floats (hour) or `astropy.coordinates.Angle`.
+        dec : array-like or `astropy.coordinates.Angle`
+            Targets Dec, either as floats (deg) or
+            `astropy.coordinates.Angle`.
+        time : `astropy.time.core.Time` or `None`, optional
+            The time(s) which the coordinate trasformation is intended for.
+            Can be a scalar or an array that broadcasts against ``ra`` and
+            ``dec``, e.g. a single target and an array of times to scan its
+            visibility. If `None` (default) use current time.
 
         Returns
         -------
         azel : `astropy.coordinates.AltAz`
-            Astropy coordinates with azimuth and elevation.
+            Array of astropy coordinates with azimuth and elevation.
         """
-        radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
+        radec_icrs = ICRS(
+            Angle(np.asanyarray(ra), unit=u.hourangle),
+            Angle(np.asanyarray(dec), unit=u.deg),
+        )
 
-        if time is None:
-            time = astropy_time_from_tai_unix(current_tai())
+        azel = self._engine_azel_from_radec(radec_icrs, time)
+        if azel is not None:
+            return azel
 
-        time.location = self.location
+        time = self._get_batch_time(time)
 
         coord_frame_azel = AltAz(location=self.location, obstime=time)
 
-        azel = radec_icrs.transform_to(coord_frame_azel)
-
-        return azel
+        return radec_icrs.transform_to(coord_frame_azel)
 
-    def radec_from_azel(
+    def radec_from_azel_batch(
         self,
-        az: typing.Union[float, str, Angle],
-        el: typing.Union[float, str, Angle],
+        az: typing.Union[npt.ArrayLike, Angle],
+        el: typing.Union[npt.ArrayLike, Angle],
         time: typing.Optional[Time] = None,
     ) -> ICRS:
-        """Calculate Ra/Dec in ICRS coordinates from Az/El.
+        """Calculate Ra/Dec in ICRS coordinates for arrays of Az/El.
 
         Parameters
         ----------
-        az : `float`, `str` or astropy.coordinates.Angle
-            Target Azimuth (degree). Accepts float (deg), sexagesimal string
-            (DD:MM:SS.S or DD MM SS.S) coordinates or
-            `astropy.coordinates.Angle`
-        el : `float` or `str`
-            Target Elevation (degree). Accepts float (deg), sexagesimal string
-            (DD:MM:SS.S or DD MM SS.S) coordinates or
-            `astropy.coordinates.Angle`
+        az : array-like or `astropy.coordinates.Angle`
+            Targets Azimuth, either as floats (deg) or
+            `astropy.coordinates.Angle`.
+        el : array-like or `astropy.coordinates.Angle`
+            Targets Elevation, either as floats (deg) or
+            `astropy.coordinates.Angle`.
         time : `astropy.time.core.Time` or `None`, optional
-            The time which the coordinate trasformation is intended for. If
-            `None` (default) use current time.
+            The time(s) which the coordinate trasformation is intended for.
+            Can be a scalar or an array that broadcasts against ``az`` and
+            ``el``. If `None` (default) use current time.
 
         Returns
         -------
         radec_icrs : `astropy.coordinates.ICRS`
-            Astropy coordinates with azimuth and elevation.
+            Array of astropy coordinates with RA and Dec.
         """
+        radec_icrs = self._engine_radec_from_azel(
+            np.asanyarray(az), np.asanyarray(el), time
+        )
+        if radec_icrs is not None:
+            return radec_icrs
 
-        if time is None:
-            time = astropy_time_from_tai_unix(current_tai())
-
-        time.location = self.location
+        time = self._get_batch_time(time)
 
         coord_frame_azel = SkyCoord(
             AltAz(
-                alt=Angle(el, unit=u.deg),
-                az=Angle(az, unit=u.deg),
+                alt=Angle(np.asanyarray(el), unit=u.deg),
+                az=Angle(np.asanyarray(az), unit=u.deg),
                 location=self.location,
                 obstime=time,
             )
         )
 
-        radec_icrs = coord_frame_azel.transform_to(ICRS)
-
-        return radec_icrs
+        return coord_frame_azel.transform_to(ICRS)
 
-    def parallactic_angle(
+    def parallactic_angle_batch(
         self,
-        ra: typing.Union[float, str, Angle],
-        dec: typing.Union[float, str, Angle],
+        ra: typing.Union[npt.ArrayLike, Angle],
+        dec: typing.Union[npt.ArrayLike, Angle],
         time: typing.Optional[Time] = None,
     ) -> Angle:
-        """Return parallactic angle for the given Ra/Dec coordinates.
+        """Return parallactic angles for arrays of Ra/Dec coordinates.
 
         Parameters
         ----------
-        ra : `float`, `str` or `astropy.coordinates.Angle`
-            Target RA, either as a float (hour), a sexagesimal string
-            (HH:MM:SS.S or HH MM SS.S) coordinates or
-            `astropy.coordinates.Angle`.
-        dec : `float`, `str` or `astropy.coordinates.Angle`
-            Target Dec, either as a float (deg), a sexagesimal string
-            (DD:MM:SS.S or DD MM SS.S) coordinates or
+        ra : array-like or `astropy.coordinates.Angle`
+            Targets RA, either as floats (hour) or `astropy.coordinates.Angle`.
+        dec : array-like or `astropy.coordinates.Angle`
+            Targets Dec, either as floats (deg) or
             `astropy.coordinates.Angle`.
         time : `astropy.time.core.Time` or `None`, optional
-            The time which the coordinate trasformation is intended for. If
-            `None` (default) use current time.
+            The time(s) which the parallactic angles are computed for. Can be
+            a scalar or an array that broadcasts against ``ra`` and ``dec``.
+            If `None` (default) use current time.
 
         Returns
         -------
         pa_angle : `astropy.coordinates.Angle`
-            Parallactic angle.
+            Array of parallactic angles.
         """
-        radec_icrs = ICRS(Angle(ra, unit=u.hourangle), Angle(dec, unit=u.deg))
+        radec_icrs = ICRS(
+            Angle(np.asanyarray(ra), unit=u.hourangle),
+            Angle(np.asanyarray(dec), unit=u.deg),
+        )
 
-        if time is None:
-            time = astropy_time_from_tai_unix(current_tai())
+        pa_angle = self._engine_parallactic_angle(radec_icrs, time)
+        if pa_angle is not None:
+            return pa_angle
 
-        time.location = self.location
+        tai = self.clock.tai() if time is None else time.unix_tai
 
-        pa_angle = calculate_parallactic_angle(
+        return calculate_parallactic_angle(
             self.location,
-            time.sidereal_time("mean"),
+            self.time_service.get_lst(tai),
             radec_icrs,
         )
 
-        return pa_angle
+    def _get_batch_time(self, time: typing.Optional[Time]) -> Time:
+        """Get the time for a batch coordinate transformation.
+
+        Parameters
+        ----------
+        time : `astropy.time.core.Time` or `None`
+            Time(s) of the transformation. If `None` use current time.
+
+        Returns
+        -------
+        time : `astropy.time.core.Time`
+            Time(s) with the observatory location.
+        """
+        if time is None:
+            time = astropy_time_from_tai_unix(self.clock.tai())
+
+        time.location = self.location
+
+        return time
+
+    def enable_coordinate_engine(
+        self, max_error: float = 1.0, interval: float = 60.0
+    ) -> CoordinateEngine:
+        """Use a fast approximate engine for the coordinate transformations.
+
+        Once enabled, `azel_from_radec`, `radec_from_azel`,
+        `parallactic_angle`, their batch variants and, through them,
+        `slew_icrs` and `find_target`, use the engine instead of astropy
+        whenever its error is within ``max_error``.
+
+        Parameters
+        ----------
+        max_error : `float`, optional
+            Error budget (arcsec).
+        interval : `float`, optional
+            Time interval covered by each cached astropy transformation
+            (sec).
+
+        Returns
+        -------
+        coordinate_engine : `CoordinateEngine`
+            The engine.
+        """
+        self.coordinate_engine = CoordinateEngine(
+            location=self.location, max_error=max_error, interval=interval
+        )
+        return self.coordinate_engine
+
+    def disable_coordinate_engine(self) -> None:
+        """Use astropy for all the coordinate transformations."""
+        self.coordinate_engine = None
+
+    def _get_engine_tai(
+        self, time: typing.Optional[Time]
+    ) -> typing.Optional[typing.Union[float, np.ndarray]]:
+        """Get the TAI time(s) for the coordinate engine.
+
+        Parameters
+        ----------
+        time : `astropy.time.core.Time` or `None`
+            Time(s) of the transformation. If `None` use current time.
+
+        Returns
+        -------
+        tai : `float`, `numpy.ndarray` or `None`
+            TAI unix time(s) (sec), or `None` if the engine is not enabled
+            or its error is above the budget.
+        """
+        if self.coordinate_engine is None:
+            return None
+
+        tai = self.clock.tai() if time is None else time.unix_tai
+
+        if not self.coordinate_engine.within_budget(tai):
+            self.log.debug(
+                "Coordinate engine error above budget "
+                f"({self.coordinate_engine.get_error(tai):.3f} arcsec), using astropy."
+            )
+            return None
+
+        return tai
+
+    def _engine_azel_from_radec(
+        self, radec_icrs: ICRS, time: typing.Optional[Time]
+    ) -> typing.Optional[AltAz]:
+        """Calculate Az/El with the coordinate engine, if possible."""
+        tai = self._get_engine_tai(time)
+        if tai is None:
+            return None
+
+        assert self.coordinate_engine is not None
+
+        az, el = self.coordinate_engine.azel_from_radec(
+            radec_icrs.ra.deg, radec_icrs.dec.deg, tai
+        )
+
+        return AltAz(
+            az=Angle(az, unit=u.deg),
+            alt=Angle(el, unit=u.deg),
+            location=self.location,
+            obstime=astropy_time_from_tai_unix(tai) if time is None else time,
+        )
+
+    def _engine_radec_from_azel(
+        self,
+        az: typing.Union[float, str, Angle, np.ndarray],
+        el: typing.Union[float, str, Angle, np.ndarray],
+        time: typing.Optional[Time],
+    ) -> typing.Optional[ICRS]:
+        """Calculate RA/Dec with the coordinate engine, if possible."""
+        tai = self._get_engine_tai(time)
+        if tai is None:
+            return None
+
+        assert self.coordinate_engine is not None
+
+        ra, dec = self.coordinate_engine.radec_from_azel(
+            Angle(az, unit=u.deg).deg, Angle(el, unit=u.deg).deg, tai
+        )
+
+        return ICRS(ra=Angle(ra, unit=u.deg), dec=Angle(dec, unit=u.deg))
+
+    def _engine_parallactic_angle(
+        self, radec_icrs: ICRS, time: typing.Optional[Time]
+    ) -> typing.Optional[Angle]:
+        """Calculate the parallactic angle with the coordinate engine, if
+        possible.
+        """
+        tai = self._get_engine_tai(time)
+        if tai is None:
+            return None
+
+        assert self.coordinate_engine is not None
+
+        return Angle(
+            self.coordinate_engine.parallactic_angle(
+                radec_icrs.ra.deg,
+                radec_icrs.dec.deg,
+                self.time_service.get_lst(tai).deg,
+            ),
+            unit=u.rad,
+        )
 
     async def find_target(
         self,
@@ -1615,10 +2664,22 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         mag_limit: float,
         mag_range: float = 2.0,
         radius: float = 0.5,
+        sources: typing.Optional[typing.List[str]] = None,
+        latency_budget: typing.Optional[float] = None,
     ) -> Table:
         """Make a cone search and return a target close to the specified
         position.
 
+        The sources (local catalog, Simbad and DM Butler) are searched
+        concurrently, each with the deadline in `find_target_deadlines`. The
+        result of the highest priority source is used, unless it is not
+        available within the latency budget, in which case the first
+        result of a lower priority source is used. The remaining searches
+        are then cancelled. Sources that found no target (`NoTargetError`)
+        in a cone of the sky are skipped, for
+        `find_target_negative_cache_ttl` seconds, in searches for the same
+        or a narrower magnitude range within that cone.
+
         Parameters
         ----------
         az: `float`
@@ -1632,55 +2693,216 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             mag_limit+mag_range (default=2).
         radius: `float`, optional
             Radius of the cone search (default=2 degrees).
+        sources : `list` [`str`], optional
+            Sources to search, in order of priority. Must be keys of
+            `find_target_deadlines`. By default use the local catalog, if
+            loaded, Simbad and, if the DM stack is available, the DM Butler.
+        latency_budget : `float`, optional
+            How long to wait for a higher priority source before taking the
+            result of a lower priority one (sec). By default use
+            `find_target_latency_budget`.
 
         Returns
         -------
         target : `astropy.Table`
             Target information.
+
+        Raises
+        ------
+        RuntimeError
+            If no source finds a target.
         """
 
-        target = None
+        _sources = self._get_find_target_sources() if sources is None else sources
+        _latency_budget = (
+            self.find_target_latency_budget
+            if latency_budget is None
+            else latency_budget
+        )
+
+        region = self._get_find_target_region(
+            az=az, el=el, mag_limit=mag_limit, mag_range=mag_range, radius=radius
+        )
 
-        if self.is_catalog_loaded():
+        errors: typing.Dict[str, typing.Any] = dict()
+        active_sources = []
+        for source in _sources:
+            if self._is_find_target_negative_cached(source, region):
+                errors[source] = "no target in region (cached)"
+            else:
+                active_sources.append(source)
+
+        if "local_catalog" in active_sources:
             self.log.debug("Searching internal catalog.")
-            try:
-                target = await self.find_target_local_catalog(
-                    az=az,
-                    el=el,
-                    mag_limit=mag_limit,
-                    mag_range=mag_range,
-                    radius=radius,
-                )
-            except RuntimeError:
-                self.log.info(
-                    "Could not find suitable target in local catalog. Continue and try with Simbad."
-                )
 
-        if target is None:
-            try:
-                target = await self.find_target_simbad(
-                    az=az,
-                    el=el,
-                    mag_limit=mag_limit,
-                    mag_range=mag_range,
-                    radius=radius,
-                )
-            except Exception as e:
-                if DM_STACK_AVAILABLE:
-                    self.log.warning(
-                        "Failed to find target in Simbad. Searching DM Butler (this can take some time)."
-                    )
-                    target = await self.find_target_dm_butler(
+        tasks = dict(
+            (
+                source,
+                asyncio.create_task(
+                    self._find_target_from_source(
+                        source=source,
+                        region=region,
                         az=az,
                         el=el,
                         mag_limit=mag_limit,
                         mag_range=mag_range,
                         radius=radius,
                     )
-                else:
-                    raise e
+                ),
+            )
+            for source in active_sources
+        )
+        budget_task = asyncio.create_task(self.clock.sleep(_latency_budget))
+
+        try:
+            while True:
+                for source in active_sources:
+                    task = tasks[source]
+                    if not task.done():
+                        if budget_task.done():
+                            continue
+                        break
+                    elif task.exception() is None:
+                        return task.result()
+                    else:
+                        errors[source] = task.exception()
+
+                pending = [task for task in tasks.values() if not task.done()]
+
+                if not pending:
+                    raise RuntimeError(
+                        f"Could not find a target with any of the sources {_sources}: "
+                        f"{errors}."
+                    )
+
+                await asyncio.wait(
+                    pending + ([] if budget_task.done() else [budget_task]),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        finally:
+            all_tasks: typing.List[asyncio.Task[typing.Any]] = [
+                budget_task,
+                *tasks.values(),
+            ]
+            for any_task in all_tasks:
+                any_task.cancel()
+            await asyncio.gather(*all_tasks, return_exceptions=True)
+
+    def clear_find_target_negative_cache(self) -> None:
+        """Forget the regions of the sky where sources found no target."""
+        self._find_target_negative_cache = dict()
+
+    def _get_find_target_sources(self) -> typing.List[str]:
+        """Get the sources available to find_target, in order of priority.
+
+        Returns
+        -------
+        sources : `list` [`str`]
+            Names of the sources.
+        """
+        available = dict(
+            local_catalog=self.is_catalog_loaded(),
+            simbad=True,
+            dm_butler=DM_STACK_AVAILABLE,
+        )
+        return [
+            source
+            for source in self.find_target_deadlines
+            if available.get(source, False)
+        ]
+
+    def _get_find_target_region(
+        self,
+        az: float,
+        el: float,
+        mag_limit: float,
+        mag_range: float,
+        radius: float,
+    ) -> typing.Tuple:
+        """Get the region of the sky searched by find_target.
+
+        Returns
+        -------
+        region : `tuple`
+            Center (`astropy.coordinates.ICRS`) and radius (deg) of the
+            search cone, and minimum and maximum magnitudes.
+        """
+        radec = self.radec_from_azel(az=az, el=el)
+        return (radec, radius, mag_limit, mag_limit + mag_range)
+
+    def _is_find_target_negative_cached(
+        self, source: str, region: typing.Tuple
+    ) -> bool:
+        """Did a source recently find no target in a region that contains
+        a given one?
+
+        A search is known to have no target if a cached search had a
+        magnitude range that contains its magnitude range and a cone that
+        contains its cone, within `find_target_negative_cache_tolerance`.
+        """
+        now = self.clock.time()
+
+        entries = [
+            (cached_region, expires)
+            for cached_region, expires in self._find_target_negative_cache.get(
+                source, []
+            )
+            if expires >= now
+        ]
+        self._find_target_negative_cache[source] = entries
+
+        radec, radius, mag_min, mag_max = region
+
+        return any(
+            cached_mag_min <= mag_min
+            and mag_max <= cached_mag_max
+            and cached_radec.separation(radec).deg + radius
+            <= cached_radius + self.find_target_negative_cache_tolerance
+            for (
+                cached_radec,
+                cached_radius,
+                cached_mag_min,
+                cached_mag_max,
+            ), _ in entries
+        )
+
+    async def _find_target_from_source(
+        self, source: str, region: typing.Tuple, **kwargs: typing.Any
+    ) -> str:
+        """Find a target with one source, within its deadline.
+
+        Parameters
+        ----------
+        source : `str`
+            Name of the source.
+        region : `tuple`
+            Region of the search, from `_get_find_target_region`.
+        **kwargs
+            Search parameters.
+
+        Returns
+        -------
+        target_name : `str`
+            Name of the target.
+        """
+        find_target_methods = dict(
+            local_catalog=self.find_target_local_catalog,
+            simbad=self.find_target_simbad,
+            dm_butler=self.find_target_dm_butler,
+        )
 
-        return target
+        try:
+            return await self.clock.wait_for(
+                find_target_methods[source](**kwargs),
+                timeout=self.find_target_deadlines[source],
+            )
+        except NoTargetError:
+            # Only a search that completed without a target means there is
+            # no target in the region; failed searches are not remembered.
+            self._find_target_negative_cache.setdefault(source, []).append(
+                (region, self.clock.time() + self.find_target_negative_cache_ttl)
+            )
+            raise
 
     async def find_target_simbad(
         self,
@@ -1716,6 +2938,8 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         Raises
         ------
         RuntimeError:
+            If the query fails.
+        NoTargetError:
             If no object is found.
         """
 
@@ -1746,7 +2970,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
             raise RuntimeError(f"Query region for {radec} failed: {e!r}")
 
         if result_table is None or len(result_table) == 0:
-            raise RuntimeError(f"No results found for region around {radec}.")
+            raise NoTargetError(f"No results found for region around {radec}.")
 
         result_table.sort("V")
 
@@ -1804,40 +3028,40 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         ------
         RuntimeError:
             If catalog is not loaded.
+        NoTargetError:
             If no object is found.
         """
 
-        assert self._catalog_coordinates is not None, (
+        assert self._catalog_index is not None, (
             "Catalog not loaded. Load a catalog with `load_catalog` before "
             "calling `find_target_local_catalog`."
         )
 
-        radec_as_sky_coord = SkyCoord(self.radec_from_azel(az=az, el=el))
+        radec_search = self.radec_from_azel(az=az, el=el)
 
-        mask_magnitude = np.bitwise_and(
-            self._catalog["FLUX_V"] >= mag_limit,
-            self._catalog["FLUX_V"] <= mag_limit + mag_range,
+        match = self._catalog_index.nearest(
+            ra=radec_search.ra.deg,
+            dec=radec_search.dec.deg,
+            mag_min=mag_limit,
+            mag_max=mag_limit + mag_range,
+            radius=radius,
         )
 
-        if np.sum(mask_magnitude) == 0:
-            raise RuntimeError(
+        if match is None:
+            raise NoTargetError(
                 f"No target in local catalog with magnitude between {mag_limit} and {mag_limit+mag_range}."
             )
 
-        match = radec_as_sky_coord.match_to_catalog_sky(
-            self._catalog_coordinates[mask_magnitude]
-        )
-
-        target_index = int(match[0])
+        target_index, separation = match
 
-        target = self._catalog[mask_magnitude][target_index]
+        target = self._catalog[target_index]
 
         target_name = target["MAIN_ID"]
 
-        if match[1][0] > radius * u.deg:
-            raise RuntimeError(
+        if separation > radius:
+            raise NoTargetError(
                 "Could not find a valid target in the specified radius. "
-                f"Closest target is {target_name}, {match[1][0]:.2f} away."
+                f"Closest target is {target_name}, {separation:.2f} deg away."
             )
 
         radec_icrs = ICRS(
@@ -1882,6 +3106,8 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         ------
         RuntimeError:
             If DM stack is not available.
+        NoTargetError:
+            If no object is found.
         """
         if not DM_STACK_AVAILABLE:
             raise RuntimeError("DM stack not available.")
@@ -1892,10 +3118,15 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
 
         radec_search = self.radec_from_azel(az=az, el=el)
 
-        target = find_target_radec(
-            radec=radec_search,
-            radius=Angle(radius, unit=u.deg),
-            mag_limit=(mag_limit, mag_limit + mag_range),
+        loop = asyncio.get_running_loop()
+        target = await loop.run_in_executor(
+            None,
+            partial(
+                find_target_radec,
+                radec=radec_search,
+                radius=Angle(radius, unit=u.deg),
+                mag_limit=(mag_limit, mag_limit + mag_range),
+            ),
         )
 
         ra_rep = target.ra.to_string(unit=u.hourangle, sep="", precision=2, pad=True)
@@ -2050,7 +3281,7 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
                 f"{component_name} in position {in_position.inPosition}. "
                 f"Waiting settle time {settle_time}s"
             )
-            await asyncio.sleep(settle_time)
+            await self.settle(settle_time, component=component_name)
         else:
             self.log.info(
                 f"{component_name} in position {in_position.inPosition}. "
@@ -2081,6 +3312,159 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         for rot_angle_alternative in self._rot_angle_alternatives:
             yield rot_angle + rot_angle_alternative
 
+    def get_feasible_rot_angle_alternatives(
+        self,
+        radec_icrs: ICRS,
+        rot_angle: float,
+        rot_frame: enum.IntEnum,
+        rot_track_frame: enum.IntEnum,
+        time_on_target: float = 0.0,
+        time: typing.Optional[Time] = None,
+    ) -> typing.List[float]:
+        """Get the rotator angle alternatives that keep the rotator within
+        its limits for the whole track.
+
+        The physical rotator angle is predicted from the evolution of the
+        parallactic angle (and elevation, for Nasmyth instruments) over
+        ``time_on_target``, for each alternative from
+        `get_rot_angle_alternatives`.
+
+        Parameters
+        ----------
+        radec_icrs : `astropy.coordinates.ICRS`
+            Target coordinates.
+        rot_angle : `float`
+            Desired rotator angle, as sent to the slew command (in deg).
+        rot_frame : `enum.IntEnum`
+            Rotator coordinate frame (`self.RotFrame`).
+        rot_track_frame : `enum.IntEnum`
+            Rotator track frame (`self.RotFrame`).
+        time_on_target : `float`, optional
+            Estimated time on target (sec).
+        time : `astropy.time.core.Time` or `None`, optional
+            Start of the track. If `None` (default) use current time.
+
+        Returns
+        -------
+        rot_angle_alternatives : `list` [`float`]
+            Feasible rotator angle alternatives (in deg), in the order of
+            `get_rot_angle_alternatives`. If none is predicted to be
+            feasible, all the alternatives are returned.
+        """
+        tai_start = self.clock.tai() if time is None else float(time.unix_tai)
+
+        n_samples = int(np.ceil(time_on_target / self.rotator_feasibility_step)) + 1
+        track_time = self.time_service.get_time(
+            tai_start + np.linspace(0.0, time_on_target, n_samples)
+        )
+
+        # Rotation of the sky with respect to the rotator, unwrapped so it is
+        # continuous over the track.
+        sky_rotation = self.parallactic_angle_batch(
+            ra=radec_icrs.ra, dec=radec_icrs.dec, time=track_time
+        ).deg
+        if self.instrument_focus == InstrumentFocus.Nasmyth:
+            sky_rotation = (
+                sky_rotation
+                - self.azel_from_radec_batch(
+                    ra=radec_icrs.ra, dec=radec_icrs.dec, time=track_time
+                ).alt.deg
+            )
+        sky_rotation = np.degrees(np.unwrap(np.radians(sky_rotation)))
+
+        rot_angle_alternatives = list(self.get_rot_angle_alternatives(rot_angle))
+        feasible_rot_angle_alternatives = [
+            rot_angle_alternative
+            for rot_angle_alternative in rot_angle_alternatives
+            if self._is_rot_track_feasible(
+                self._get_rot_track(
+                    rot_angle=rot_angle_alternative,
+                    rot_frame=rot_frame,
+                    rot_track_frame=rot_track_frame,
+                    sky_rotation=sky_rotation,
+                ),
+                wrap=rot_frame != self.RotFrame.FIXED,
+            )
+        ]
+
+        if not feasible_rot_angle_alternatives:
+            self.log.warning(
+                f"No rotator angle in {rot_angle_alternatives} predicted to stay "
+                f"within the rotator limits {self.rotator_limits} for "
+                f"{time_on_target}s. Trying all of them."
+            )
+            return rot_angle_alternatives
+
+        self.log.debug(
+            f"Feasible rotator angles: {feasible_rot_angle_alternatives} "
+            f"out of {rot_angle_alternatives}."
+        )
+
+        return feasible_rot_angle_alternatives
+
+    def _get_rot_track(
+        self,
+        rot_angle: float,
+        rot_frame: enum.IntEnum,
+        rot_track_frame: enum.IntEnum,
+        sky_rotation: np.ndarray,
+    ) -> np.ndarray:
+        """Get the physical rotator angle over a track.
+
+        Parameters
+        ----------
+        rot_angle : `float`
+            Rotator angle, as sent to the slew command (in deg).
+        rot_frame : `enum.IntEnum`
+            Rotator coordinate frame (`self.RotFrame`).
+        rot_track_frame : `enum.IntEnum`
+            Rotator track frame (`self.RotFrame`).
+        sky_rotation : `numpy.ndarray`
+            Unwrapped rotation of the sky over the track (in deg).
+
+        Returns
+        -------
+        rot_track : `numpy.ndarray`
+            Physical rotator angle over the track (in deg).
+        """
+        if rot_track_frame == self.RotFrame.FIXED:
+            return np.full_like(sky_rotation, rot_angle)
+        elif rot_frame == self.RotFrame.FIXED:
+            return rot_angle + sky_rotation - sky_rotation[0]
+
+        rot_track = 180.0 + rot_angle + sky_rotation
+        # Same wrap as angle_wrap_center for the start of the track.
+        return rot_track - 360.0 * np.round(rot_track[0] / 360.0)
+
+    def _is_rot_track_feasible(self, rot_track: np.ndarray, wrap: bool) -> bool:
+        """Is the physical rotator angle over a track within the rotator
+        limits?
+
+        Parameters
+        ----------
+        rot_track : `numpy.ndarray`
+            Physical rotator angle over the track (in deg).
+        wrap : `bool`
+            Can the rotator start the track any number of turns away from
+            ``rot_track``? This is the case when the rotator angle is given
+            with respect to the sky.
+
+        Returns
+        -------
+        feasible : `bool`
+            Is the track feasible?
+        """
+        lower = self.rotator_limits[0] + self.rotator_feasibility_margin
+        upper = self.rotator_limits[1] - self.rotator_feasibility_margin
+
+        if not wrap:
+            return bool(lower <= np.min(rot_track) and np.max(rot_track) <= upper)
+
+        min_turns = np.ceil((lower - np.min(rot_track)) / 360.0)
+        max_turns = np.floor((upper - np.max(rot_track)) / 360.0)
+
+        return bool(min_turns <= max_turns)
+
     def set_rot_angle_alternatives(
         self, rot_angle_alternatives: typing.List[float]
     ) -> None:
@@ -2140,7 +3524,9 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         """
 
         sun_coordinates = get_sun(
-            astropy_time_from_tai_unix(current_tai() if time_tai is None else time_tai)
+            astropy_time_from_tai_unix(
+                self.clock.tai() if time_tai is None else time_tai
+            )
         )
         sun_coordinates.location = self.location
 
@@ -2198,6 +3584,20 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def _move_dome_azimuth(self, az: float, check: typing.Any = None) -> None:
+        """Command the dome to move in azimuth, without waiting for it to
+        get in position.
+
+        Parameters
+        ----------
+        az : `float`
+            Azimuth angle for the dome (in deg).
+        check : `types.SimpleNamespace` or `None`
+            Override `self.check` for defining which resources are used.
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def prepare_for_flatfield(self, check: typing.Any = None) -> None:
         """A high level method to position the telescope and dome for flat
@@ -2288,6 +3688,11 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         check : `types.SimpleNamespace` or `None`, optional
             Override internal `check` attribute with a user-provided one.
             By default (`None`) use internal attribute.
+
+        Notes
+        -----
+        Implementations must call `_resume_dome_following` before sending
+        ``slew_cmd``.
         """
         raise NotImplementedError()
 
@@ -2341,6 +3746,13 @@ class BaseTCS(RemoteGroup, metaclass=abc.ABCMeta):
         """Wait for offset events."""
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def get_slew_position(self) -> SlewPosition:
+        """Get the current position of the telescope axes and dome, as
+        used by the slew time estimates.
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def get_bore_sight_angle(self) -> float:
         """Get the instrument bore sight angle with respect to the telescope
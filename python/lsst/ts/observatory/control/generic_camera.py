@@ -57,6 +57,12 @@ class GenericCamera(BaseCamera):
     tcs_ready_to_take_data : `coroutine`
         A coroutine that waits for the telescope control system to be ready
         to take data.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -67,6 +73,8 @@ class GenericCamera(BaseCamera):
         intended_usage: int | None = None,
         instrument_setup_attributes: typing.List[str] | None = None,
         tcs_ready_to_take_data: typing.Callable[[], typing.Awaitable] | None = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         self.index = index
 
@@ -80,6 +88,8 @@ class GenericCamera(BaseCamera):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
             tcs_ready_to_take_data=tcs_ready_to_take_data,
         )
 
@@ -75,6 +75,12 @@ class ComCam(BaseCamera):
     tcs_ready_to_take_data: `coroutine`
         A coroutine that waits for the telescope control system to be ready
         to take data.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -83,6 +89,8 @@ class ComCam(BaseCamera):
         log: logging.Logger | None = None,
         intended_usage: int | None = None,
         tcs_ready_to_take_data: typing.Callable[[], typing.Awaitable] | None = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         super().__init__(
             components=["CCCamera", "CCHeaderService", "CCOODS"],
@@ -90,6 +98,8 @@ class ComCam(BaseCamera):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
             tcs_ready_to_take_data=tcs_ready_to_take_data,
         )
 
@@ -77,6 +77,12 @@ class LSSTCam(BaseCamera):
     tcs_ready_to_take_data: `coroutine`
         A coroutine that waits for the telescope control system to be ready
         to take data.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -86,6 +92,8 @@ class LSSTCam(BaseCamera):
         intended_usage: int | None = None,
         tcs_ready_to_take_data: typing.Callable[[], typing.Awaitable] | None = None,
         mtcs: MTCS | None = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         super().__init__(
             components=["MTCamera", "MTHeaderService", "MTOODS"],
@@ -93,6 +101,8 @@ class LSSTCam(BaseCamera):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
             tcs_ready_to_take_data=tcs_ready_to_take_data,
         )
 
@@ -36,7 +36,7 @@ from numpy.typing import NDArray
 
 from ..base_calsys import BaseCalsys
 from ..remote_group import Usages
-from ..utils import CalibrationType
+from ..utils import CalibrationType, traced
 from . import LSSTCam
 
 
@@ -122,6 +122,12 @@ class MTCalsys(BaseCalsys):
         knowledge about the usage intention. By default allocates all
         resources.
     mtcamera: ComCam or LSSTCam
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -130,6 +136,8 @@ class MTCalsys(BaseCalsys):
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
         mtcamera: typing.Optional[LSSTCam] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
 
         self.electrometer_projector_index = 103
@@ -363,6 +371,8 @@ class MTCalsys(BaseCalsys):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
         self.mtcamera = mtcamera
@@ -543,13 +553,13 @@ class MTCalsys(BaseCalsys):
                 timeout=self.long_timeout,
                 wait_done=False,
             )
-            time_start = utils.current_tai()
+            time_start = self.clock.tai()
             while cbp_parked.parked:
                 cbp_parked = await self.rem.cbp.tel_parked.next(
                     flush=True, timeout=self.long_timeout
                 )
                 self.log.debug(f"CBP parked {cbp_parked.parked}.")
-                unpark_delay = utils.current_tai() - time_start
+                unpark_delay = self.clock.tai() - time_start
                 if unpark_delay > self.long_long_timeout:
                     raise TimeoutError(f"CBP did not unparked after {unpark_delay}s.")
 
@@ -948,13 +958,13 @@ class MTCalsys(BaseCalsys):
             wait time before pulse train
 
         """
-        await asyncio.sleep(wait_time)
-        await asyncio.sleep(delay_before)
+        await self.clock.sleep(wait_time)
+        await self.clock.sleep(delay_before)
         for n in range(nburst):
-            await asyncio.sleep(delay_before)
+            await self.clock.sleep(delay_before)
             await self.rem.tunablelaser.cmd_triggerBurst.start()
-            await asyncio.sleep(delay_after)
-        await asyncio.sleep(delay_after)
+            await self.clock.sleep(delay_after)
+        await self.clock.sleep(delay_after)
 
     async def prepare_for_flat(self, sequence_name: str) -> None:
         """Configure the Projector and/or Laser for calibrations
@@ -1065,6 +1075,7 @@ class MTCalsys(BaseCalsys):
 
             await asyncio.gather(task_select_wavelength, task_setup_camera)
 
+    @traced
     async def run_calibration_sequence(
         self, sequence_name: str, exposure_metadata: dict
     ) -> dict:
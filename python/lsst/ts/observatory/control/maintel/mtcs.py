@@ -25,6 +25,8 @@ import contextlib
 import copy
 import enum
 import logging
+import pathlib
+import types
 import typing
 
 import astropy.units as u
@@ -47,6 +49,7 @@ from lsst.ts.xml.tables.m1m3 import FATable, ForceActuatorData, force_actuator_f
 from ..base_tcs import BaseTCS
 from ..constants import mtcs_constants
 from ..remote_group import Usages, UsagesResources
+from ..utils import AxisLimits, SlewPosition, SlewTimeModel, TaskSupervisor
 
 
 class MTCSUsages(Usages):
@@ -101,6 +104,20 @@ class MTCS(BaseTCS):
     ----------
     domain: `salobj.Domain`
         Domain to use of the Remotes. If `None`, create a new domain.
+    lazy: `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared: `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
+    iers_path : `str`, `pathlib.Path` or `None`, optional
+        Local IERS-A file used for the sidereal time and coordinate
+        transformations. If given, astropy IERS downloads are disabled, the
+        table is read from this file (or the IERS-B table bundled with
+        astropy is used if the file does not exist) and the sidereal time
+        grid is computed, so the first slew does not stall on a download.
+        See `TimeService.load_iers`. If `None` (default) astropy handles the
+        IERS table as configured.
 
     """
 
@@ -109,6 +126,9 @@ class MTCS(BaseTCS):
         domain: typing.Optional[salobj.Domain] = None,
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
+        lazy: bool = False,
+        shared: bool = False,
+        iers_path: typing.Union[str, pathlib.Path, None] = None,
     ) -> None:
         super().__init__(
             components=[
@@ -126,7 +146,21 @@ class MTCS(BaseTCS):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
             concurrent_operation=False,
+            iers_path=iers_path,
+        )
+
+        # Components are transitioned with limited concurrency, following the
+        # dependencies below (e.g. MTPtg must be enabled before MTMount), so
+        # enabling the group takes about the time of the critical path instead
+        # of the sum of all transitions.
+        self.max_concurrent_state_transitions = 4
+        self.state_transition_dependencies = dict(
+            mtmount=["mtptg"],
+            mtaos=["mtm1m3", "mtm2", "mthexapod_1", "mthexapod_2"],
+            mtdometrajectory=["mtdome", "mtmount"],
         )
 
         self.open_dome_shutter_time = 1200.0
@@ -162,6 +196,16 @@ class MTCS(BaseTCS):
         self.tel_open_el = 70.0
         self.tel_settle_time = 3.0
         self.tel_operate_mirror_covers_el = 20.0
+
+        # Nominal kinematic limits; fit the model to recorded slews for the
+        # actual performance.
+        self.slew_time_model = SlewTimeModel(
+            az=AxisLimits(velocity=10.5, acceleration=10.5),
+            el=AxisLimits(velocity=5.25, acceleration=5.25),
+            rot=AxisLimits(velocity=3.5, acceleration=1.0),
+            dome=AxisLimits(velocity=1.5, acceleration=0.75),
+            settle_time=self.tel_settle_time,
+        )
         self.tel_operate_dome_shutter_el = 5.0
 
         # Tolerance to the rotator position for move commands.
@@ -183,6 +227,12 @@ class MTCS(BaseTCS):
         self.home_both_axes_timeout = 300.0
 
         self._dome_az_in_position: typing.Union[None, asyncio.Event] = None
+
+        # Receive the telemetry in monitor_position with topic callbacks,
+        # instead of polling it, and log the position every
+        # monitor_position_log_interval seconds.
+        self.monitor_position_streaming = False
+        self.monitor_position_log_interval = self.fast_timeout
         self._dome_el_in_positio: typing.Union[None, asyncio.Event] = None
 
         self.dome_az_unpark_offset = 0.1  # A small move to un-park the Dome
@@ -218,6 +268,9 @@ class MTCS(BaseTCS):
         # AOS enable / disable closed loop timeout, in seconds.
         self.aos_closed_loop_timeout = 100.0
 
+        # Execution time of each stage of the last slew, in seconds.
+        self.slew_timings: typing.Dict[str, float] = dict()
+
         try:
             self._create_asyncio_events()
         except RuntimeError:
@@ -287,6 +340,8 @@ class MTCS(BaseTCS):
 
         _check = copy.copy(self.check) if check is None else copy.copy(check)
 
+        await self._resume_dome_following()
+
         ccw_following = await self.rem.mtmount.evt_cameraCableWrapFollowing.aget(
             timeout=self.fast_timeout
         )
@@ -333,74 +388,80 @@ class MTCS(BaseTCS):
             ]
         )
 
-        async with self.m1m3_booster_valve():
-            for comp in self.components_attr:
-                if getattr(_check, comp):
-                    self.log.debug(f"Checking state of {comp}.")
-                    getattr(self.rem, comp).evt_summaryState.flush()
-                    self.scheduled_coro.append(
-                        asyncio.create_task(self.check_component_state(comp))
+        supervisor = TaskSupervisor(name="slew", log=self.log)
+        monitor_tasks = []
+
+        try:
+            async with supervisor:
+                async with self.m1m3_booster_valve():
+                    for comp in self.components_attr:
+                        if getattr(_check, comp):
+                            self.log.debug(f"Checking state of {comp}.")
+                            self.flush_summary_state(comp)
+                            supervisor.create_task(
+                                self.check_component_state(comp),
+                                name=f"check_{comp}",
+                            )
+                            monitor_tasks.append(f"check_{comp}")
+
+                    await self.handle_aos_close_loop()
+                    await slew_cmd.start(timeout=slew_timeout)
+                    self._dome_az_in_position.clear()
+                    if offset_cmd is not None:
+                        await offset_cmd.start(timeout=self.fast_timeout)
+
+                    self.log.debug("Scheduling check coroutines")
+
+                    supervisor.create_task(
+                        self.monitor_position(), name="monitor_position"
                     )
+                    monitor_tasks.append("monitor_position")
+
+                    # We wait for the mount to be in position first.
+                    if _check.mtmount:
+                        supervisor.create_task(
+                            self.wait_for_mtmount_inposition(
+                                timeout=slew_timeout, wait_settle=wait_settle
+                            ),
+                            name="mtmount_in_position",
+                        )
 
-            await self.handle_aos_close_loop()
-            await slew_cmd.start(timeout=slew_timeout)
-            self._dome_az_in_position.clear()
-            if offset_cmd is not None:
-                await offset_cmd.start(timeout=self.fast_timeout)
+                    check_mtdome = _check.mtdome
+                    _check.mtdome = False
+                    _check.mtmount = False
+                    supervisor.create_task(
+                        self.wait_for_inposition(
+                            timeout=slew_timeout, wait_settle=wait_settle, check=_check
+                        ),
+                        name="tcs_in_position",
+                    )
 
-            self.log.debug("Scheduling check coroutines")
+                    if "mtmount_in_position" in supervisor.names:
+                        await supervisor.wait(
+                            ["mtmount_in_position"] + monitor_tasks,
+                            return_when=TaskSupervisor.FIRST_COMPLETED,
+                        )
+                        self.log.info("Mount in position.")
 
-            # We wait for the mount to be in position first.
-            if _check.mtmount:
-                self.scheduled_coro.append(
-                    asyncio.create_task(
-                        self.wait_for_mtmount_inposition(
-                            timeout=slew_timeout, wait_settle=wait_settle
+                    if check_mtdome:
+                        supervisor.create_task(
+                            self.wait_for_dome_inposition(timeout=slew_timeout),
+                            name="mtdome_in_position",
                         )
-                    )
-                )
 
-            check_mtdome = _check.mtdome
-            _check.mtdome = False
-            _check.mtmount = False
-            check_tcs_no_dome_no_mount_task = asyncio.create_task(
-                self.wait_for_inposition(
-                    timeout=slew_timeout, wait_settle=wait_settle, check=_check
+                # Now that the mount is in position we wait for everything
+                # else on TCS minus dome.
+                self.log.info("Waiting for remaining TCS components to be in position.")
+                await supervisor.wait(
+                    ["tcs_in_position"] + monitor_tasks,
+                    return_when=TaskSupervisor.FIRST_COMPLETED,
+                    cancel_pending=True,
                 )
-            )
-
-            self.scheduled_coro.append(asyncio.create_task(self.monitor_position()))
-
-            for task in asyncio.as_completed(self.scheduled_coro):
-                try:
-                    await task
-                except BaseException as e:
-                    await self.cancel_not_done(self.scheduled_coro)
-                    check_tcs_no_dome_no_mount_task.cancel()
-                    raise e
-                else:
-                    self.log.info("Mount in position.")
-                    break
-
-            # Now that the mount is in position we wait for everything else
-            # on TCS minus dome.
-            self.scheduled_coro = [
-                task for task in self.scheduled_coro if not task.done()
-            ]
-
-            self.scheduled_coro.append(check_tcs_no_dome_no_mount_task)
-
-            wait_for_dome_inposition_task = (
-                asyncio.create_task(self.wait_for_dome_inposition(timeout=slew_timeout))
-                if check_mtdome
-                else utils.make_done_future()
-            )
-        self.log.info("Waiting for remaining TCS components to be in position.")
-        await self.process_as_completed(self.scheduled_coro)
-        self.scheduled_coro = [task for task in self.scheduled_coro if not task.done()]
-        self.scheduled_coro.append(wait_for_dome_inposition_task)
-        self.log.info("Waiting for dome to be in position.")
-        await self.process_as_completed(self.scheduled_coro)
+                self.log.info("Waiting for dome to be in position.")
+                await supervisor.wait()
+        finally:
+            self.slew_timings = supervisor.timings
+            self.log.debug(f"Slew timings: {self.slew_timings}")
 
     async def handle_aos_close_loop(self) -> None:
         """Handle MTAOS close loop.
@@ -508,6 +569,10 @@ class MTCS(BaseTCS):
         useful during slew activities to make sure everything is going as
         expected.
 
+        If `monitor_position_streaming` is `True` the telemetry is received
+        with topic callbacks, see `_monitor_position_streaming`, instead of
+        being polled.
+
         Parameters
         ----------
         check : `types.SimpleNamespace` or `None`
@@ -522,6 +587,10 @@ class MTCS(BaseTCS):
 
         self.log.debug("Monitor position started.")
 
+        if self.monitor_position_streaming:
+            await self._monitor_position_streaming(_check)
+            return
+
         # xml 7.1/8.0 backward compatibility
         mtmount_actual_position_name = "actualPosition"
 
@@ -537,85 +606,213 @@ class MTCS(BaseTCS):
                     "Not receiving target events from the NewMTMount. "
                     "Check component for errors."
                 )
-            if not hasattr(
-                self.rem.mtmount.tel_azimuth.DataType(), mtmount_actual_position_name
-            ):
-                self.log.debug("Running in xml 7.1 compatibility mode.")
-                mtmount_actual_position_name = "angleActual"
+            mtmount_actual_position_name = self._get_mtmount_actual_position_name()
 
         while True:
-            status = ""
+            samples = types.SimpleNamespace()
 
             if _check.mtmount:
-                target, tel_az, tel_el = await asyncio.gather(
-                    self.rem.mtmount.evt_target.next(
-                        flush=True, timeout=self.long_timeout
-                    ),
-                    self.rem.mtmount.tel_azimuth.next(
-                        flush=True, timeout=self.fast_timeout
-                    ),
-                    self.rem.mtmount.tel_elevation.next(
-                        flush=True, timeout=self.fast_timeout
-                    ),
-                )
-                tel_az_actual_position = getattr(tel_az, mtmount_actual_position_name)
-                tel_el_actual_position = getattr(tel_el, mtmount_actual_position_name)
-                distance_az = angle_diff(target.azimuth, tel_az_actual_position)
-                distance_el = angle_diff(target.elevation, tel_el_actual_position)
-                status += (
-                    f"[Tel]: Az = {tel_az_actual_position:+08.3f}[{distance_az.deg:+6.1f}]; "
-                    f"El = {tel_el_actual_position:+08.3f}[{distance_el.deg:+6.1f}] "
+                samples.target, samples.azimuth, samples.elevation = (
+                    await asyncio.gather(
+                        self.rem.mtmount.evt_target.next(
+                            flush=True, timeout=self.long_timeout
+                        ),
+                        self.rem.mtmount.tel_azimuth.next(
+                            flush=True, timeout=self.fast_timeout
+                        ),
+                        self.rem.mtmount.tel_elevation.next(
+                            flush=True, timeout=self.fast_timeout
+                        ),
+                    )
                 )
 
             if _check.mtrotator:
-                rotation_data = await self.rem.mtrotator.tel_rotation.next(
+                samples.rotation = await self.rem.mtrotator.tel_rotation.next(
                     flush=True, timeout=self.fast_timeout
                 )
-                distance_rot = angle_diff(
-                    rotation_data.demandPosition, rotation_data.actualPosition
-                )
-                status += f"[Rot]: {rotation_data.demandPosition:+08.3f}[{distance_rot.deg:+6.1f}] "
 
             if _check.mtdome:
-                dome_az = await self.rem.mtdome.tel_azimuth.next(
+                samples.dome_azimuth = await self.rem.mtdome.tel_azimuth.next(
                     flush=True, timeout=self.fast_timeout
                 )
-                dome_az_diff = angle_diff(
-                    dome_az.positionActual, dome_az.positionCommanded
-                )
+                self._handle_dome_azimuth_sample(samples.dome_azimuth)
+
+            status = self._get_position_status(samples, mtmount_actual_position_name)
+
+            if len(status) > 0:
+                self.log.debug(status)
 
-                if np.abs(dome_az_diff) < self.dome_slew_tolerance:
-                    self._dome_az_in_position.set()
+            await self.clock.sleep(self.fast_timeout)
 
-                if False:
-                    # TODO (DM-44014): Re-enable when MTDome is handling
-                    # lightWindScreen
+    async def _monitor_position_streaming(self, check: typing.Any) -> None:
+        """Monitor MTCS axis position from topic callbacks.
 
-                    dome_el = await self.rem.mtdome.tel_lightWindScreen.next(
-                        flush=True, timeout=self.fast_timeout
-                    )
+        The latest samples of the mount target and axes, rotator and dome
+        azimuth are kept as they arrive, through the group topic caches (see
+        `get_topic_cache`), and the dome in position events are set as soon
+        as a dome sample is within `dome_slew_tolerance`. The position is
+        logged every `monitor_position_log_interval` seconds.
+
+        Parameters
+        ----------
+        check : `types.SimpleNamespace`
+            Defines which resources are monitored.
+
+        Notes
+        -----
+        Once the topic caches are registered, the topics have callbacks and
+        can no longer be read with ``next``, so the polling monitor cannot
+        be used anymore by the same instance.
+        """
+        samples = types.SimpleNamespace()
+
+        topics = []
+        if check.mtmount:
+            topics += [
+                ("mtmount", "evt_target", "target"),
+                ("mtmount", "tel_azimuth", "azimuth"),
+                ("mtmount", "tel_elevation", "elevation"),
+            ]
+        if check.mtrotator:
+            topics.append(("mtrotator", "tel_rotation", "rotation"))
+        if check.mtdome:
+            topics.append(("mtdome", "tel_azimuth", "dome_azimuth"))
+
+        def make_listener(name: str) -> typing.Callable[[typing.Any], None]:
+            def listener(sample: typing.Any) -> None:
+                setattr(samples, name, sample)
+                if name == "dome_azimuth":
+                    self._handle_dome_azimuth_sample(sample)
+
+            return listener
 
-                    dome_el_diff = angle_diff(
-                        dome_el.positionActual, dome_el.positionCommanded
+        listeners = []
+
+        try:
+            for component, topic_name, name in topics:
+                topic_cache = self.get_topic_cache(component, topic_name)
+                listener = make_listener(name)
+                topic_cache.add_listener(listener)
+                listeners.append((topic_cache, listener))
+                if topic_cache.sample is not None:
+                    listener(topic_cache.sample)
+
+            mtmount_actual_position_name = "actualPosition"
+
+            if check.mtmount:
+                self.log.debug("Waiting for Target event from mtmount.")
+                try:
+                    target = await self.get_topic_cache("mtmount", "evt_target").aget(
+                        timeout=self.long_timeout
+                    )
+                    self.log.debug(f"Mount target: {target}")
+                except asyncio.TimeoutError:
+                    raise RuntimeError(
+                        "Not receiving target events from the NewMTMount. "
+                        "Check component for errors."
                     )
-                    if np.abs(dome_el_diff) < self.dome_slew_tolerance:
-                        self._dome_el_in_position.set()
-
-                # TODO (DM-44014): Remove line below.
-                self._dome_el_in_position.set()
-
-                status += (
-                    f"[Dome] Az = {dome_az.positionActual:+08.3f} "
-                    f"[{dome_az_diff:+08.3f}::{self.dome_slew_tolerance}]"
-                    # TODO (DM-44014): Uncomment when MTDome is handling
-                    # lightWindScreen
-                    # f"El = {dome_el.positionActual:+08.3f} "
+                mtmount_actual_position_name = self._get_mtmount_actual_position_name()
+
+            while True:
+                status = self._get_position_status(
+                    samples, mtmount_actual_position_name
                 )
 
-            if len(status) > 0:
-                self.log.debug(status)
+                if len(status) > 0:
+                    self.log.debug(status)
+
+                await self.clock.sleep(self.monitor_position_log_interval)
+        finally:
+            for topic_cache, listener in listeners:
+                topic_cache.remove_listener(listener)
 
-            await asyncio.sleep(self.fast_timeout)
+    def _get_mtmount_actual_position_name(self) -> str:
+        """Get the name of the actual position attribute of the mount axes
+        telemetry (xml 7.1/8.0 backward compatibility).
+        """
+        if not hasattr(self.rem.mtmount.tel_azimuth.DataType(), "actualPosition"):
+            self.log.debug("Running in xml 7.1 compatibility mode.")
+            return "angleActual"
+
+        return "actualPosition"
+
+    def _handle_dome_azimuth_sample(self, dome_az: typing.Any) -> None:
+        """Set the dome in position events from a dome azimuth sample.
+
+        Parameters
+        ----------
+        dome_az : ``object``
+            MTDome azimuth telemetry sample.
+        """
+        assert self._dome_az_in_position is not None
+        assert self._dome_el_in_position is not None
+
+        dome_az_diff = angle_diff(dome_az.positionActual, dome_az.positionCommanded)
+
+        if np.abs(dome_az_diff) < self.dome_slew_tolerance:
+            self._dome_az_in_position.set()
+
+        # TODO (DM-44014): Set from tel_lightWindScreen when MTDome is
+        # handling lightWindScreen.
+        self._dome_el_in_position.set()
+
+    def _get_position_status(
+        self, samples: types.SimpleNamespace, mtmount_actual_position_name: str
+    ) -> str:
+        """Format the position of the axes.
+
+        Parameters
+        ----------
+        samples : `types.SimpleNamespace`
+            Latest samples, with attributes "target", "azimuth",
+            "elevation", "rotation" and "dome_azimuth". Missing attributes
+            are skipped.
+        mtmount_actual_position_name : `str`
+            Name of the actual position attribute of the mount axes
+            telemetry.
+
+        Returns
+        -------
+        status : `str`
+            Position status.
+        """
+        status = ""
+
+        target = getattr(samples, "target", None)
+        tel_az = getattr(samples, "azimuth", None)
+        tel_el = getattr(samples, "elevation", None)
+
+        if target is not None and tel_az is not None and tel_el is not None:
+            tel_az_actual_position = getattr(tel_az, mtmount_actual_position_name)
+            tel_el_actual_position = getattr(tel_el, mtmount_actual_position_name)
+            distance_az = angle_diff(target.azimuth, tel_az_actual_position)
+            distance_el = angle_diff(target.elevation, tel_el_actual_position)
+            status += (
+                f"[Tel]: Az = {tel_az_actual_position:+08.3f}[{distance_az.deg:+6.1f}]; "
+                f"El = {tel_el_actual_position:+08.3f}[{distance_el.deg:+6.1f}] "
+            )
+
+        rotation_data = getattr(samples, "rotation", None)
+
+        if rotation_data is not None:
+            distance_rot = angle_diff(
+                rotation_data.demandPosition, rotation_data.actualPosition
+            )
+            status += f"[Rot]: {rotation_data.demandPosition:+08.3f}[{distance_rot.deg:+6.1f}] "
+
+        dome_az = getattr(samples, "dome_azimuth", None)
+
+        if dome_az is not None:
+            dome_az_diff = angle_diff(dome_az.positionActual, dome_az.positionCommanded)
+            status += (
+                f"[Dome] Az = {dome_az.positionActual:+08.3f} "
+                f"[{dome_az_diff:+08.3f}::{self.dome_slew_tolerance}]"
+                # TODO (DM-44014): Uncomment when MTDome is handling
+                # lightWindScreen
+                # f"El = {dome_el.positionActual:+08.3f} "
+            )
+
+        return status
 
     async def wait_for_mtmount_inposition(
         self, timeout: float, wait_settle: bool = True
@@ -1087,6 +1284,10 @@ class MTCS(BaseTCS):
         self.log.info(f"Slewing MT dome to position az = {az}.")
         await self.assert_all_enabled()
 
+        # Dome following stays disabled after this move, so it is no longer
+        # resumed after a previous pre-positioning of the dome.
+        self._dome_pre_positioned = False
+
         await self.disable_dome_following(check)
 
         self.rem.mtdome.evt_azMotion.flush()
@@ -1104,6 +1305,29 @@ class MTCS(BaseTCS):
             component_name="MTDome",
         )
 
+    async def _move_dome_azimuth(self, az: float, check: typing.Any = None) -> None:
+        """Command the dome to move in azimuth, without waiting for it to
+        get in position.
+
+        Parameters
+        ----------
+        az : `float`
+            Azimuth angle for the dome (in deg).
+        check : `types.SimpleNamespace` or `None`
+            Override `self.check` for defining which resources are used.
+
+        Raises
+        ------
+        RuntimeError
+            If the dome is deactivated in ``check``.
+        """
+        if not (self.check if check is None else check).mtdome:
+            raise RuntimeError("MTDome is deactivated. Cannot move the dome.")
+
+        await self.rem.mtdome.cmd_moveAz.set_start(
+            position=az, velocity=0.0, timeout=self.long_long_timeout
+        )
+
     async def close_dome(self, force: bool = False) -> None:
         """Method to close dome shutter.
 
@@ -1384,7 +1608,7 @@ class MTCS(BaseTCS):
                         f"Waiting {self.fast_timeout} s before retrying.",
                         exc_info=True,
                     )
-                    await asyncio.sleep(self.fast_timeout)
+                    await self.clock.sleep(self.fast_timeout)
             else:
                 raise RuntimeError(
                     f"Failed to home both axes after {homing_attempts} attempts."
@@ -2056,6 +2280,27 @@ class MTCS(BaseTCS):
 
         return rotation_data.actualPosition + 90
 
+    async def get_slew_position(self) -> SlewPosition:
+        """Get the current position of the telescope axes and dome, as
+        used by the slew time estimates.
+
+        Returns
+        -------
+        position : `SlewPosition`
+            Mount azimuth and elevation, rotator and dome azimuth (deg).
+        """
+        azimuth = await self.rem.mtmount.tel_azimuth.aget(timeout=self.fast_timeout)
+        elevation = await self.rem.mtmount.tel_elevation.aget(timeout=self.fast_timeout)
+        rotation = await self.rem.mtrotator.tel_rotation.aget(timeout=self.fast_timeout)
+        dome_azimuth = await self.rem.mtdome.tel_azimuth.aget(timeout=self.fast_timeout)
+
+        return SlewPosition(
+            az=azimuth.actualPosition,
+            el=elevation.actualPosition,
+            rot=rotation.actualPosition,
+            dome_az=dome_azimuth.positionActual,
+        )
+
     async def raise_m1m3(self) -> None:
         """Raise M1M3."""
         await self._execute_m1m3_detailed_state_change(
@@ -2304,7 +2549,7 @@ class MTCS(BaseTCS):
         self.log.info("Checking if the hard point breakaway test has passed.")
 
         timer_task = asyncio.create_task(
-            asyncio.sleep(self.timeout_hardpoint_test_status)
+            self.clock.sleep(self.timeout_hardpoint_test_status)
         )
         while not timer_task.done():
             hp_test_state = MTM1M3.HardpointTest(
@@ -2324,8 +2569,8 @@ class MTCS(BaseTCS):
                 self.log.info(f"Hard point {hp} test state: {hp_test_state!r}.")
 
             try:
-                await self.rem.mtm1m3.evt_heartbeat.next(
-                    flush=True, timeout=self.timeout_hardpoint_test_status
+                await self.next_heartbeat(
+                    "mtm1m3", timeout=self.timeout_hardpoint_test_status
                 )
             except asyncio.TimeoutError:
                 raise RuntimeError(
@@ -2370,9 +2615,7 @@ class MTCS(BaseTCS):
             }
 
         while True:
-            await self.rem.mtm1m3.evt_heartbeat.next(
-                flush=True, timeout=self.fast_timeout
-            )
+            await self.next_heartbeat("mtm1m3")
             bump_test_status = (
                 await self.rem.mtm1m3.evt_forceActuatorBumpTestStatus.aget(
                     timeout=self.long_timeout
@@ -2534,7 +2777,7 @@ class MTCS(BaseTCS):
                         "No new force actuator bumpt test data. Using latest value."
                     )
             else:
-                await asyncio.sleep(0.1)
+                await self.clock.sleep(0.1)
 
             if self.is_actuator_in_testing_state(
                 selected_force_actuator, bump_test_status
@@ -2737,7 +2980,7 @@ class MTCS(BaseTCS):
                 self.log.warning("Command timed out, continuing.")
             self.log.info("Waiting for force balance system to settle.")
             await self._wait_force_balance_system_state(enable=enable)
-            await asyncio.sleep(self.m1m3_settle_time)
+            await self.settle(self.m1m3_settle_time, component="mtm1m3")
         else:
             self.log.warning(
                 f"Hardpoint corrections already in desired state ({enable=}). Nothing to do."
@@ -2796,9 +3039,9 @@ class MTCS(BaseTCS):
                 "Force magnitude is zero. If force balance system is off this operation will fail. "
                 f"Waiting {self.fast_timeout}s before proceeding."
             )
-            await asyncio.sleep(self.fast_timeout)
+            await self.clock.sleep(self.fast_timeout)
 
-        timer_task: asyncio.Task = asyncio.create_task(asyncio.sleep(timeout))
+        timer_task: asyncio.Task = asyncio.create_task(self.clock.sleep(timeout))
 
         while not timer_task.done():
             applied_balance_forces_new = await self.next_m1m3_applied_balance_forces(
@@ -2973,7 +3216,7 @@ class MTCS(BaseTCS):
             timeout=self.long_timeout,
         )
 
-        await asyncio.wait_for(
+        await self.clock.wait_for(
             self._wait_bump_test_ok(
                 actuator_id=actuator_id,
                 primary=primary,
@@ -3175,7 +3418,7 @@ class MTCS(BaseTCS):
             force=force,
         )
 
-        await asyncio.wait_for(
+        await self.clock.wait_for(
             self._wait_m2_bump_test_ok(
                 actuator=actuator,
             ),
@@ -3469,9 +3712,7 @@ class MTCS(BaseTCS):
         ntries = 2
         for i in range(ntries):
             try:
-                await self.rem.mtrotator.evt_heartbeat.next(
-                    flush=True, timeout=self.fast_timeout
-                )
+                await self.next_heartbeat("mtrotator")
             except asyncio.TimeoutError:
                 self.log.warning(
                     "Could not get a heartbeat from the rotator. Move command will probably fail!"
@@ -3611,6 +3852,8 @@ class MTCS(BaseTCS):
             (in seconds).
         """
 
+        await self._resume_dome_following()
+
         async with self.m1m3_booster_valve():
             tasks = [
                 asyncio.create_task(self.check_component_state(component))
@@ -3644,6 +3887,8 @@ class MTCS(BaseTCS):
             Timeout for positioning the telescope, by default 120.0
             (in seconds)
         """
+        await self._resume_dome_following()
+
         async with self.m1m3_booster_valve():
             azel = self.azel_from_radec(ra=ra, dec=dec)
             tasks = [
@@ -4038,7 +4283,7 @@ class MTCS(BaseTCS):
         # Later we need to implement a better way to check that the hardpoint
         # forces have settle. See OBS-194.
         self.log.debug("Waiting for m1m3 to settle.")
-        await asyncio.sleep(self.m1m3_settle_time)
+        await self.settle(self.m1m3_settle_time, component="mtm1m3")
 
     async def set_m1m3_slew_controller_settings(
         self, slew_setting: enum.IntEnum, enable_slew_management: bool
@@ -45,6 +45,12 @@ class MTQueue(ScriptQueue):
         used to limit the resources allocated by the class by gathering some
         knowledge about the usage intention. By default allocates all
         resources.
+    lazy : `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared : `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     def __init__(
@@ -52,5 +58,14 @@ class MTQueue(ScriptQueue):
         domain: typing.Optional[typing.Union[salobj.Domain, str]] = None,
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
-        super().__init__(SalIndex.MAIN_TEL, domain, log, intended_usage)
+        super().__init__(
+            SalIndex.MAIN_TEL,
+            domain,
+            log,
+            intended_usage,
+            lazy=lazy,
+            shared=shared,
+        )
@@ -19,19 +19,136 @@
 # You should have received a copy of the GNU General Public License
 
 import asyncio
+import contextlib
 import logging
+import os
 import traceback
 import types
 import typing
 
 from lsst.ts import salobj
-
-from .utils import handle_exception_in_dict_items
+from lsst.ts.utils import current_tai
+
+from .utils import (
+    Clock,
+    LatencyModel,
+    LazyRemote,
+    LivelinessMonitor,
+    RealClock,
+    RemoteHook,
+    RemoteNamespace,
+    RemotePool,
+    TopicCache,
+    TopicSnapshot,
+    Tracer,
+    UsageProfiler,
+    handle_exception_in_dict_items,
+)
 
 __all__ = ["Usages", "UsagesResources", "RemoteGroup"]
 
 TRemoteGroup = typing.TypeVar("TRemoteGroup", bound="RemoteGroup")
 
+# Ordered list of states reachable with the state transition commands.
+_STATE_SEQUENCE = (
+    salobj.State.OFFLINE,
+    salobj.State.STANDBY,
+    salobj.State.DISABLED,
+    salobj.State.ENABLED,
+)
+
+# Command to go up/down from a state in _STATE_SEQUENCE.
+_STATE_UP_COMMAND = {
+    salobj.State.OFFLINE: "enterControl",
+    salobj.State.STANDBY: "start",
+    salobj.State.DISABLED: "enable",
+}
+_STATE_DOWN_COMMAND = {
+    salobj.State.ENABLED: "disable",
+    salobj.State.DISABLED: "standby",
+    salobj.State.STANDBY: "exitControl",
+}
+
+
+def _get_state_transition_commands(
+    current_state: salobj.State, desired_state: salobj.State
+) -> typing.List[typing.Tuple[str, salobj.State]]:
+    """Get the state transition commands to go from one summary state to
+    another.
+
+    Parameters
+    ----------
+    current_state : `salobj.State`
+        Current state.
+    desired_state : `salobj.State`
+        Desired state. Must not be `salobj.State.FAULT`.
+
+    Returns
+    -------
+    commands : `list` [`tuple` [`str`, `salobj.State`]]
+        List of (command name, expected state after the command).
+
+    Raises
+    ------
+    ValueError
+        If `desired_state` is `salobj.State.FAULT`.
+    """
+    if desired_state not in _STATE_SEQUENCE:
+        raise ValueError(
+            f"Invalid desired state {desired_state!r}. Must be one of {_STATE_SEQUENCE}."
+        )
+
+    commands: typing.List[typing.Tuple[str, salobj.State]] = []
+
+    if current_state == salobj.State.FAULT:
+        commands.append(("standby", salobj.State.STANDBY))
+        current_state = salobj.State.STANDBY
+
+    current_index = _STATE_SEQUENCE.index(current_state)
+    desired_index = _STATE_SEQUENCE.index(desired_state)
+
+    while current_index < desired_index:
+        commands.append(
+            (
+                _STATE_UP_COMMAND[_STATE_SEQUENCE[current_index]],
+                _STATE_SEQUENCE[current_index + 1],
+            )
+        )
+        current_index += 1
+
+    while current_index > desired_index:
+        commands.append(
+            (
+                _STATE_DOWN_COMMAND[_STATE_SEQUENCE[current_index]],
+                _STATE_SEQUENCE[current_index - 1],
+            )
+        )
+        current_index -= 1
+
+    return commands
+
+
+async def _in_state(state: salobj.State) -> typing.List[salobj.State]:
+    """Report a component that is already in the desired state.
+
+    Parameters
+    ----------
+    state : `salobj.State`
+        Current state.
+
+    Returns
+    -------
+    states : `list` [`salobj.State`]
+        List with the current state, in the same format as returned by
+        `salobj.set_summary_state`.
+    """
+    return [state]
+
+
+async def _noop() -> None:
+    """Do nothing, for components that are not part of an operation."""
+    return None
+
 
 class Usages:
     """Define usages for a `RemoteGroup`.
@@ -200,7 +317,17 @@ class RemoteGroup:
         resources.
     concurrent_operation : `bool`, optional
         If `False`, tasks like `enable` and other concurrent tasks will be done
-        sequentially. Default=True.
+        sequentially, unless `max_concurrent_state_transitions` is set.
+        Default=True.
+    lazy : `bool`, optional
+        If `True`, the remotes are only created (and started) when they are
+        first used, instead of when the group is created. See Notes.
+        Default=False.
+    shared : `bool`, optional
+        If `True`, get the remotes from the process-wide `RemotePool`, sharing
+        them with other groups created with ``shared=True``, and, if
+        ``domain`` is `None`, use the domain of the pool. See Notes.
+        Default=False.
 
     Attributes
     ----------
@@ -215,17 +342,36 @@ class RemoteGroup:
         MTMount -> mtmount, Hexapod:1 -> hexapod_1.
     valid_use_cases
     usages
-    rem :  `types.SimpleNamespace`
+    rem :  `RemoteNamespace`
         Namespace with Remotes for all the components defined in the group.
         The name of the component is converted to all lowercase and indexed
         component have an underscore instead of a colon, e.g. MTMount ->
-        mtmount, Hexapod:1 -> hexapod_1.
+        mtmount, Hexapod:1 -> hexapod_1. Hooks registered with
+        `add_remote_hook` see the topics accessed through it.
     check : `types.SimpleNamespace`
         Allow users to specify if a component should be part of operations. For
         each component in `rem`, there will be an equivalent (with same name)
         in this namespace, with a boolean value. When subclassing, users may
         use this flag to skip components in different kinds of operations as
         well.
+    use_topic_cache : `bool`
+        If `True`, the methods that read the summary state and heartbeat of
+        the components (e.g. `get_state`, `next_state`,
+        `check_component_state`, `check_comp_heartbeat`) share a single
+        `TopicCache` per component and topic, instead of reading the remote
+        topics independently. Default is `False`.
+    tracer : `Tracer` or `None`
+        Tracer recording the time spent in commands, event waits and settle
+        times, set by `start_tracing`. Default is `None` (no tracing).
+    latency_model : `LatencyModel` or `None`
+        Model of the command latencies, set by `start_latency_model`. When
+        set, command durations are recorded and `get_timeout` returns the
+        learned timeouts. Default is `None`.
+
+    clock : `Clock`
+        Clock used for the sleeps, timeouts and TAI reads of the group.
+        Default is a `RealClock`; assign a `VirtualClock` to run sequences in
+        accelerated, virtual time (e.g. in simulations).
 
     Notes
     -----
@@ -242,6 +388,28 @@ class RemoteGroup:
     `intended_usage=BaseUsages.All`. When set to `None` the class will load all
     available resources. When set to `BaseUsages.All`, the class will load the
     resources needed for all defined operations.
+
+    When `lazy=True`, the entries in `rem` are `LazyRemote` instances. The
+    `salobj.Remote` for a component is only created when one of its attributes
+    is accessed, and the group methods that operate on several components
+    (e.g. `set_state`) only start the remotes of the components they need. In
+    this mode the group `start_task` is `None`, so starting the group does not
+    wait for any remote. Use `start_remotes` to create and start remotes ahead
+    of time.
+
+    When `shared=True`, groups that have components in common (e.g. `MTCS`
+    and `LSSTCam` created side by side in a script) use the same remote for
+    them, as long as the existing remote includes all the topics the group
+    needs, and closing a group only closes the remotes no other group uses.
+    Since topic callbacks are shared as well, only one of the groups sharing
+    a remote should use the topic cache or the liveliness monitor.
+
+    The read queues of the topics are shared too: a sample consumed by one
+    group with ``next``, or discarded with ``flush`` (as many methods do
+    before waiting for an event), is no longer available to the other
+    groups. Groups sharing a remote must therefore not wait on the same
+    topics at the same time, e.g. a shared `MTCS` and `LSSTCam` must not
+    run operations that wait on the same events of a component concurrently.
     """
 
     def __init__(
@@ -251,6 +419,8 @@ class RemoteGroup:
         log: typing.Optional[logging.Logger] = None,
         intended_usage: typing.Optional[int] = None,
         concurrent_operation: bool = True,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         if log is None:
             self.log = logging.getLogger(type(self).__name__)
@@ -270,20 +440,53 @@ class RemoteGroup:
             ]
         )
 
-        self.domain, self._close_domain = (
-            (domain, False) if domain is not None else (salobj.Domain(), True)
-        )
+        self._remote_pool = RemotePool.get_default() if shared else None
+        self._release_domain = False
+
+        if domain is not None:
+            self.domain, self._close_domain = domain, False
+        elif self._remote_pool is not None:
+            self.domain, self._close_domain = self._remote_pool.acquire_domain(), False
+            self._release_domain = True
+        else:
+            self.domain, self._close_domain = salobj.Domain(), True
 
         self._usages: typing.Union[None, typing.Dict[int, UsagesResources]] = None
 
-        self.rem = types.SimpleNamespace()
+        self.rem = RemoteNamespace()
 
         for component in self._components:
             name, index = salobj.name_to_name_index(component)
             rname = self._components[component]
             resources = self.get_required_resources(rname, intended_usage)
 
-            if resources.add_this:
+            if resources.add_this and self._remote_pool is not None:
+                setattr(
+                    self.rem,
+                    rname,
+                    self._remote_pool.acquire(
+                        domain=self.domain,
+                        name=name,
+                        index=index,
+                        readonly=resources.readonly,
+                        include=resources.include,
+                        lazy=lazy,
+                    ),
+                )
+            elif resources.add_this and lazy:
+                setattr(
+                    self.rem,
+                    rname,
+                    LazyRemote(
+                        domain=self.domain,
+                        name=name,
+                        index=index,
+                        readonly=resources.readonly,
+                        include=resources.include,
+                        log=self.log,
+                    ),
+                )
+            elif resources.add_this:
                 setattr(
                     self.rem,
                     rname,
@@ -300,8 +503,27 @@ class RemoteGroup:
 
         self.scheduled_coro: typing.List[asyncio.Task] = []
 
+        self.use_topic_cache = False
+
+        self.liveliness_monitor: typing.Optional[LivelinessMonitor] = None
+
+        self.tracer: typing.Optional[Tracer] = None
+
+        self.clock: Clock = RealClock()
+
+        self.latency_model: typing.Optional[LatencyModel] = None
+        self._latency_model_path: typing.Optional[str] = None
+
+        self.state_transition_dependencies: typing.Dict[str, typing.List[str]] = dict()
+        self.max_concurrent_state_transitions: typing.Optional[int] = None
+
+        # Dict of (component attribute name, topic name): topic cache.
+        self._topic_caches: typing.Dict[typing.Tuple[str, str], TopicCache] = dict()
+
         # Dict of component attribute name: remote, if present, else None
-        attr_remotes = {attr: getattr(self.rem, attr) for attr in self.components_attr}
+        attr_remotes = {
+            attr: self.rem.get_remote(attr) for attr in self.components_attr
+        }
 
         # Mark components that were excluded from the resources to not be
         # checked.
@@ -310,7 +532,9 @@ class RemoteGroup:
         )
 
         start_task_list = [
-            remote.start_task for remote in attr_remotes.values() if remote is not None
+            remote.start_task
+            for remote in attr_remotes.values()
+            if remote is not None and not isinstance(remote, LazyRemote)
         ]
 
         self.start_task = (
@@ -379,6 +603,197 @@ class RemoteGroup:
                 )
                 setattr(self.check, attr_comp, False)
 
+    async def start_remotes(
+        self, components: typing.Optional[typing.List[str]] = None
+    ) -> None:
+        """Create and start the remotes of the components that were not
+        started yet.
+
+        This is only relevant when the group was created with `lazy=True`,
+        otherwise all remotes are started when the group starts.
+
+        Parameters
+        ----------
+        components : `list` of `str`, optional
+            Name of the components to start, as they appear in
+            `components_attr`. If `None` (default) start all components for
+            which check is enabled.
+        """
+        work_components = (
+            self.components_to_check()
+            if components is None
+            else self.get_work_components(components)
+        )
+
+        lazy_remotes = [
+            self.rem.get_remote(component)
+            for component in work_components
+            if isinstance(self.rem.get_remote(component), LazyRemote)
+        ]
+
+        if lazy_remotes:
+            await asyncio.gather(*[remote.start() for remote in lazy_remotes])
+
+    def set_lazy_include(self, include: typing.Dict[str, typing.List[str]]) -> None:
+        """Set the topics to include for remotes that were not created yet.
+
+        This is meant to be used with `lazy=True` together with a profile
+        recorded with `UsageProfiler`, so that each remote only reads the
+        topics that the operations of interest actually use, e.g.::
+
+            group.set_lazy_include(profiler.get_include(["slew_icrs"]))
+
+        Since topics cannot be added to a `salobj.Remote` after it starts,
+        topics are selected when the remote is first used.
+
+        Parameters
+        ----------
+        include : `dict` [`str`, `list` [`str`]]
+            Dictionary with component name, as it appears in
+            `components_attr`, and list of topic names without prefix.
+            Components not in the dictionary are left unchanged.
+
+        Raises
+        ------
+        RuntimeError
+            If a component is not part of the group, or is not a lazy remote,
+            or its remote was already created.
+        """
+        for component, topics in include.items():
+            remote = self.rem.get_remote(component)
+            if not isinstance(remote, LazyRemote):
+                raise RuntimeError(
+                    f"Component {component} is not a lazy remote in the group."
+                )
+            remote.include = list(topics)
+
+    def get_usages_resources_from_profile(
+        self,
+        profiler: UsageProfiler,
+        labels: typing.Union[None, str, typing.Iterable[str]] = None,
+    ) -> UsagesResources:
+        """Generate the `UsagesResources` for a set of operations recorded
+        with a `UsageProfiler`.
+
+        This can be used to generate the entries of the `usages` property
+        instead of maintaining the topic lists manually.
+
+        Parameters
+        ----------
+        profiler : `UsageProfiler`
+            Profiler used in a profiling run of the group.
+        labels : `str` or `list` of `str`, optional
+            Labels (e.g. method names) to include. If `None` (default) use all
+            recorded labels.
+
+        Returns
+        -------
+        usages_resources : `UsagesResources`
+            Resources required by the profiled operations. The remotes are
+            readonly if none of the operations send commands.
+        """
+        include = profiler.get_include(labels)
+
+        return UsagesResources(
+            components_attr=include.keys(),
+            readonly=not any(
+                profiler.uses_commands(component, labels) for component in include
+            ),
+            **include,
+        )
+
+    def is_remote_created(self, component: str) -> bool:
+        """Check if the remote for a component was created.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in `components_attr`.
+
+        Returns
+        -------
+        `bool`
+            `False` if the component is not part of the group resources or, in
+            lazy mode, if its remote was not created yet, `True` otherwise.
+        """
+        remote = self.rem.get_remote(component)
+
+        if isinstance(remote, LazyRemote):
+            return remote.is_created
+
+        return remote is not None
+
+    def uses_topic_cache(self, component: str, topic_name: str) -> bool:
+        """Check if a component topic must be read through the shared topic
+        cache.
+
+        This is the case when `use_topic_cache` is `True` or when a cache was
+        already registered for the topic (e.g. by the liveliness monitor),
+        since the topic then has a callback and cannot be read with
+        ``next``.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in `components_attr`.
+        topic_name : `str`
+            Name of the topic, e.g. "evt_summaryState".
+
+        Returns
+        -------
+        `bool`
+            `True` if the topic must be read through the cache.
+        """
+        return self.use_topic_cache or (component, topic_name) in self._topic_caches
+
+    def get_topic_cache(self, component: str, topic_name: str) -> TopicCache:
+        """Get the shared cache for a component topic.
+
+        The cache is created and registered in the remote topic the first
+        time it is requested. Subsequent calls return the same cache, so any
+        number of waiters share a single topic callback.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in `components_attr`.
+        topic_name : `str`
+            Name of the topic, e.g. "evt_summaryState" or "tel_azimuth".
+
+        Returns
+        -------
+        topic_cache : `TopicCache`
+            Cache for the component topic.
+
+        Raises
+        ------
+        RuntimeError
+            If the component is not part of the group or was not added to
+            the group.
+        """
+        key = (component, topic_name)
+
+        if key not in self._topic_caches:
+            if component not in self.components_attr:
+                raise RuntimeError(
+                    f"Component {component} not part of the group. "
+                    f"Must be one of {self.components_attr}."
+                )
+            remote = self.rem.get_remote(component)
+            if remote is None:
+                raise RuntimeError(
+                    f"Component {component} not available for the current usage."
+                )
+            topic_cache = TopicCache(
+                topic=getattr(remote, topic_name),
+                name=f"{component}.{topic_name}",
+                log=self.log,
+            )
+            topic_cache.register()
+            self._topic_caches[key] = topic_cache
+
+        return self._topic_caches[key]
+
     def get_required_resources(
         self, component: str, intended_usage: typing.Union[None, int]
     ) -> typing.Any:
@@ -487,8 +902,14 @@ class RemoteGroup:
 
         """
         try:
-            ss = await getattr(self.rem, component).evt_summaryState.aget(
-                timeout=self.fast_timeout
+            ss = (
+                await self.get_topic_cache(component, "evt_summaryState").aget(
+                    timeout=self.fast_timeout
+                )
+                if self.uses_topic_cache(component, "evt_summaryState")
+                else await getattr(self.rem, component).evt_summaryState.aget(
+                    timeout=self.fast_timeout
+                )
             )
             return salobj.State(ss.summaryState)
         except asyncio.TimeoutError:
@@ -514,12 +935,38 @@ class RemoteGroup:
         -------
         state : `salobj.State`
             Current state of component.
+
+        Notes
+        -----
+        When the summary state is read from the topic cache (see
+        `uses_topic_cache`) this returns the first state received after the
+        call, instead of the oldest unread state in the topic queue.
         """
-        ss = await getattr(self.rem, component).evt_summaryState.next(
-            flush=False, timeout=self.fast_timeout
+        ss = (
+            await self.get_topic_cache(component, "evt_summaryState").next(
+                timeout=self.fast_timeout
+            )
+            if self.uses_topic_cache(component, "evt_summaryState")
+            else await getattr(self.rem, component).evt_summaryState.next(
+                flush=False, timeout=self.fast_timeout
+            )
         )
         return salobj.State(ss.summaryState)
 
+    def flush_summary_state(self, component: str) -> None:
+        """Flush the summary state queue for a component.
+
+        When the summary state is read from the topic cache (see
+        `uses_topic_cache`), which has no queue, this method does nothing.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        """
+        if not self.uses_topic_cache(component, "evt_summaryState"):
+            getattr(self.rem, component).evt_summaryState.flush()
+
     async def check_component_state(
         self, component: str, desired_state: salobj.State = salobj.State.ENABLED
     ) -> None:
@@ -548,6 +995,20 @@ class RemoteGroup:
             If component is not found.
         """
         desired_state = salobj.State(desired_state)
+
+        if self.uses_topic_cache(component, "evt_summaryState"):
+            state_cache = self.get_topic_cache(component, "evt_summaryState")
+            data = await state_cache.aget()
+            self.log.debug(f"{component}: {salobj.State(data.summaryState)!r}")
+            data = await state_cache.wait_for(
+                lambda sample: sample.summaryState != desired_state
+            )
+            state = salobj.State(data.summaryState)
+            self.log.warning(f"{component} not in {desired_state!r}: {state!r}")
+            raise RuntimeError(
+                f"{component} state is {state!r}, expected {desired_state!r}"
+            )
+
         state_topic = getattr(self.rem, component).evt_summaryState
         state_topic.flush()
         data = await state_topic.aget()
@@ -576,8 +1037,14 @@ class RemoteGroup:
             Last component heartbeat.
         """
         try:
-            heartbeat = await getattr(self.rem, component).evt_heartbeat.aget(
-                timeout=self.fast_timeout
+            heartbeat = (
+                await self.get_topic_cache(component, "evt_heartbeat").aget(
+                    timeout=self.fast_timeout
+                )
+                if self.uses_topic_cache(component, "evt_heartbeat")
+                else await getattr(self.rem, component).evt_heartbeat.aget(
+                    timeout=self.fast_timeout
+                )
             )
         except asyncio.TimeoutError:
             raise asyncio.TimeoutError(
@@ -586,26 +1053,40 @@ class RemoteGroup:
         else:
             return heartbeat
 
-    async def next_heartbeat(self, component: str) -> salobj.type_hints.BaseMsgType:
+    async def next_heartbeat(
+        self, component: str, timeout: typing.Optional[float] = None
+    ) -> salobj.type_hints.BaseMsgType:
         """Get next heartbeat for component.
 
         Parameters
         ----------
         component : `str`
             Name of the component.
+        timeout : `float`, optional
+            How long to wait for the heartbeat (sec). If `None` (default) use
+            `fast_timeout`.
 
         Returns
         -------
         heartbeat
             Last component heartbeat.
         """
+        if timeout is None:
+            timeout = self.fast_timeout
+
         try:
-            heartbeat = await getattr(self.rem, component).evt_heartbeat.next(
-                flush=True, timeout=self.fast_timeout
+            heartbeat = (
+                await self.get_topic_cache(component, "evt_heartbeat").next(
+                    timeout=timeout
+                )
+                if self.uses_topic_cache(component, "evt_heartbeat")
+                else await getattr(self.rem, component).evt_heartbeat.next(
+                    flush=True, timeout=timeout
+                )
             )
         except asyncio.TimeoutError:
             raise asyncio.TimeoutError(
-                "No new heartbeat from {component} in the last {self.fast_timeout} seconds."
+                f"No new heartbeat from {component} in the last {timeout} seconds."
             )
         else:
             return heartbeat
@@ -633,16 +1114,280 @@ class RemoteGroup:
 
         """
 
+        if (
+            self.liveliness_monitor is not None
+            and component in self.liveliness_monitor.components
+        ):
+            await self.liveliness_monitor.wait_silent(component)
+            raise RuntimeError(
+                f"No heartbeat from {component} received in "
+                f"{self.liveliness_monitor.timeout}s."
+            )
+
+        heartbeat_cache = (
+            self.get_topic_cache(component, "evt_heartbeat")
+            if self.uses_topic_cache(component, "evt_heartbeat")
+            else None
+        )
+
         while True:
             try:
-                await getattr(self.rem, component).evt_heartbeat.next(
-                    flush=True, timeout=self.fast_timeout
-                )
+                if heartbeat_cache is not None:
+                    await heartbeat_cache.next(timeout=self.fast_timeout)
+                else:
+                    await getattr(self.rem, component).evt_heartbeat.next(
+                        flush=True, timeout=self.fast_timeout
+                    )
             except asyncio.TimeoutError:
                 raise RuntimeError(
                     f"No heartbeat from {component} received in {self.fast_timeout}s."
                 )
 
+    def start_liveliness_monitor(
+        self,
+        components: typing.Optional[typing.List[str]] = None,
+        timeout: typing.Optional[float] = None,
+    ) -> LivelinessMonitor:
+        """Start monitoring the heartbeats of the components with a single
+        watchdog task.
+
+        Once started, `liveliness` returns an instantaneous snapshot,
+        `assert_liveliness` only waits for components without a recent
+        heartbeat and `check_comp_heartbeat` waits on the monitor instead of
+        polling the heartbeat topic. The heartbeat topics of the monitored
+        components are read through the shared topic cache.
+
+        Parameters
+        ----------
+        components : `list` of `str`, optional
+            Components to monitor, as they appear in `components_attr`. If
+            `None` (default) monitor all components for which check is
+            enabled.
+        timeout : `float`, optional
+            Time without heartbeats after which a component is considered
+            silent (sec). If `None` (default) use `fast_timeout`.
+
+        Returns
+        -------
+        liveliness_monitor : `LivelinessMonitor`
+            The group liveliness monitor. Use its ``subscribe`` method to be
+            notified when a component goes silent.
+        """
+        if self.liveliness_monitor is None:
+            self.liveliness_monitor = LivelinessMonitor(
+                timeout=self.fast_timeout if timeout is None else timeout,
+                clock=self.clock,
+                log=self.log,
+            )
+
+        work_components = (
+            self.components_to_check()
+            if components is None
+            else self.get_work_components(components)
+        )
+
+        for component in work_components:
+            self.liveliness_monitor.add_component(
+                component, self.get_topic_cache(component, "evt_heartbeat")
+            )
+
+        self.liveliness_monitor.start()
+
+        return self.liveliness_monitor
+
+    async def stop_liveliness_monitor(self) -> None:
+        """Stop the liveliness monitor, if running."""
+        if self.liveliness_monitor is not None:
+            await self.liveliness_monitor.stop()
+            self.liveliness_monitor = None
+
+    def liveliness(self) -> typing.Dict[str, bool]:
+        """Get a snapshot of the liveliness of the monitored components.
+
+        Returns
+        -------
+        liveliness : `dict` [`str`, `bool`]
+            Dictionary with component name and `True` if it sent a heartbeat
+            recently.
+
+        Raises
+        ------
+        RuntimeError
+            If the liveliness monitor is not running.
+        """
+        if self.liveliness_monitor is None:
+            raise RuntimeError(
+                "Liveliness monitor not running. Call start_liveliness_monitor first."
+            )
+        return self.liveliness_monitor.liveliness()
+
+    def add_remote_hook(self, hook: RemoteHook) -> None:
+        """Register a hook that observes or intercepts the use of the group
+        remotes.
+
+        Hooks see the topic accesses made through `rem` without replacing
+        the remotes, so they can be added and removed in any order. This is
+        how `Tracer`, `LatencyModel`, `UsageProfiler` and `TrafficRecorder`
+        follow the group.
+
+        Parameters
+        ----------
+        hook : `RemoteHook`
+            Hook to register.
+        """
+        self.rem.add_hook(hook)
+
+    def remove_remote_hook(self, hook: RemoteHook) -> None:
+        """Unregister a hook added with `add_remote_hook`.
+
+        Parameters
+        ----------
+        hook : `RemoteHook`
+            Hook to unregister.
+        """
+        self.rem.remove_hook(hook)
+
+    def start_tracing(self, maxlen: int = 10000) -> Tracer:
+        """Start recording spans for the commands and waits issued by the
+        group.
+
+        Parameters
+        ----------
+        maxlen : `int`, optional
+            Maximum number of spans to keep in the tracer ring buffer.
+
+        Returns
+        -------
+        tracer : `Tracer`
+            The tracer. If tracing was already started, the running tracer is
+            returned.
+        """
+        if self.tracer is None:
+            self.tracer = Tracer(group=self, maxlen=maxlen)
+            self.tracer.start()
+        return self.tracer
+
+    def stop_tracing(self) -> typing.Optional[Tracer]:
+        """Stop tracing.
+
+        Returns
+        -------
+        tracer : `Tracer` or `None`
+            The tracer that was running, with the recorded spans, or `None`
+            if tracing was not started.
+        """
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.stop()
+            self.tracer = None
+        return tracer
+
+    def start_latency_model(
+        self, path: typing.Optional[str] = None, **kwargs: typing.Any
+    ) -> LatencyModel:
+        """Start recording command latencies and learning timeouts.
+
+        Parameters
+        ----------
+        path : `str`, optional
+            File to read the latencies from, if it exists, and to write them
+            to when the model is stopped or the group closed.
+        **kwargs
+            Additional arguments for `LatencyModel`, e.g. ``percentile``,
+            ``safety_factor`` or ``apply_timeouts``.
+
+        Returns
+        -------
+        latency_model : `LatencyModel`
+            The latency model. If it was already started, the running model
+            is returned.
+        """
+        if self.latency_model is None:
+            self.latency_model = LatencyModel(group=self, **kwargs)
+            if path is not None and os.path.exists(path):
+                self.latency_model.read(path)
+            self._latency_model_path = path
+            self.latency_model.start()
+        return self.latency_model
+
+    def stop_latency_model(self) -> typing.Optional[LatencyModel]:
+        """Stop recording command latencies, writing them to the file given
+        to `start_latency_model`, if any.
+
+        Returns
+        -------
+        latency_model : `LatencyModel` or `None`
+            The latency model that was running, or `None` if it was not
+            started.
+        """
+        latency_model = self.latency_model
+        if latency_model is not None:
+            latency_model.stop()
+            if self._latency_model_path is not None:
+                latency_model.write(self._latency_model_path)
+            self.latency_model = None
+            self._latency_model_path = None
+        return latency_model
+
+    def get_timeout(
+        self, component: str, command: str, default: typing.Optional[float]
+    ) -> typing.Optional[float]:
+        """Get the timeout for a component command.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in `components_attr`.
+        command : `str`
+            Name of the command, e.g. "cmd_start".
+        default : `float` or `None`
+            Timeout given by the caller (sec). It is extended to the learned
+            timeout if the latency model is running and has learned a longer
+            one.
+
+        Returns
+        -------
+        timeout : `float` or `None`
+            Timeout (sec).
+        """
+        if self.latency_model is None:
+            return default
+        return self.latency_model.get_timeout(component, command, default=default)
+
+    @contextlib.asynccontextmanager
+    async def trace_span(
+        self, name: str, component: typing.Optional[str] = None
+    ) -> typing.AsyncIterator[None]:
+        """Record a span for the enclosed block, if tracing is enabled.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the operation.
+        component : `str`, optional
+            Name of the component the operation acts on.
+        """
+        if self.tracer is None:
+            yield
+        else:
+            async with self.tracer.span(name, component=component):
+                yield
+
+    async def settle(
+        self, settle_time: float, component: typing.Optional[str] = None
+    ) -> None:
+        """Wait for a settle time, recording it as a span when tracing.
+
+        Parameters
+        ----------
+        settle_time : `float`
+            Time to wait (sec).
+        component : `str`, optional
+            Name of the component that is settling.
+        """
+        async with self.trace_span("settle", component=component):
+            await self.clock.sleep(settle_time)
+
     async def assert_liveliness(self) -> None:
         """Assert liveliness of components belonging to the group.
 
@@ -650,6 +1395,9 @@ class RemoteGroup:
         component. The `check` feature will apply to the assertion so
         components marked with `check=False` will be skipped.
 
+        If the liveliness monitor is running, components that sent a recent
+        heartbeat are considered alive without waiting.
+
         Raises
         ------
         AssertionError
@@ -658,6 +1406,14 @@ class RemoteGroup:
 
         components_to_check = self.components_to_check()
 
+        if self.liveliness_monitor is not None:
+            liveliness = self.liveliness_monitor.liveliness()
+            components_to_check = [
+                component
+                for component in components_to_check
+                if not liveliness.get(component, False)
+            ]
+
         components_heartbeat = await asyncio.gather(
             *[self.next_heartbeat(component) for component in components_to_check],
             return_exceptions=True,
@@ -726,6 +1482,10 @@ class RemoteGroup:
     ) -> None:
         """Set summary state for all components.
 
+        The transition plan (see `plan_state_transition`) is computed and
+        logged first, and only the components that are not in the desired
+        state are commanded.
+
         Parameters
         ----------
         state : `salobj.State`
@@ -752,30 +1512,75 @@ class RemoteGroup:
         if overrides is None:
             overrides = dict()
 
-        set_ss_tasks = []
+        dependencies = self.get_state_transition_dependencies(state, work_components)
+
+        checked_components = [
+            comp for comp in work_components if getattr(self.check, comp)
+        ]
+
+        await self.start_remotes(checked_components)
+
+        plan = await self.plan_state_transition(state, checked_components)
+
+        self.log.info(
+            f"Plan to transition to {salobj.State(state)!r}: "
+            + ", ".join(
+                [
+                    f"{comp}: {'unknown state' if commands is None else commands}"
+                    for comp, commands in plan.items()
+                ]
+            )
+        )
+
+        set_ss_tasks: typing.List[
+            typing.Coroutine[typing.Any, typing.Any, typing.Any]
+        ] = []
 
         for comp in work_components:
-            if getattr(self.check, comp):
+            if getattr(self.check, comp) and plan[comp] == []:
+                set_ss_tasks.append(_in_state(salobj.State(state)))
+            elif getattr(self.check, comp) and self.uses_topic_cache(
+                comp, "evt_summaryState"
+            ):
+                set_ss_tasks.append(
+                    self._set_summary_state_with_cache(
+                        component=comp,
+                        state=salobj.State(state),
+                        override=overrides.get(comp, ""),
+                        timeout=self.long_long_timeout,
+                    )
+                )
+            elif getattr(self.check, comp):
                 set_ss_tasks.append(
                     salobj.set_summary_state(
-                        remote=getattr(self.rem, comp),
+                        remote=self._get_remote(comp),
                         state=salobj.State(state),
                         override=overrides.get(comp, ""),
                         timeout=self.long_long_timeout,
                     )
                 )
-            else:
+            elif self.is_remote_created(comp):
                 set_ss_tasks.append(self.get_state(comp, ignore_timeout=True))
+            else:
+                # Do not create remotes in lazy mode only to report their
+                # state.
+                set_ss_tasks.append(_noop())
+
+        max_concurrency = (
+            self.max_concurrent_state_transitions
+            if self.max_concurrent_state_transitions is not None
+            or self._concurrent_operation
+            else 1
+        )
 
-        ret_val = (
-            await asyncio.gather(*set_ss_tasks, return_exceptions=True)
-            if self._concurrent_operation
-            else [
-                (await asyncio.gather(task, return_exceptions=True))[0]
-                for task in set_ss_tasks
-            ]
+        results = await self._run_with_dependencies(
+            coroutines=dict(zip(work_components, set_ss_tasks)),
+            dependencies=dependencies,
+            max_concurrency=max_concurrency,
         )
 
+        ret_val = [results[comp] for comp in work_components]
+
         error_flag = False
         failed_components = []
 
@@ -809,6 +1614,272 @@ class RemoteGroup:
         else:
             self.log.info(f"All components in {salobj.State(state)!r}.")
 
+    async def plan_state_transition(
+        self,
+        state: salobj.State,
+        components: typing.Optional[typing.List[str]] = None,
+    ) -> typing.Dict[str, typing.Optional[typing.List[str]]]:
+        """Compute the commands needed to bring components to a summary
+        state.
+
+        The current state of the components is obtained with `get_state`,
+        which reads the shared topic cache when it is in use.
+
+        Parameters
+        ----------
+        state : `salobj.State`
+            Desired state.
+        components : `list` of `str`, optional
+            Components to plan for, as they appear in `components_attr`. If
+            `None` (default) use all components for which check is enabled.
+
+        Returns
+        -------
+        plan : `dict` [`str`, `list` [`str`] or `None`]
+            Dictionary with component name and the list of state transition
+            commands to send, in order. Components already in the desired
+            state have an empty list. Components for which the current state
+            could not be determined have `None`.
+        """
+        work_components = (
+            self.components_to_check()
+            if components is None
+            else self.get_work_components(components)
+        )
+
+        current_states = await asyncio.gather(
+            *[
+                self.get_state(component, ignore_timeout=True)
+                for component in work_components
+            ],
+            return_exceptions=True,
+        )
+
+        plan: typing.Dict[str, typing.Optional[typing.List[str]]] = dict()
+
+        for component, current_state in zip(work_components, current_states):
+            try:
+                plan[component] = (
+                    [
+                        command
+                        for command, _ in _get_state_transition_commands(
+                            current_state, salobj.State(state)
+                        )
+                    ]
+                    if isinstance(current_state, salobj.State)
+                    else None
+                )
+            except ValueError:
+                # Not a valid desired state; let the transition itself fail.
+                plan[component] = None
+
+        return plan
+
+    def get_state_transition_dependencies(
+        self, state: salobj.State, components: typing.List[str]
+    ) -> typing.Dict[str, typing.List[str]]:
+        """Get the order dependencies for a state transition.
+
+        Parameters
+        ----------
+        state : `salobj.State`
+            Desired state.
+        components : `list` of `str`
+            Components that will transition.
+
+        Returns
+        -------
+        dependencies : `dict` [`str`, `list` [`str`]]
+            Dictionary with component name and list of components that must
+            finish the transition before it starts. Only components in the
+            `components` list are included.
+
+        Raises
+        ------
+        RuntimeError
+            If the dependencies have a cycle.
+        """
+        work_components = set(components)
+
+        dependencies: typing.Dict[str, typing.List[str]] = dict(
+            [(component, []) for component in components]
+        )
+
+        reverse = salobj.State(state) in {salobj.State.STANDBY, salobj.State.OFFLINE}
+
+        for component, requires in self.state_transition_dependencies.items():
+            for required in requires:
+                if component not in work_components or required not in work_components:
+                    continue
+                if reverse:
+                    dependencies[required].append(component)
+                else:
+                    dependencies[component].append(required)
+
+        # Check for cycles with a depth first search.
+        visiting: typing.Set[str] = set()
+        visited: typing.Set[str] = set()
+
+        def visit(component: str) -> None:
+            if component in visited:
+                return
+            if component in visiting:
+                raise RuntimeError(
+                    f"State transition dependencies have a cycle including {component}: "
+                    f"{self.state_transition_dependencies}."
+                )
+            visiting.add(component)
+            for required in dependencies[component]:
+                visit(required)
+            visiting.remove(component)
+            visited.add(component)
+
+        for component in components:
+            visit(component)
+
+        return dependencies
+
+    @staticmethod
+    async def _run_with_dependencies(
+        coroutines: typing.Dict[str, typing.Coroutine],
+        dependencies: typing.Dict[str, typing.List[str]],
+        max_concurrency: typing.Optional[int],
+    ) -> typing.Dict[str, typing.Any]:
+        """Run a set of coroutines respecting order dependencies and a
+        concurrency limit.
+
+        Coroutines that have no pending dependencies run concurrently, up to
+        `max_concurrency` at a time, in the order they appear in
+        `coroutines`. If a coroutine fails, those that depend on it are not
+        executed.
+
+        Parameters
+        ----------
+        coroutines : `dict` [`str`, `coroutine`]
+            Dictionary with name and coroutine to run.
+        dependencies : `dict` [`str`, `list` [`str`]]
+            Dictionary with name and list of names that must finish before it
+            starts. Must not have cycles.
+        max_concurrency : `int` or `None`
+            Maximum number of coroutines running at the same time. If `None`,
+            no limit.
+
+        Returns
+        -------
+        results : `dict` [`str`, ``object``]
+            Dictionary with name and return value of the coroutine or the
+            exception it raised.
+        """
+        semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        )
+        done = dict([(name, asyncio.Event()) for name in coroutines])
+        results: typing.Dict[str, typing.Any] = dict()
+
+        async def run(name: str, coro: typing.Coroutine) -> None:
+            try:
+                requires = [
+                    required
+                    for required in dependencies.get(name, [])
+                    if required in done
+                ]
+                for required in requires:
+                    await done[required].wait()
+
+                failed = [
+                    required
+                    for required in requires
+                    if isinstance(results[required], BaseException)
+                ]
+
+                if failed:
+                    coro.close()
+                    results[name] = RuntimeError(
+                        f"Not executed because {failed} failed."
+                    )
+                elif semaphore is None:
+                    results[name] = await coro
+                else:
+                    async with semaphore:
+                        results[name] = await coro
+            except Exception as e:
+                results[name] = e
+            finally:
+                done[name].set()
+
+        await asyncio.gather(*[run(name, coro) for name, coro in coroutines.items()])
+
+        return results
+
+    def _get_remote(self, component: str) -> typing.Any:
+        """Get the remote for a component.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in `components_attr`.
+
+        Returns
+        -------
+        remote : `salobj.Remote`
+            Remote for the component. In lazy mode this creates the remote if
+            needed and returns the underlying `salobj.Remote`. If there are
+            remote hooks, the remote is wrapped so they see its use.
+        """
+        remote = self.rem.get_remote(component)
+
+        return self.rem.hook_remote(
+            component, remote.remote if isinstance(remote, LazyRemote) else remote
+        )
+
+    async def _set_summary_state_with_cache(
+        self, component: str, state: salobj.State, override: str, timeout: float
+    ) -> typing.List[salobj.State]:
+        """Set the summary state of a component, following the state
+        transitions with the shared topic cache.
+
+        This is the equivalent of `salobj.set_summary_state` for when the
+        summary state topic has a callback (and cannot be read with
+        ``next``).
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        state : `salobj.State`
+            Desired state.
+        override : `str`
+            Configuration override for the ``start`` command.
+        timeout : `float`
+            Timeout for each command and state transition (sec).
+
+        Returns
+        -------
+        states : `list` [`salobj.State`]
+            List of states, starting with the initial state.
+        """
+        remote = getattr(self.rem, component)
+        state_cache = self.get_topic_cache(component, "evt_summaryState")
+
+        data = await state_cache.aget(timeout=timeout)
+        states = [salobj.State(data.summaryState)]
+
+        for command, expected_state in _get_state_transition_commands(states[0], state):
+            if command == "start":
+                await remote.cmd_start.set_start(
+                    configurationOverride=override, timeout=timeout
+                )
+            else:
+                await getattr(remote, f"cmd_{command}").start(timeout=timeout)
+
+            data = await state_cache.wait_for(
+                lambda sample: sample.summaryState == expected_state,
+                timeout=timeout,
+            )
+            states.append(salobj.State(data.summaryState))
+
+        return states
+
     async def assert_all_enabled(self, message: str = "") -> None:
         """Check if all components are in the enabled state.
 
@@ -1017,19 +2088,142 @@ class RemoteGroup:
         """
         work_components = self.get_work_components(components=components)
 
-        topic_data = await asyncio.gather(
+        snapshot = await self.snapshot(
+            dict((component, [topic_name]) for component in work_components)
+        )
+
+        topic_samples_for_components = snapshot.for_topic(topic_name)
+
+        return dict(
+            (component, topic_samples_for_components[component])
+            for component in work_components
+        )
+
+    async def snapshot(
+        self,
+        topics_by_component: typing.Dict[str, typing.Iterable[str]],
+        max_age: typing.Optional[float] = None,
+        timeout: typing.Optional[float] = None,
+    ) -> TopicSnapshot:
+        """Get samples of several topics from several components in a single
+        concurrent batch.
+
+        Parameters
+        ----------
+        topics_by_component : `dict` [`str`, `list` [`str`]]
+            Dictionary with the name of the components (as they appear in
+            `components_attr`) and the list of topics to get from each of
+            them, e.g. ``dict(mtmount=["evt_summaryState", "tel_azimuth"])``.
+        max_age : `float`, optional
+            Maximum age of the samples (sec). Samples already received that
+            are younger than this are used as they are, older samples are
+            replaced by the next sample published. If `None` (default) the
+            latest sample received is used regardless of its age, and the
+            method only waits for topics that have no data yet.
+        timeout : `float`, optional
+            How long to wait for each topic (sec). If `None` (default) use
+            `fast_timeout`. Since all topics are retrieved concurrently this
+            bounds the duration of the call.
+
+        Returns
+        -------
+        snapshot : `TopicSnapshot`
+            Immutable snapshot with the samples and the errors that occurred
+            while retrieving them. Errors are not raised.
+
+        Raises
+        ------
+        RuntimeError
+            If a component is not part of the group.
+        """
+        work_components = self.get_work_components(components=list(topics_by_component))
+
+        _timeout = self.fast_timeout if timeout is None else timeout
+
+        keys = [
+            (component, topic_name)
+            for component in work_components
+            for topic_name in topics_by_component[component]
+        ]
+
+        results = await asyncio.gather(
             *[
-                getattr(getattr(self.rem, component), topic_name).aget(
-                    timeout=self.fast_timeout
+                self._get_snapshot_sample(
+                    component=component,
+                    topic_name=topic_name,
+                    max_age=max_age,
+                    timeout=_timeout,
                 )
-                for component in work_components
+                for component, topic_name in keys
             ],
             return_exceptions=True,
         )
 
-        topic_samples_for_components = dict(zip(work_components, topic_data))
+        samples: typing.Dict[str, typing.Dict[str, typing.Any]] = dict()
+        sample_timestamps: typing.Dict[str, typing.Dict[str, float]] = dict()
+        errors: typing.Dict[str, typing.Dict[str, BaseException]] = dict()
+
+        for (component, topic_name), result in zip(keys, results):
+            if isinstance(result, BaseException):
+                errors.setdefault(component, dict())[topic_name] = result
+            else:
+                sample, timestamp = result
+                samples.setdefault(component, dict())[topic_name] = sample
+                sample_timestamps.setdefault(component, dict())[topic_name] = timestamp
+
+        return TopicSnapshot(
+            timestamp=current_tai(),
+            samples=samples,
+            sample_timestamps=sample_timestamps,
+            errors=errors,
+        )
 
-        return topic_samples_for_components
+    async def _get_snapshot_sample(
+        self,
+        component: str,
+        topic_name: str,
+        max_age: typing.Optional[float],
+        timeout: float,
+    ) -> typing.Tuple[typing.Any, float]:
+        """Get a sample for `snapshot`.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        topic_name : `str`
+            Name of the topic.
+        max_age : `float` or `None`
+            Maximum age of the sample (sec).
+        timeout : `float`
+            How long to wait for a sample (sec).
+
+        Returns
+        -------
+        sample : ``object``
+            Topic sample.
+        timestamp : `float`
+            TAI unix time of the sample (sec).
+        """
+        if self.uses_topic_cache(component, topic_name):
+            topic_cache = self.get_topic_cache(component, topic_name)
+            if topic_cache.sample is None:
+                await topic_cache.aget(timeout=timeout)
+            elif (
+                max_age is not None
+                and current_tai() - typing.cast(float, topic_cache.timestamp) > max_age
+            ):
+                await topic_cache.next(timeout=timeout)
+            return topic_cache.sample, typing.cast(float, topic_cache.timestamp)
+
+        topic = getattr(getattr(self.rem, component), topic_name)
+
+        sample = await topic.aget(timeout=timeout)
+
+        if max_age is not None and current_tai() - sample.private_sndStamp > max_age:
+            sample = await topic.next(flush=True, timeout=timeout)
+
+        return sample, sample.private_sndStamp
 
     @property
     def components(self) -> typing.List[str]:
@@ -1191,28 +2385,46 @@ class RemoteGroup:
     async def cancel_not_done(tasks: typing.List[asyncio.Task]) -> None:
         """Cancel all coroutines in `coro_list`.
 
-        Remove futures from input tasks list and cancel them.
+        Remove futures from input tasks list, cancel them and wait for them
+        to finish.
 
         Parameters
         ----------
         tasks : `list` [`futures`]
             A list of coroutines to cancel.
         """
+        cancelled_tasks = []
         while len(tasks) > 0:
             task = tasks.pop()
             task.cancel()
+            cancelled_tasks.append(task)
+
+        await asyncio.gather(*cancelled_tasks, return_exceptions=True)
 
     async def close(self) -> None:
         await self.cancel_not_done(self.scheduled_coro)
+        self.stop_tracing()
+        self.stop_latency_model()
+        await self.stop_liveliness_monitor()
+        for topic_cache in self._topic_caches.values():
+            topic_cache.unregister()
+        self._topic_caches = dict()
         await asyncio.gather(
             *[
-                getattr(self.rem, c).close()
+                (
+                    self._remote_pool.release(self.rem.get_remote(c))
+                    if self._remote_pool is not None
+                    else self.rem.get_remote(c).close()
+                )
                 for c in self.components_attr
-                if getattr(self.rem, c) is not None
+                if self.rem.get_remote(c) is not None
             ]
         )
         if self._close_domain:
             await self.domain.close()
+        elif self._release_domain:
+            await typing.cast(RemotePool, self._remote_pool).release_domain()
+            self._release_domain = False
 
     async def __aenter__(self: TRemoteGroup) -> TRemoteGroup:
         if self.start_task is not None:
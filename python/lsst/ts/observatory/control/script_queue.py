@@ -49,6 +49,12 @@ class ScriptQueue(RemoteGroup):
         used to limit the resources allocated by the class by gathering some
         knowledge about the usage intention. By default allocates all
         resources.
+    lazy : `bool`, optional
+        If `True`, create the remotes only when they are first used. See
+        `RemoteGroup`. Default=False.
+    shared : `bool`, optional
+        If `True`, share remotes and domain with other groups through the
+        process-wide `RemotePool`. Default=False.
     """
 
     script_separator = ":"
@@ -59,6 +65,8 @@ class ScriptQueue(RemoteGroup):
         domain: typing.Union[salobj.Domain, str] | None = None,
         log: logging.Logger | None = None,
         intended_usage: int | None = None,
+        lazy: bool = False,
+        shared: bool = False,
     ) -> None:
         self.queue_index = queue_index
 
@@ -67,6 +75,8 @@ class ScriptQueue(RemoteGroup):
             domain=domain,
             log=log,
             intended_usage=intended_usage,
+            lazy=lazy,
+            shared=shared,
         )
 
     @property
@@ -233,7 +243,7 @@ class ScriptQueue(RemoteGroup):
             If queue does not report as paused.
         """
         try:
-            await asyncio.wait_for(
+            await self.clock.wait_for(
                 self._handle_wait_queue_state(running=False),
                 timeout=self.long_timeout,
             )
@@ -251,7 +261,7 @@ class ScriptQueue(RemoteGroup):
             If queue does not report as running.
         """
         try:
-            await asyncio.wait_for(
+            await self.clock.wait_for(
                 self._handle_wait_queue_state(running=True),
                 timeout=self.long_timeout,
             )
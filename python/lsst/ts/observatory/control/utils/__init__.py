@@ -20,8 +20,27 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from .camera_exposure import *
+from .catalog_index import *
+from .catalog_io import *
+from .clock import *
+from .coordinate_engine import *
 from .enums import *
+from .latency_model import *
+from .lazy_remote import *
+from .liveliness_monitor import *
+from .name_resolver_cache import *
 from .remote_group_test_case import *
+from .remote_hooks import *
+from .remote_pool import *
 from .roi_spec import *
+from .slew_plan import *
+from .slew_time_model import *
+from .task_supervisor import *
+from .time_service import *
+from .topic_cache import *
+from .topic_snapshot import *
+from .tracer import *
+from .traffic_recorder import *
 from .type_hints import *
+from .usage_profiler import *
 from .utils import *
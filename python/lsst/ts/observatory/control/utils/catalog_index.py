@@ -0,0 +1,210 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["CatalogIndex"]
+
+import typing
+
+import numpy as np
+import numpy.typing as npt
+from scipy.spatial import cKDTree
+
+
+class CatalogIndex:
+    """Spatial and magnitude index of a star catalog.
+
+    The positions are stored as unit vectors in a KD-tree, built once, and
+    the magnitudes in a sorted array, so cone searches with a magnitude
+    range do not need to scan or mask the full catalog.
+
+    Parameters
+    ----------
+    ra : array-like
+        RA of the stars (deg).
+    dec : array-like
+        Dec of the stars (deg).
+    mag : array-like
+        Magnitude of the stars.
+    """
+
+    def __init__(
+        self, ra: npt.ArrayLike, dec: npt.ArrayLike, mag: npt.ArrayLike
+    ) -> None:
+        self.vectors = _unit_vectors(
+            np.asarray(ra, dtype=float), np.asarray(dec, dtype=float)
+        )
+        self.mag = np.asarray(mag, dtype=float)
+
+        self._tree = cKDTree(self.vectors)
+
+        self._mag_order = np.argsort(self.mag, kind="stable")
+        self._sorted_mag = self.mag[self._mag_order]
+
+    def __len__(self) -> int:
+        return len(self.mag)
+
+    def count_in_mag_range(self, mag_min: float, mag_max: float) -> int:
+        """Count the stars in a magnitude range.
+
+        Parameters
+        ----------
+        mag_min : `float`
+            Minimum (brightest) magnitude.
+        mag_max : `float`
+            Maximum (faintest) magnitude.
+
+        Returns
+        -------
+        count : `int`
+            Number of stars with mag_min <= mag <= mag_max.
+        """
+        start, stop = self._mag_slice(mag_min, mag_max)
+        return stop - start
+
+    def cone_search(
+        self,
+        ra: float,
+        dec: float,
+        radius: float,
+        mag_min: float = -np.inf,
+        mag_max: float = np.inf,
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Find the stars in a cone and a magnitude range.
+
+        Parameters
+        ----------
+        ra : `float`
+            RA of the center of the cone (deg).
+        dec : `float`
+            Dec of the center of the cone (deg).
+        radius : `float`
+            Radius of the cone (deg).
+        mag_min : `float`, optional
+            Minimum (brightest) magnitude.
+        mag_max : `float`, optional
+            Maximum (faintest) magnitude.
+
+        Returns
+        -------
+        indices : `numpy.ndarray`
+            Indices of the stars, sorted by separation.
+        separations : `numpy.ndarray`
+            Separation from the center of the cone (deg).
+        """
+        center = _unit_vectors(np.array([ra]), np.array([dec]))[0]
+
+        indices = np.asarray(
+            self._tree.query_ball_point(center, r=_chord(radius)), dtype=np.int64
+        )
+        indices = indices[
+            (self.mag[indices] >= mag_min) & (self.mag[indices] <= mag_max)
+        ]
+
+        separations = _separation(self.vectors[indices], center)
+        order = np.argsort(separations)
+
+        return indices[order], separations[order]
+
+    def nearest(
+        self,
+        ra: float,
+        dec: float,
+        mag_min: float = -np.inf,
+        mag_max: float = np.inf,
+        radius: float = 1.0,
+    ) -> typing.Optional[typing.Tuple[int, float]]:
+        """Find the star nearest to a position, in a magnitude range.
+
+        Stars within ``radius`` are looked up in the KD-tree. Only if there
+        are none, the stars in the magnitude range are scanned, so the
+        nearest star is always returned.
+
+        Parameters
+        ----------
+        ra : `float`
+            RA of the position (deg).
+        dec : `float`
+            Dec of the position (deg).
+        mag_min : `float`, optional
+            Minimum (brightest) magnitude.
+        mag_max : `float`, optional
+            Maximum (faintest) magnitude.
+        radius : `float`, optional
+            Radius where the star is expected to be (deg).
+
+        Returns
+        -------
+        index : `int`
+            Index of the star.
+        separation : `float`
+            Separation from the position (deg).
+
+        `None` is returned if there are no stars in the magnitude range.
+        """
+        indices, separations = self.cone_search(
+            ra=ra, dec=dec, radius=radius, mag_min=mag_min, mag_max=mag_max
+        )
+
+        if len(indices) > 0:
+            return int(indices[0]), float(separations[0])
+
+        start, stop = self._mag_slice(mag_min, mag_max)
+        if start == stop:
+            return None
+
+        center = _unit_vectors(np.array([ra]), np.array([dec]))[0]
+        candidates = self._mag_order[start:stop]
+        index = int(candidates[np.argmax(self.vectors[candidates] @ center)])
+        separation = _separation(self.vectors[index : index + 1], center)[0]
+
+        return index, float(separation)
+
+    def _mag_slice(self, mag_min: float, mag_max: float) -> typing.Tuple[int, int]:
+        """Get the slice of the magnitude-sorted arrays in a magnitude
+        range.
+        """
+        start = int(np.searchsorted(self._sorted_mag, mag_min, side="left"))
+        stop = int(np.searchsorted(self._sorted_mag, mag_max, side="right"))
+        return start, max(start, stop)
+
+
+def _unit_vectors(ra: np.ndarray, dec: np.ndarray) -> np.ndarray:
+    """Unit vectors from RA and Dec (deg)."""
+    ra_rad = np.radians(ra)
+    dec_rad = np.radians(dec)
+    return np.column_stack(
+        [
+            np.cos(dec_rad) * np.cos(ra_rad),
+            np.cos(dec_rad) * np.sin(ra_rad),
+            np.sin(dec_rad),
+        ]
+    )
+
+
+def _chord(radius: float) -> float:
+    """Chord length of an angular radius (deg) on the unit sphere."""
+    return 2.0 * np.sin(np.radians(min(radius, 180.0)) / 2.0)
+
+
+def _separation(vectors: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """Angular separation (deg) between unit vectors and a center."""
+    chord = np.linalg.norm(vectors - center, axis=1)
+    return np.degrees(2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0)))
@@ -0,0 +1,152 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "CATALOG_FORMATS",
+    "convert_catalog",
+    "read_catalog",
+    "run_convert_catalogs",
+]
+
+import argparse
+import pathlib
+import typing
+
+import astropy.units as u
+import numpy as np
+from astropy.coordinates import Angle
+from astropy.table import Table
+
+from .utils import get_catalogs_path
+
+# Catalog file extensions, in order of preference when a catalog is
+# available in more than one format.
+CATALOG_FORMATS = (".npy", ".pd")
+
+
+def read_catalog(path: typing.Union[str, pathlib.Path], mmap: bool = True) -> Table:
+    """Read a catalog file.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`
+        Catalog file, either a structured numpy array (".npy"), written by
+        `convert_catalog`, or a pandas json table (".pd").
+    mmap : `bool`, optional
+        Memory-map ".npy" catalogs instead of reading them? Memory-mapped
+        catalogs load almost instantly and processes that load the same file
+        share its pages.
+
+    Returns
+    -------
+    catalog : `astropy.table.Table`
+        The catalog. Memory-mapped catalogs are read-only.
+
+    Raises
+    ------
+    RuntimeError
+        If the file extension is not a known catalog format.
+    """
+    _path = pathlib.Path(path)
+
+    if _path.suffix == ".npy":
+        data = np.load(_path, mmap_mode="r" if mmap else None)
+        return Table(data, copy=False)
+    elif _path.suffix == ".pd":
+        return Table.read(_path, format="pandas.json")
+
+    raise RuntimeError(
+        f"Unknown catalog format {_path.suffix!r}. Must be one of {CATALOG_FORMATS}."
+    )
+
+
+def convert_catalog(
+    path: typing.Union[str, pathlib.Path],
+    output_path: typing.Union[str, pathlib.Path, None] = None,
+) -> pathlib.Path:
+    """Convert a catalog to the binary (".npy") format.
+
+    The catalog is written as a structured numpy array with one field per
+    column. "RA" is stored in hours and "DEC" in degrees, as floats, and
+    string columns as fixed-width unicode.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`
+        Catalog file to convert, in any format supported by `read_catalog`.
+    output_path : `str` or `pathlib.Path`, optional
+        Output file. By default, same as ``path`` with the ".npy" extension.
+
+    Returns
+    -------
+    output_path : `pathlib.Path`
+        The file written.
+    """
+    _path = pathlib.Path(path)
+    _output_path = (
+        _path.with_suffix(".npy") if output_path is None else pathlib.Path(output_path)
+    )
+
+    catalog = read_catalog(_path, mmap=False)
+
+    columns: typing.Dict[str, np.ndarray] = dict()
+
+    for name in catalog.colnames:
+        if name == "RA":
+            columns[name] = Angle(catalog[name], unit=u.hourangle).hour
+        elif name == "DEC":
+            columns[name] = Angle(catalog[name], unit=u.deg).deg
+        else:
+            column = np.asarray(catalog[name])
+            columns[name] = column.astype(str) if column.dtype.kind == "O" else column
+
+    data = np.empty(
+        len(catalog),
+        dtype=[(name, column.dtype) for name, column in columns.items()],
+    )
+    for name, column in columns.items():
+        data[name] = column
+
+    np.save(_output_path, data, allow_pickle=False)
+
+    return _output_path
+
+
+def run_convert_catalogs() -> None:
+    """Run the catalog conversion command line tool."""
+    parser = argparse.ArgumentParser(
+        description="Convert catalogs to the binary (.npy) format used by "
+        "BaseTCS.load_catalog."
+    )
+    parser.add_argument(
+        "catalogs",
+        nargs="*",
+        type=pathlib.Path,
+        help="Catalog files to convert. By default, all the pandas json (.pd) "
+        "catalogs in the internal catalog directory.",
+    )
+    args = parser.parse_args()
+
+    paths = args.catalogs if args.catalogs else sorted(get_catalogs_path().glob("*.pd"))
+
+    for path in paths:
+        output_path = convert_catalog(path)
+        print(f"Converted {path} -> {output_path}.")
@@ -0,0 +1,325 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["Clock", "RealClock", "VirtualClock"]
+
+import abc
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+import typing
+
+from lsst.ts.utils import current_tai
+
+
+class Clock(abc.ABC):
+    """Source of time for the sleeps, timeouts and TAI reads of the control
+    classes.
+    """
+
+    @abc.abstractmethod
+    def time(self) -> float:
+        """Monotonic time (sec)."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def tai(self) -> float:
+        """Current TAI unix time (sec)."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def sleep(self, delay: float) -> None:
+        """Sleep for a given time.
+
+        Parameters
+        ----------
+        delay : `float`
+            Time to sleep (sec).
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def wait_for(
+        self, aw: typing.Awaitable, timeout: typing.Optional[float]
+    ) -> typing.Any:
+        """Wait for an awaitable to complete, with a timeout.
+
+        Parameters
+        ----------
+        aw : ``awaitable``
+            Awaitable to wait for.
+        timeout : `float` or `None`
+            Timeout (sec). If `None`, wait forever.
+
+        Returns
+        -------
+        result : ``object``
+            Result of the awaitable.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the awaitable does not complete in time.
+        """
+        raise NotImplementedError()
+
+
+class RealClock(Clock):
+    """Clock that follows the wall clock, using `asyncio` directly."""
+
+    def time(self) -> float:
+        return time.monotonic()
+
+    def tai(self) -> float:
+        return current_tai()
+
+    async def sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+    async def wait_for(
+        self, aw: typing.Awaitable, timeout: typing.Optional[float]
+    ) -> typing.Any:
+        return await asyncio.wait_for(aw, timeout=timeout)
+
+
+class VirtualClock(Clock):
+    """Clock whose time only advances when all tasks are waiting on it.
+
+    Sleeps and timeouts are kept in a heap. An advancer task lets the event
+    loop run until it is idle, with no callbacks ready to run after
+    ``idle_cycles`` iterations, then jumps the virtual time to the earliest
+    wake-up time and wakes up the corresponding sleepers. A sequence that
+    sleeps for hours therefore runs as fast as the processing between sleeps
+    allows.
+
+    The virtual time does not advance while the awaitable of a `wait_for`
+    is doing real work: waiting on a real timer (e.g. `asyncio.sleep` or a
+    salobj ``timeout``), on an executor, or ready to run. Real work wrapped
+    in `wait_for` therefore takes no virtual time and is not timed out by
+    it; it is only bounded by its own real timeouts.
+
+    Parameters
+    ----------
+    start_tai : `float`, optional
+        TAI unix time at virtual time 0 (sec). If `None` (default) use the
+        current TAI.
+    idle_cycles : `int`, optional
+        Number of event loop iterations without activity before the virtual
+        time is advanced.
+    poll_interval : `float`, optional
+        How often to check again, in real time, whether the awaitables of
+        `wait_for` are still doing real work (sec).
+
+    Notes
+    -----
+    Only the waits that go through the clock are virtual. Timeouts handled
+    by salobj (e.g. the ``timeout`` argument of ``cmd_*.start`` or
+    ``evt_*.next``) and the timing of real messages still follow the wall
+    clock, so a virtual clock is meant to be used with mocks or replays
+    that also use it. Only the awaitables of `wait_for` are checked for real
+    work; a plain `sleep` racing real work (e.g. with `asyncio.wait`) still
+    jumps ahead. A wait on a message without a timeout is not seen as real
+    work. The checks rely on the internals of the standard `asyncio` event
+    loop and tasks; with other implementations only ``idle_cycles`` is used.
+    """
+
+    def __init__(
+        self,
+        start_tai: typing.Optional[float] = None,
+        idle_cycles: int = 10,
+        poll_interval: float = 0.01,
+    ) -> None:
+        self.start_tai = current_tai() if start_tai is None else start_tai
+        self.idle_cycles = idle_cycles
+        self.poll_interval = poll_interval
+
+        self._now = 0.0
+        self._sleepers: typing.List[typing.Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._advancer: typing.Optional[asyncio.Task] = None
+        # Awaitables of the wait_for calls in progress.
+        self._waits: typing.Set[asyncio.Future] = set()
+
+    def time(self) -> float:
+        return self._now
+
+    def tai(self) -> float:
+        return self.start_tai + self._now
+
+    async def sleep(self, delay: float) -> None:
+        if delay <= 0.0:
+            await asyncio.sleep(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + delay, next(self._seq), future))
+
+        if self._advancer is None or self._advancer.done():
+            self._advancer = asyncio.create_task(self._advance())
+
+        await future
+
+    async def wait_for(
+        self, aw: typing.Awaitable, timeout: typing.Optional[float]
+    ) -> typing.Any:
+        if timeout is None:
+            return await aw
+
+        task = asyncio.ensure_future(aw)
+        timer = asyncio.ensure_future(self.sleep(timeout))
+
+        self._waits.add(task)
+        try:
+            await asyncio.wait({task, timer}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            timer.cancel()
+            self._waits.discard(task)
+
+        if task.done():
+            return task.result()
+
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        raise asyncio.TimeoutError()
+
+    async def advance(self, duration: float) -> None:
+        """Advance the virtual time, waking up the sleepers that are due.
+
+        Parameters
+        ----------
+        duration : `float`
+            Time to advance (sec).
+        """
+        self._now += duration
+        self._wake_up_due()
+        await asyncio.sleep(0)
+
+    async def _advance(self) -> None:
+        """Advance the virtual time while there are sleepers."""
+        loop = asyncio.get_running_loop()
+
+        while self._sleepers:
+            for _ in range(self.idle_cycles):
+                await asyncio.sleep(0)
+
+            while self._sleepers and self._sleepers[0][2].done():
+                heapq.heappop(self._sleepers)
+
+            if not self._sleepers:
+                break
+
+            # Callbacks scheduled during the idle cycles; not idle yet.
+            if getattr(loop, "_ready", None):
+                continue
+
+            busy = self._get_busy_waits(loop)
+            if busy:
+                await asyncio.wait(busy, timeout=self.poll_interval)
+                continue
+
+            self._now = max(self._now, self._sleepers[0][0])
+            self._wake_up_due()
+
+    def _get_busy_waits(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> typing.Set[asyncio.Future]:
+        """Get the awaitables of `wait_for` that are doing real work.
+
+        Parameters
+        ----------
+        loop : `asyncio.AbstractEventLoop`
+            Event loop.
+
+        Returns
+        -------
+        busy : `set` [`asyncio.Future`]
+            Awaitables waiting on a real timer or an executor, or ready to
+            run.
+        """
+        timer_waiters: typing.Set[typing.Any] = set()
+        for timer in getattr(loop, "_scheduled", []):
+            if timer.cancelled():
+                continue
+            # asyncio.sleep and asyncio.wait_for (<3.12) wake up a future;
+            # asyncio.timeout (>=3.12) cancels the task that entered it.
+            timer_waiters.update(getattr(timer, "_args", None) or ())
+            timeout = getattr(getattr(timer, "_callback", None), "__self__", None)
+            timer_waiters.add(getattr(timeout, "_task", None))
+
+        return {
+            task
+            for task in self._waits
+            if self._is_doing_real_work(task, timer_waiters)
+        }
+
+    def _is_doing_real_work(
+        self, future: asyncio.Future, timer_waiters: typing.Set[typing.Any]
+    ) -> bool:
+        """Is a future, or what it is waiting on, doing real work?
+
+        Parameters
+        ----------
+        future : `asyncio.Future`
+            Future or task.
+        timer_waiters : `set`
+            Futures and tasks woken up by the real timers of the loop.
+
+        Returns
+        -------
+        real_work : `bool`
+            `True` if ``future`` (following the tasks and futures it waits
+            on) waits on a real timer or an executor, or is ready to run.
+        """
+        if future.done():
+            return False
+
+        if future in timer_waiters:
+            return True
+
+        if isinstance(future, asyncio.Task):
+            waiter = getattr(future, "_fut_waiter", None)
+            return waiter is None or self._is_doing_real_work(waiter, timer_waiters)
+
+        # asyncio.gather
+        children = getattr(future, "_children", None)
+        if children:
+            return any(
+                self._is_doing_real_work(child, timer_waiters) for child in children
+            )
+
+        # Futures of run_in_executor are chained to a concurrent future.
+        return any(
+            getattr(callback, "__name__", "") == "_call_check_cancel"
+            for callback, _ in getattr(future, "_callbacks", None) or ()
+        )
+
+    def _wake_up_due(self) -> None:
+        """Wake up the sleepers whose wake-up time has passed."""
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
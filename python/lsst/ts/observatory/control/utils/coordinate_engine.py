@@ -0,0 +1,469 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["CoordinateEngine"]
+
+import collections
+import dataclasses
+import typing
+
+import astropy.units as u
+import numpy as np
+import numpy.typing as npt
+from astropy.coordinates import ICRS, AltAz, EarthLocation
+from lsst.ts.utils import astropy_time_from_tai_unix
+
+# Earth rotation rate with respect to the stars (rad/sec).
+EARTH_ROTATION_RATE = 7.2921150e-5
+
+# Number of points used to fit and to validate each anchor.
+NUM_FIT_POINTS = 64
+NUM_VALIDATION_POINTS = 32
+
+
+@dataclasses.dataclass
+class _Anchor:
+    """Linearized ICRS to Az/El transformation at a given time.
+
+    The transformation is ``u = normalize(matrix @ v + offset)``, where ``v``
+    is the ICRS unit vector, rotated around ``pole`` to account for the Earth
+    rotation since ``tai``, and ``u`` the Az/El unit vector. The offset
+    models the aberration.
+    """
+
+    tai: float
+    matrix: np.ndarray
+    offset: np.ndarray
+    inverse: np.ndarray
+    pole: np.ndarray
+    error: float = 0.0
+
+
+class CoordinateEngine:
+    """Fast approximate ICRS <-> Az/El transformations.
+
+    The full astropy transformation (precession, nutation, polar motion,
+    aberration) is computed once per time interval on a fixed set of points
+    and linearized into a matrix and an aberration offset, the anchor. The
+    anchor is then applied with plain numpy to any number of points, with
+    the Earth rotation since the anchor time applied as a rotation around
+    the celestial pole.
+
+    The error of each anchor is measured against astropy on a separate set
+    of points, at the anchor time and at the edge of the interval, and is
+    available with `get_error`. Callers should only use the engine when
+    `within_budget` returns `True`.
+
+    Parameters
+    ----------
+    location : `astropy.coordinates.EarthLocation`
+        Observatory location.
+    max_error : `float`, optional
+        Error budget (arcsec).
+    interval : `float`, optional
+        Time interval covered by each anchor (sec).
+    cache_size : `int`, optional
+        Number of anchors to keep.
+
+    Notes
+    -----
+    Like the `astropy.coordinates.AltAz` frames used in `BaseTCS`, the
+    transformation does not include atmospheric refraction.
+    """
+
+    def __init__(
+        self,
+        location: EarthLocation,
+        max_error: float = 1.0,
+        interval: float = 60.0,
+        cache_size: int = 1440,
+    ) -> None:
+        self.location = location
+        self.max_error = max_error
+        self.interval = interval
+        self.cache_size = cache_size
+
+        self._anchors: typing.OrderedDict[int, _Anchor] = collections.OrderedDict()
+
+        self._fit_vectors = _fibonacci_sphere(NUM_FIT_POINTS)
+        self._validation_vectors = _fibonacci_sphere(NUM_VALIDATION_POINTS, offset=0.5)
+
+        lat = self.location.lat.radian
+        self._pole_azel = np.array([np.cos(lat), 0.0, np.sin(lat)])
+
+    def azel_from_radec(
+        self, ra: npt.ArrayLike, dec: npt.ArrayLike, tai: npt.ArrayLike
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Calculate Az/El from RA/Dec in ICRS.
+
+        Parameters
+        ----------
+        ra : array-like
+            RA (deg).
+        dec : array-like
+            Dec (deg).
+        tai : array-like
+            TAI unix time (sec), broadcast against ``ra`` and ``dec``.
+
+        Returns
+        -------
+        az : `numpy.ndarray`
+            Azimuth (deg), in the range [0, 360).
+        el : `numpy.ndarray`
+            Elevation (deg).
+        """
+        _ra, _dec, _tai = np.broadcast_arrays(
+            np.asarray(ra, dtype=float),
+            np.asarray(dec, dtype=float),
+            np.asarray(tai, dtype=float),
+        )
+
+        vectors = _unit_vectors(_ra.ravel(), _dec.ravel())
+        azel_vectors = np.empty_like(vectors)
+
+        for anchor, dt, mask in self._get_anchors_for(_tai.ravel()):
+            rotated = _rotate(vectors[mask], anchor.pole, -EARTH_ROTATION_RATE * dt)
+            azel_vectors[mask] = _normalize(rotated @ anchor.matrix.T + anchor.offset)
+
+        az, el = _angles(azel_vectors)
+
+        return az.reshape(_ra.shape) % 360.0, el.reshape(_ra.shape)
+
+    def radec_from_azel(
+        self, az: npt.ArrayLike, el: npt.ArrayLike, tai: npt.ArrayLike
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Calculate RA/Dec in ICRS from Az/El.
+
+        Parameters
+        ----------
+        az : array-like
+            Azimuth (deg).
+        el : array-like
+            Elevation (deg).
+        tai : array-like
+            TAI unix time (sec), broadcast against ``az`` and ``el``.
+
+        Returns
+        -------
+        ra : `numpy.ndarray`
+            RA (deg), in the range [0, 360).
+        dec : `numpy.ndarray`
+            Dec (deg).
+        """
+        _az, _el, _tai = np.broadcast_arrays(
+            np.asarray(az, dtype=float),
+            np.asarray(el, dtype=float),
+            np.asarray(tai, dtype=float),
+        )
+
+        azel_vectors = _unit_vectors(_az.ravel(), _el.ravel())
+        vectors = np.empty_like(azel_vectors)
+
+        for anchor, dt, mask in self._get_anchors_for(_tai.ravel()):
+            # Invert the normalization with a fixed point iteration; the
+            # scale only differs from 1 by the size of the aberration.
+            azel = azel_vectors[mask]
+            rotated = _normalize((azel - anchor.offset) @ anchor.inverse.T)
+            scale = np.linalg.norm(
+                rotated @ anchor.matrix.T + anchor.offset, axis=1, keepdims=True
+            )
+            rotated = _normalize((azel * scale - anchor.offset) @ anchor.inverse.T)
+            vectors[mask] = _rotate(rotated, anchor.pole, EARTH_ROTATION_RATE * dt)
+
+        ra, dec = _angles(vectors)
+
+        return ra.reshape(_az.shape) % 360.0, dec.reshape(_az.shape)
+
+    def parallactic_angle(
+        self, ra: npt.ArrayLike, dec: npt.ArrayLike, lst: npt.ArrayLike
+    ) -> np.ndarray:
+        """Calculate the parallactic angle for RA/Dec in ICRS.
+
+        The angle is computed as in `calculate_parallactic_angle`, from the
+        mean local sidereal time and the ICRS coordinates, so both give the
+        same rotator angles. It does not depend on the anchors.
+
+        Parameters
+        ----------
+        ra : array-like
+            RA (deg).
+        dec : array-like
+            Dec (deg).
+        lst : array-like
+            Mean local sidereal time (deg), broadcast against ``ra`` and
+            ``dec``, e.g. from `TimeService.get_lst`.
+
+        Returns
+        -------
+        pa : `numpy.ndarray`
+            Parallactic angle (rad).
+        """
+        lat = self.location.lat.radian
+        hour_angle = np.radians(np.asarray(lst, dtype=float) - np.asarray(ra))
+        _dec = np.radians(np.asarray(dec, dtype=float))
+
+        # Eqn (14.1) of Meeus' Astronomical Algorithms, as in
+        # calculate_parallactic_angle.
+        return np.arctan2(
+            np.sin(hour_angle),
+            np.tan(lat) * np.cos(_dec) - np.sin(_dec) * np.cos(hour_angle),
+        )
+
+    def get_error(self, tai: npt.ArrayLike) -> float:
+        """Get the error of the transformation against astropy.
+
+        Parameters
+        ----------
+        tai : array-like
+            TAI unix time(s) (sec).
+
+        Returns
+        -------
+        error : `float`
+            Maximum error of the anchors covering the times (arcsec).
+        """
+        return max(
+            anchor.error
+            for anchor, _, _ in self._get_anchors_for(
+                np.ravel(np.asarray(tai, dtype=float))
+            )
+        )
+
+    def within_budget(self, tai: npt.ArrayLike) -> bool:
+        """Is the transformation error within the budget?
+
+        Parameters
+        ----------
+        tai : array-like
+            TAI unix time(s) (sec).
+
+        Returns
+        -------
+        `bool`
+            `True` if the error at all times is at most `max_error`.
+        """
+        return self.get_error(tai) <= self.max_error
+
+    def validate(
+        self, tai: float, num_points: int = 1000, seed: typing.Optional[int] = None
+    ) -> float:
+        """Measure the error against astropy on random points.
+
+        Parameters
+        ----------
+        tai : `float`
+            Start of the time range of the points, TAI unix time (sec). The
+            points are spread over the following `interval`.
+        num_points : `int`, optional
+            Number of points.
+        seed : `int`, optional
+            Seed of the random number generator.
+
+        Returns
+        -------
+        error : `float`
+            Maximum error (arcsec).
+        """
+        rng = np.random.default_rng(seed)
+
+        ra = rng.uniform(0.0, 360.0, num_points)
+        dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, num_points)))
+        times = tai + rng.uniform(0.0, self.interval, num_points)
+
+        az, el = self.azel_from_radec(ra, dec, times)
+
+        azel = ICRS(ra=ra * u.deg, dec=dec * u.deg).transform_to(
+            AltAz(location=self.location, obstime=astropy_time_from_tai_unix(times))
+        )
+
+        return float(
+            np.max(
+                _separation(
+                    _unit_vectors(az, el),
+                    _unit_vectors(azel.az.deg, azel.alt.deg),
+                )
+            )
+        )
+
+    def clear(self) -> None:
+        """Remove all anchors."""
+        self._anchors = collections.OrderedDict()
+
+    def _get_anchors_for(
+        self, tai: np.ndarray
+    ) -> typing.Iterator[typing.Tuple[_Anchor, np.ndarray, np.ndarray]]:
+        """Iterate over the anchors covering the given times.
+
+        Parameters
+        ----------
+        tai : `numpy.ndarray`
+            1-d array of TAI unix times (sec).
+
+        Yields
+        ------
+        anchor : `_Anchor`
+            Anchor.
+        dt : `numpy.ndarray`
+            Time since the anchor time of the times it covers (sec).
+        mask : `numpy.ndarray`
+            Mask of the times covered by the anchor.
+        """
+        buckets = np.floor(tai / self.interval).astype(np.int64)
+
+        for bucket in np.unique(buckets):
+            anchor = self._get_anchor(int(bucket))
+            mask = buckets == bucket
+            yield anchor, tai[mask] - anchor.tai, mask
+
+    def _get_anchor(self, bucket: int) -> _Anchor:
+        """Get the anchor of a time interval, computing it if needed."""
+        anchor = self._anchors.get(bucket)
+
+        if anchor is None:
+            anchor = self._make_anchor((bucket + 0.5) * self.interval)
+            self._anchors[bucket] = anchor
+            while len(self._anchors) > self.cache_size:
+                self._anchors.popitem(last=False)
+        else:
+            self._anchors.move_to_end(bucket)
+
+        return anchor
+
+    def _make_anchor(self, tai: float) -> _Anchor:
+        """Compute the anchor at a given time with astropy.
+
+        Parameters
+        ----------
+        tai : `float`
+            Anchor time, TAI unix time (sec).
+
+        Returns
+        -------
+        anchor : `_Anchor`
+            The anchor, with its error.
+        """
+        fit_azel = self._astropy_azel(self._fit_vectors, tai)
+
+        # Solve scale * u = matrix @ v + offset, iterating on the scale.
+        design = np.hstack([self._fit_vectors, np.ones((len(self._fit_vectors), 1))])
+        scale = np.ones((len(fit_azel), 1))
+        for _ in range(3):
+            solution = np.linalg.lstsq(design, fit_azel * scale, rcond=None)[0]
+            scale = np.linalg.norm(design @ solution, axis=1, keepdims=True)
+
+        matrix = solution[:3].T
+        inverse = np.linalg.inv(matrix)
+
+        anchor = _Anchor(
+            tai=tai,
+            matrix=matrix,
+            offset=solution[3],
+            inverse=inverse,
+            pole=_normalize(inverse @ self._pole_azel),
+        )
+
+        # Measure the error at the anchor time and at the edge of the
+        # interval, where the Earth rotation correction is the largest.
+        edge_tai = tai + self.interval / 2.0
+        for validation_tai in (tai, edge_tai):
+            rotated = _rotate(
+                self._validation_vectors,
+                anchor.pole,
+                -EARTH_ROTATION_RATE * (validation_tai - tai),
+            )
+            azel = _normalize(rotated @ matrix.T + anchor.offset)
+            error = np.max(
+                _separation(
+                    azel, self._astropy_azel(self._validation_vectors, validation_tai)
+                )
+            )
+            anchor.error = max(anchor.error, float(error))
+
+        return anchor
+
+    def _astropy_azel(self, vectors: np.ndarray, tai: float) -> np.ndarray:
+        """Transform ICRS unit vectors to Az/El unit vectors with astropy."""
+        ra, dec = _angles(vectors)
+        azel = ICRS(ra=ra * u.deg, dec=dec * u.deg).transform_to(
+            AltAz(location=self.location, obstime=astropy_time_from_tai_unix(tai))
+        )
+        return _unit_vectors(azel.az.deg, azel.alt.deg)
+
+
+def _fibonacci_sphere(num_points: int, offset: float = 0.0) -> np.ndarray:
+    """Unit vectors evenly spread over the sphere."""
+    index = np.arange(num_points) + 0.5 + offset
+    z = 1.0 - 2.0 * index / (num_points + 1.0)
+    lon = np.pi * (1.0 + 5.0**0.5) * index
+    radius = np.sqrt(1.0 - z**2)
+    return np.column_stack([radius * np.cos(lon), radius * np.sin(lon), z])
+
+
+def _unit_vectors(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Unit vectors from longitude and latitude (deg)."""
+    lon_rad = np.radians(lon)
+    lat_rad = np.radians(lat)
+    return np.column_stack(
+        [
+            np.cos(lat_rad) * np.cos(lon_rad),
+            np.cos(lat_rad) * np.sin(lon_rad),
+            np.sin(lat_rad),
+        ]
+    )
+
+
+def _angles(vectors: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Longitude and latitude (deg) of unit vectors."""
+    lon = np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0]))
+    lat = np.degrees(np.arcsin(np.clip(vectors[:, 2], -1.0, 1.0)))
+    return lon, lat
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normalize vectors along the last axis."""
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _rotate(vectors: np.ndarray, axis: np.ndarray, angle: npt.ArrayLike) -> np.ndarray:
+    """Rotate vectors around a unit axis (Rodrigues' formula).
+
+    Parameters
+    ----------
+    vectors : `numpy.ndarray`
+        Array of shape (N, 3).
+    axis : `numpy.ndarray`
+        Unit vector.
+    angle : array-like
+        Rotation angles (rad), scalar or of shape (N,).
+    """
+    cos_angle = np.cos(np.asarray(angle))[..., np.newaxis]
+    sin_angle = np.sin(np.asarray(angle))[..., np.newaxis]
+    return (
+        vectors * cos_angle
+        + np.cross(axis, vectors) * sin_angle
+        + np.outer(vectors @ axis, axis) * (1.0 - cos_angle)
+    )
+
+
+def _separation(vectors1: np.ndarray, vectors2: np.ndarray) -> np.ndarray:
+    """Angular separation between unit vectors (arcsec)."""
+    chord = np.linalg.norm(vectors1 - vectors2, axis=1)
+    return np.degrees(2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))) * 3600.0
@@ -30,6 +30,8 @@ import astropy.coordinates
 import astropy.units
 import numpy as np
 
+from ..utils import NoTargetError
+
 DM_STACK_AVAILABLE = True
 try:
     from lsst.daf.butler import DeferredDatasetHandle
@@ -48,7 +50,7 @@ def get_reference_object_loader_from_butler(
     butler: typing.Any,
     refcat_name: str,
     config: typing.Any = None,
-    **kwargs: typing.Any
+    **kwargs: typing.Any,
 ) -> typing.Any:
     """Get a ReferenceObjectLoader from a Butler.
 
@@ -107,6 +109,11 @@ def find_target_radec(
     radec_icrs : `astropy.coordinates.ICRS`
         Coordinate of the brightest target in the specified region/magnitude
         limit.
+
+    Raises
+    ------
+    NoTargetError
+        If there is no target in the region and magnitude limit.
     """
     best_effort_isr = BestEffortIsr()
 
@@ -130,6 +137,12 @@ def find_target_radec(
 
     mag_mask = np.bitwise_and(mag_g < mag_limit[1], mag_g > mag_limit[0])
 
+    if not np.any(mag_mask):
+        raise NoTargetError(
+            f"No target around {radec} within {radius} with magnitude between "
+            f"{mag_limit[0]} and {mag_limit[1]}."
+        )
+
     masked_source_cat = source_cat.refCat[mag_mask]
 
     source_index = np.argmin(mag_g[mag_mask])
@@ -0,0 +1,333 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["LatencyModel"]
+
+import asyncio
+import collections
+import json
+import pathlib
+import time
+import typing
+
+import numpy as np
+from lsst.ts import salobj
+
+from .remote_hooks import RemoteHook
+
+# Percentiles stored when the model is written to a file.
+PERSISTED_PERCENTILES = (50.0, 90.0, 95.0, 99.0, 100.0)
+
+# Names of the positional parameters of the command methods.
+COMMAND_POSITIONAL_ARGS = {
+    "start": ("data", "timeout", "wait_done"),
+    "set_start": ("timeout", "wait_done"),
+}
+
+
+class LatencyModel(RemoteHook):
+    """Learn command latencies and derive timeouts from them.
+
+    The model keeps a window of the most recent durations of each
+    (component, command, kind) and computes timeouts as a high percentile
+    of the durations times a safety factor. Kind is "done" for the time
+    until the command completes and "ack" for the time until the first
+    acknowledgement. Percentiles can be written to a file and read back, so
+    the model does not start from scratch in every process.
+
+    When started with a group, the model is registered as a hook of the
+    group remotes to record the command durations and, if
+    ``apply_timeouts`` is `True`, to extend the timeout passed by the
+    caller to the learned one when the latter is longer.
+
+    Parameters
+    ----------
+    group : `RemoteGroup`, optional
+        Group whose commands are recorded. If `None`, durations must be
+        recorded explicitly with `record`.
+    percentile : `float`, optional
+        Percentile of the durations used to compute timeouts.
+    safety_factor : `float`, optional
+        Factor applied to the percentile to compute timeouts.
+    min_samples : `int`, optional
+        Minimum number of recorded durations before the learned timeout is
+        used.
+    window : `int`, optional
+        Number of recent durations kept for each command.
+    min_timeout : `float`, optional
+        Lower bound for the learned timeouts (sec).
+    apply_timeouts : `bool`, optional
+        Extend the timeout of the commands of the group to the learned one?
+        Default `False`.
+
+    Notes
+    -----
+    Timeouts are learned per command, regardless of its parameters, while
+    the duration of many commands (e.g. moves, homing or slews) depends on
+    them. A learned timeout therefore never shortens the timeout given by
+    the caller; it can only extend it.
+
+    Commands that complete successfully are recorded with their duration.
+    Commands that time out are recorded with the time waited, a lower bound
+    of their duration, so a too short timeout is corrected. Rejected
+    commands are not recorded. Commands sent with ``wait_done=False`` are
+    recorded with kind "ack".
+    """
+
+    call_methods = {"cmd_": ("start", "set_start")}
+
+    def __init__(
+        self,
+        group: typing.Any = None,
+        percentile: float = 99.0,
+        safety_factor: float = 2.0,
+        min_samples: int = 10,
+        window: int = 500,
+        min_timeout: float = 1.0,
+        apply_timeouts: bool = False,
+    ) -> None:
+        self.group = group
+        self.percentile = percentile
+        self.safety_factor = safety_factor
+        self.min_samples = min_samples
+        self.window = window
+        self.min_timeout = min_timeout
+        self.apply_timeouts = apply_timeouts
+
+        # Dict of (component, command, kind): recent durations.
+        self._durations: typing.Dict[
+            typing.Tuple[str, str, str], typing.Deque[float]
+        ] = dict()
+        # Dict of (component, command, kind): dict with "count" and
+        # "percentiles" read from a file.
+        self._persisted: typing.Dict[
+            typing.Tuple[str, str, str], typing.Dict[str, typing.Any]
+        ] = dict()
+
+    def start(self) -> None:
+        """Start recording the commands of the group remotes."""
+        if self.group is not None:
+            self.group.add_remote_hook(self)
+
+    def stop(self) -> None:
+        """Stop recording the commands of the group remotes."""
+        if self.group is not None:
+            self.group.remove_remote_hook(self)
+
+    async def call(
+        self,
+        component: str,
+        topic_name: str,
+        method_name: str,
+        proceed: typing.Callable[..., typing.Awaitable],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        # Pass the positional arguments by name, so the timeout can be
+        # found and replaced.
+        kwargs.update(zip(COMMAND_POSITIONAL_ARGS[method_name], args))
+        kind = "done" if kwargs.get("wait_done", True) else "ack"
+
+        if self.apply_timeouts and "timeout" in kwargs:
+            kwargs["timeout"] = self.get_timeout(
+                component, topic_name, default=kwargs["timeout"], kind=kind
+            )
+
+        start_time = time.monotonic()
+        try:
+            result = await proceed(**kwargs)
+        except (asyncio.TimeoutError, salobj.AckTimeoutError):
+            # The duration is at least the time waited.
+            self.record(component, topic_name, time.monotonic() - start_time, kind=kind)
+            raise
+        self.record(component, topic_name, time.monotonic() - start_time, kind=kind)
+        return result
+
+    def record(
+        self, component: str, command: str, duration: float, kind: str = "done"
+    ) -> None:
+        """Record the duration of a command.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        command : `str`
+            Name of the command, e.g. "cmd_start".
+        duration : `float`
+            Duration (sec).
+        kind : `str`, optional
+            "done" (default) for the time until the command completed or
+            "ack" for the time until the first acknowledgement.
+        """
+        key = (component, command, kind)
+        if key not in self._durations:
+            self._durations[key] = collections.deque(maxlen=self.window)
+        self._durations[key].append(duration)
+
+    def get_percentile(
+        self,
+        component: str,
+        command: str,
+        percentile: typing.Optional[float] = None,
+        kind: str = "done",
+    ) -> typing.Optional[float]:
+        """Get a percentile of the durations of a command.
+
+        Recorded durations are used if there are at least `min_samples` of
+        them, otherwise the percentiles read from a file, if any.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        command : `str`
+            Name of the command.
+        percentile : `float`, optional
+            Percentile to compute. If `None` (default) use `percentile`.
+        kind : `str`, optional
+            "done" (default) or "ack".
+
+        Returns
+        -------
+        duration : `float` or `None`
+            Percentile of the durations (sec), or `None` if there is not
+            enough information.
+        """
+        _percentile = self.percentile if percentile is None else percentile
+        key = (component, command, kind)
+
+        durations = self._durations.get(key, ())
+        if len(durations) >= self.min_samples:
+            return float(np.percentile(durations, _percentile))
+
+        persisted = self._persisted.get(key)
+        if persisted is None or persisted["count"] < self.min_samples:
+            return None
+
+        # Use the smallest persisted percentile that is not lower than the
+        # requested one.
+        for persisted_percentile, value in sorted(persisted["percentiles"].items()):
+            if persisted_percentile >= _percentile:
+                return value
+
+        return None
+
+    def get_timeout(
+        self,
+        component: str,
+        command: str,
+        default: typing.Optional[float],
+        kind: str = "done",
+    ) -> typing.Optional[float]:
+        """Get the timeout for a command.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        command : `str`
+            Name of the command.
+        default : `float` or `None`
+            Timeout given by the caller (sec). `None` means no timeout.
+        kind : `str`, optional
+            "done" (default) or "ack".
+
+        Returns
+        -------
+        timeout : `float` or `None`
+            The larger of the learned timeout and ``default``, or
+            ``default`` if there is not enough information.
+        """
+        duration = self.get_percentile(component, command, kind=kind)
+
+        if duration is None or default is None:
+            return default
+
+        return max(duration * self.safety_factor, self.min_timeout, default)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """Get the percentiles of the recorded durations.
+
+        Returns
+        -------
+        latencies : `dict`
+            Dictionary of component: command: kind: dict with "count" and
+            "percentiles" (percentile: duration). Commands with no recorded
+            durations keep the values read from a file.
+        """
+        latencies: typing.Dict[str, typing.Any] = dict()
+
+        for key in {**self._persisted, **self._durations}:
+            component, command, kind = key
+            durations = self._durations.get(key, ())
+            if len(durations) > 0:
+                stats = dict(
+                    count=len(durations),
+                    percentiles=dict(
+                        (
+                            percentile,
+                            float(np.percentile(durations, percentile)),
+                        )
+                        for percentile in PERSISTED_PERCENTILES
+                    ),
+                )
+            else:
+                stats = self._persisted[key]
+
+            latencies.setdefault(component, dict()).setdefault(command, dict())[
+                kind
+            ] = stats
+
+        return latencies
+
+    def write(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Write the percentiles of the recorded durations to a json file.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        with open(path, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=2, sort_keys=True)
+
+    def read(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Read percentiles written with `write`.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        with open(path) as fp:
+            latencies = json.load(fp)
+
+        for component, commands in latencies.items():
+            for command, kinds in commands.items():
+                for kind, stats in kinds.items():
+                    self._persisted[(component, command, kind)] = dict(
+                        count=stats["count"],
+                        percentiles=dict(
+                            (float(percentile), value)
+                            for percentile, value in stats["percentiles"].items()
+                        ),
+                    )
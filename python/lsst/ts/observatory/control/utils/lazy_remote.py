@@ -0,0 +1,190 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["LazyRemote"]
+
+import asyncio
+import functools
+import inspect
+import logging
+import typing
+
+from lsst.ts import salobj
+
+# Prefixes of the remote attributes that are topics.
+TOPIC_PREFIXES = ("cmd_", "evt_", "tel_")
+
+
+class LazyRemote:
+    """Stand-in for a `salobj.Remote` that creates the remote on first use.
+
+    Creating a `salobj.Remote` starts reading historical data for all the
+    included topics, which can take a considerable amount of time. This class
+    holds the arguments needed to create the remote and only creates it when
+    one of its attributes is accessed or when `start` is called.
+
+    Parameters
+    ----------
+    domain : `salobj.Domain`
+        Domain for the remote.
+    name : `str`
+        Name of the SAL component.
+    index : `int` or `None`
+        SAL index.
+    readonly : `bool`
+        Create a readonly remote?
+    include : `list` [`str`] or `None`
+        Topics to include.
+    log : `logging.Logger`, optional
+        Logger.
+
+    Notes
+    -----
+    Asynchronous topic methods (e.g. ``cmd_*.start`` or ``evt_*.next``)
+    accessed through this class wait for the remote to start before they
+    execute, so the remote can be used right away, e.g.::
+
+        await group.rem.mtmount.cmd_homeBothAxes.start(timeout=300.0)
+
+    will create the remote, wait for it to start and then send the command.
+    """
+
+    def __init__(
+        self,
+        domain: salobj.Domain,
+        name: str,
+        index: typing.Optional[int],
+        readonly: bool,
+        include: typing.Optional[typing.List[str]],
+        log: typing.Optional[logging.Logger] = None,
+    ) -> None:
+        self._domain = domain
+        self._name = name
+        self._index = index
+        self._readonly = readonly
+        self._include = include
+        self._log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+        self._remote: typing.Optional[salobj.Remote] = None
+
+    @property
+    def is_created(self) -> bool:
+        """Was the remote created?"""
+        return self._remote is not None
+
+    @property
+    def include(self) -> typing.Optional[typing.List[str]]:
+        """Topics to include when creating the remote."""
+        return self._include
+
+    @include.setter
+    def include(self, include: typing.Optional[typing.List[str]]) -> None:
+        if self._remote is not None:
+            raise RuntimeError(
+                f"Remote for {self._name}:{self._index} already created; "
+                "cannot change included topics."
+            )
+        self._include = include
+
+    @property
+    def remote(self) -> salobj.Remote:
+        """The `salobj.Remote`, created on first access."""
+        if self._remote is None:
+            self._log.debug(f"Creating remote for {self._name}:{self._index}.")
+            self._remote = salobj.Remote(
+                domain=self._domain,
+                name=self._name,
+                index=self._index,
+                readonly=self._readonly,
+                include=self._include,
+            )
+        return self._remote
+
+    @property
+    def start_task(self) -> asyncio.Future:
+        """Start task of the remote. Accessing it creates the remote."""
+        return self.remote.start_task
+
+    async def start(self) -> salobj.Remote:
+        """Create the remote, if needed, and wait for it to start.
+
+        Returns
+        -------
+        remote : `salobj.Remote`
+            The started remote.
+        """
+        await self.remote.start_task
+        return self.remote
+
+    async def close(self) -> None:
+        """Close the remote, if it was created."""
+        if self._remote is not None:
+            await self._remote.close()
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        remote = self.remote
+        attr = getattr(remote, name)
+
+        if name.startswith(TOPIC_PREFIXES) and not remote.start_task.done():
+            return _WaitStartTopic(attr, remote.start_task)
+
+        return attr
+
+
+class _WaitStartTopic:
+    """Wrap a topic so that its coroutine methods wait for the remote to
+    start.
+
+    Parameters
+    ----------
+    topic : `salobj.topics.BaseTopic`
+        Topic to wrap.
+    start_task : `asyncio.Future`
+        Remote start task.
+    """
+
+    def __init__(self, topic: typing.Any, start_task: asyncio.Future) -> None:
+        object.__setattr__(self, "_topic", topic)
+        object.__setattr__(self, "_start_task", start_task)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        attr = getattr(self._topic, name)
+
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wait_start_and_call(
+            *args: typing.Any, **kwargs: typing.Any
+        ) -> typing.Any:
+            await self._start_task
+            return await attr(*args, **kwargs)
+
+        return wait_start_and_call
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        setattr(self._topic, name, value)
@@ -0,0 +1,301 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["LivelinessMonitor"]
+
+import asyncio
+import logging
+import typing
+
+from .clock import Clock, RealClock
+from .topic_cache import TopicCache
+
+
+class LivelinessMonitor:
+    """Track the heartbeats of a set of components with a single watchdog
+    task.
+
+    Each component heartbeat topic cache gets a listener that records the
+    time of the last heartbeat. A single task sleeps until the earliest
+    heartbeat deadline of the components (last heartbeat plus ``timeout``),
+    so a component is reported silent as soon as it misses its deadline, and
+    notifies subscribers when a component goes silent.
+
+    Parameters
+    ----------
+    timeout : `float`
+        Time without heartbeats after which a component is considered silent
+        (sec).
+    clock : `Clock`, optional
+        Clock used to time the heartbeats and the watchdog sleeps. If `None`
+        (default) use a `RealClock`.
+    log : `logging.Logger`, optional
+        Logger.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        clock: typing.Optional[Clock] = None,
+        log: typing.Optional[logging.Logger] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.clock = RealClock() if clock is None else clock
+        self.log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+
+        # Dict of component: clock time of last heartbeat, or None.
+        self._last_heartbeat: typing.Dict[str, typing.Optional[float]] = dict()
+        # Dict of component: clock time monitoring started.
+        self._monitor_start: typing.Dict[str, float] = dict()
+        # Dict of component: alive flag, updated by heartbeats and watchdog.
+        self._alive: typing.Dict[str, bool] = dict()
+        # Components already reported as silent.
+        self._silent: typing.Set[str] = set()
+        self._listeners: typing.Dict[str, typing.Callable[[typing.Any], None]] = dict()
+        self._topic_caches: typing.Dict[str, TopicCache] = dict()
+        self._silent_futures: typing.Dict[str, asyncio.Future] = dict()
+        self._subscribers: typing.List[typing.Callable[[str], None]] = []
+        self._task: typing.Optional[asyncio.Task] = None
+        # Set to wake up the watchdog when the deadlines change.
+        self._wake_up = asyncio.Event()
+
+    @property
+    def components(self) -> typing.List[str]:
+        """Monitored components."""
+        return list(self._last_heartbeat)
+
+    @property
+    def is_running(self) -> bool:
+        """Is the watchdog task running?"""
+        return self._task is not None and not self._task.done()
+
+    def add_component(self, component: str, heartbeat_cache: TopicCache) -> None:
+        """Start monitoring the heartbeats of a component.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        heartbeat_cache : `TopicCache`
+            Cache of the heartbeat topic of the component.
+        """
+        if component in self._last_heartbeat:
+            return
+
+        def listener(sample: typing.Any) -> None:
+            self._heartbeat(component)
+
+        self._last_heartbeat[component] = None
+        self._monitor_start[component] = self.clock.time()
+        self._alive[component] = False
+        self._listeners[component] = listener
+        self._topic_caches[component] = heartbeat_cache
+        heartbeat_cache.add_listener(listener)
+        self._wake_up.set()
+
+    def start(self) -> None:
+        """Start the watchdog task."""
+        if not self.is_running:
+            now = self.clock.time()
+            for component in self._monitor_start:
+                self._monitor_start[component] = now
+            self._task = asyncio.create_task(self._watchdog())
+
+    async def stop(self) -> None:
+        """Stop the watchdog task and remove the listeners.
+
+        Tasks waiting in `wait_silent` fail with `RuntimeError`.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for component, listener in self._listeners.items():
+            self._topic_caches[component].remove_listener(listener)
+
+        for component, future in self._silent_futures.items():
+            if not future.done():
+                future.set_exception(
+                    RuntimeError(
+                        f"Liveliness monitor stopped while waiting for {component}."
+                    )
+                )
+                # Retrieve exception to avoid "never retrieved" warnings when
+                # there are no waiters.
+                future.exception()
+
+        self._listeners = dict()
+        self._topic_caches = dict()
+        self._silent_futures = dict()
+
+    def liveliness(self) -> typing.Dict[str, bool]:
+        """Get a snapshot of the liveliness of the components.
+
+        Returns
+        -------
+        liveliness : `dict` [`str`, `bool`]
+            Dictionary with component name and `True` if a heartbeat was
+            received in the last `timeout` seconds.
+        """
+        return dict(self._alive)
+
+    def heartbeat_age(self, component: str) -> typing.Optional[float]:
+        """Get the time since the last heartbeat of a component.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+
+        Returns
+        -------
+        age : `float` or `None`
+            Seconds since the last heartbeat, or `None` if no heartbeat was
+            received since monitoring started.
+        """
+        last_heartbeat = self._last_heartbeat[component]
+        return None if last_heartbeat is None else self.clock.time() - last_heartbeat
+
+    def subscribe(self, callback: typing.Callable[[str], None]) -> None:
+        """Subscribe to "component went silent" notifications.
+
+        Parameters
+        ----------
+        callback : ``callable``
+            Synchronous function called with the name of the component when
+            it goes silent.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: typing.Callable[[str], None]) -> None:
+        """Remove a subscriber added with `subscribe`.
+
+        Parameters
+        ----------
+        callback : ``callable``
+            Function to remove.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    async def wait_silent(self, component: str) -> None:
+        """Wait until a component goes silent.
+
+        Returns immediately if the component is already silent.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+
+        Raises
+        ------
+        KeyError
+            If the component is not monitored.
+        RuntimeError
+            If the monitor is not running or is stopped while waiting.
+        """
+        if component not in self._last_heartbeat:
+            raise KeyError(
+                f"Component {component} not monitored. Must be one of {self.components}."
+            )
+
+        if not self.is_running:
+            raise RuntimeError("Liveliness monitor not running.")
+
+        if component in self._silent:
+            return
+
+        if component not in self._silent_futures:
+            self._silent_futures[component] = asyncio.get_running_loop().create_future()
+
+        await asyncio.shield(self._silent_futures[component])
+
+    def _heartbeat(self, component: str) -> None:
+        """Heartbeat listener."""
+        self._last_heartbeat[component] = self.clock.time()
+        if component in self._silent:
+            self.log.info(f"{component} alive again.")
+            self._silent.remove(component)
+            # The component has a deadline again.
+            self._wake_up.set()
+        self._alive[component] = True
+
+    def _get_deadline(self, component: str) -> float:
+        """Get the clock time at which a component is considered silent."""
+        last_heartbeat = self._last_heartbeat[component]
+        return (
+            self._monitor_start[component] if last_heartbeat is None else last_heartbeat
+        ) + self.timeout
+
+    async def _watchdog(self) -> None:
+        """Sleep until the earliest heartbeat deadline and check the
+        components that missed it.
+
+        Heartbeats only move the deadlines later, so the watchdog is only
+        woken up early when a component is added or comes back alive.
+        """
+        while True:
+            self._wake_up.clear()
+            now = self.clock.time()
+
+            next_deadline: typing.Optional[float] = None
+            for component in self._last_heartbeat:
+                if component in self._silent:
+                    continue
+
+                deadline = self._get_deadline(component)
+                if deadline <= now:
+                    self._alive[component] = False
+                    self._silent.add(component)
+                    self._notify_silent(component)
+                elif next_deadline is None or deadline < next_deadline:
+                    next_deadline = deadline
+
+            try:
+                await self.clock.wait_for(
+                    self._wake_up.wait(),
+                    timeout=None if next_deadline is None else next_deadline - now,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify_silent(self, component: str) -> None:
+        """Notify subscribers and waiters that a component is silent."""
+        self.log.warning(f"No heartbeat from {component} in {self.timeout}s.")
+
+        future = self._silent_futures.pop(component, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+        for callback in self._subscribers:
+            try:
+                callback(component)
+            except Exception:
+                self.log.exception(f"Error in liveliness subscriber for {component}.")
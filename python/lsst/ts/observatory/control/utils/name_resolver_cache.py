@@ -0,0 +1,252 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["NameResolverCache", "get_default_cache_path"]
+
+import contextlib
+import pathlib
+import sqlite3
+import time
+import typing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    name TEXT PRIMARY KEY,
+    ra REAL NOT NULL,
+    dec REAL NOT NULL,
+    source TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    expires REAL
+)
+"""
+
+
+def get_default_cache_path() -> pathlib.Path:
+    """Return the default directory for the persistent caches.
+
+    Returns
+    -------
+    cache_path : `pathlib.Path`
+        Path to the cache directory, "~/.cache/ts_observatory_control".
+    """
+    return pathlib.Path.home() / ".cache" / "ts_observatory_control"
+
+
+class NameResolverCache:
+    """Persistent cache of resolved object names.
+
+    Coordinates are stored in a SQLite database, so they are shared by all
+    the processes that use the same file and survive restarts. Entries expire
+    after a time to live, but expired entries are kept and can still be
+    read with ``allow_expired=True``, e.g. when the name resolution service
+    is not reachable.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`, optional
+        Database file. Default is "name_resolver.sqlite" in
+        `get_default_cache_path`.
+    ttl : `float`, optional
+        Time to live of the entries (sec).
+    timeout : `float`, optional
+        How long to wait for the database lock held by another process
+        (sec).
+    """
+
+    def __init__(
+        self,
+        path: typing.Union[str, pathlib.Path, None] = None,
+        ttl: float = 30.0 * 86400.0,
+        timeout: float = 5.0,
+    ) -> None:
+        self.path = (
+            get_default_cache_path() / "name_resolver.sqlite"
+            if path is None
+            else pathlib.Path(path)
+        )
+        self.ttl = ttl
+        self.timeout = timeout
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+
+    def get(
+        self, name: str, allow_expired: bool = False
+    ) -> typing.Optional[typing.Tuple[float, float]]:
+        """Get the coordinates of an object.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the object.
+        allow_expired : `bool`, optional
+            Return expired entries?
+
+        Returns
+        -------
+        radec : `tuple` [`float`, `float`] or `None`
+            RA and Dec in ICRS (deg), or `None` if the object is not in the
+            cache or its entry expired.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT ra, dec, expires FROM objects WHERE name = ?", (name,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        ra, dec, expires = row
+
+        if not allow_expired and expires is not None and expires < time.time():
+            return None
+
+        return ra, dec
+
+    def put(
+        self,
+        name: str,
+        ra: float,
+        dec: float,
+        source: str = "simbad",
+        ttl: typing.Optional[float] = None,
+    ) -> None:
+        """Add or replace an object.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the object.
+        ra : `float`
+            RA in ICRS (deg).
+        dec : `float`
+            Dec in ICRS (deg).
+        source : `str`, optional
+            Where the coordinates come from.
+        ttl : `float`, optional
+            Time to live of the entry (sec). If `None` use `ttl`. Use
+            `math.inf` for entries that never expire.
+        """
+        now = time.time()
+        _ttl = self.ttl if ttl is None else ttl
+        expires = None if _ttl == float("inf") else now + _ttl
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO objects "
+                "(name, ra, dec, source, timestamp, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, float(ra), float(dec), source, now, expires),
+            )
+
+    def seed(
+        self,
+        objects: typing.Iterable[typing.Tuple[str, float, float]],
+        source: str = "seed",
+    ) -> int:
+        """Add objects that never expire, e.g. a list of standard stars, so
+        they can be resolved when the name resolution service is not
+        reachable.
+
+        Parameters
+        ----------
+        objects : iterable of `tuple` [`str`, `float`, `float`]
+            Name, RA and Dec in ICRS (deg) of the objects.
+        source : `str`, optional
+            Where the coordinates come from.
+
+        Returns
+        -------
+        count : `int`
+            Number of objects added.
+        """
+        now = time.time()
+        rows = [
+            (name, float(ra), float(dec), source, now, None)
+            for name, ra, dec in objects
+        ]
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO objects "
+                "(name, ra, dec, source, timestamp, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+        return len(rows)
+
+    def remove(self, name: str) -> None:
+        """Remove an object.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the object.
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM objects WHERE name = ?", (name,))
+
+    def clear(self, expired_only: bool = False) -> None:
+        """Remove all objects.
+
+        Parameters
+        ----------
+        expired_only : `bool`, optional
+            Only remove the expired entries?
+        """
+        with self._connect() as connection:
+            if expired_only:
+                connection.execute(
+                    "DELETE FROM objects WHERE expires IS NOT NULL AND expires < ?",
+                    (time.time(),),
+                )
+            else:
+                connection.execute("DELETE FROM objects")
+
+    def names(self) -> typing.Set[str]:
+        """Return the names of all objects in the cache.
+
+        Returns
+        -------
+        names : `set` [`str`]
+            Object names, including expired entries.
+        """
+        with self._connect() as connection:
+            return set(row[0] for row in connection.execute("SELECT name FROM objects"))
+
+    @contextlib.contextmanager
+    def _connect(self) -> typing.Iterator[sqlite3.Connection]:
+        """Open a connection, committing on success and closing it at the
+        end.
+
+        A new connection is opened for each operation so the cache can be
+        used from executor threads.
+        """
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
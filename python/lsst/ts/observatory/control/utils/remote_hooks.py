@@ -0,0 +1,293 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["RemoteHook", "RemoteNamespace"]
+
+import functools
+import types
+import typing
+
+from .lazy_remote import TOPIC_PREFIXES
+
+
+class RemoteHook:
+    """Base class for objects that observe or intercept the use of the
+    remotes of a group.
+
+    Hooks are registered with `RemoteGroup.add_remote_hook` and see every
+    access to a topic of the group remotes made through the group ``rem``
+    namespace. Subclasses override `on_topic_access` to be notified of the
+    accesses and `call` to wrap the topic methods listed in `call_methods`.
+    """
+
+    # Topic methods wrapped by `call`, by topic prefix, e.g.
+    # {"cmd_": ("start", "set_start")}.
+    call_methods: typing.Dict[str, typing.Tuple[str, ...]] = dict()
+
+    def on_topic_access(self, component: str, topic_name: str) -> None:
+        """Called when a topic of a remote is accessed.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in the group
+            ``components_attr``.
+        topic_name : `str`
+            Name of the topic attribute, e.g. "cmd_start".
+        """
+        pass
+
+    async def call(
+        self,
+        component: str,
+        topic_name: str,
+        method_name: str,
+        proceed: typing.Callable[..., typing.Awaitable],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Called instead of a topic method listed in `call_methods`.
+
+        Implementations must await ``proceed`` (with the same or modified
+        arguments) to execute the method, or the next hook.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        topic_name : `str`
+            Name of the topic attribute, e.g. "cmd_start".
+        method_name : `str`
+            Name of the method, e.g. "start".
+        proceed : ``coroutine``
+            Function that executes the method (or the next hook).
+        *args, **kwargs
+            Arguments of the method.
+
+        Returns
+        -------
+        result : ``object``
+            Result of the method.
+        """
+        return await proceed(*args, **kwargs)
+
+
+class RemoteNamespace(types.SimpleNamespace):
+    """Namespace holding the remotes of a group, as attributes named after
+    the components.
+
+    The remotes are stored as they are and are never replaced by the hooks.
+    When hooks are registered, accessing a remote returns a thin proxy that
+    notifies the hooks of the topic accesses and routes the wrapped topic
+    methods through them; the hooks in effect are read at every access, so
+    hooks can be added and removed in any order. Use `get_remote` to get
+    the stored remote.
+    """
+
+    def __init__(self, **kwargs: typing.Any) -> None:
+        super().__init__(**kwargs)
+        object.__setattr__(self, "_hooks", [])
+
+    @property
+    def hooks(self) -> typing.List[RemoteHook]:
+        """Registered hooks, in registration order."""
+        return list(object.__getattribute__(self, "_hooks"))
+
+    def add_hook(self, hook: RemoteHook) -> None:
+        """Register a hook.
+
+        Parameters
+        ----------
+        hook : `RemoteHook`
+            Hook to register. Registering a hook twice has no effect.
+        """
+        hooks = object.__getattribute__(self, "_hooks")
+        if hook not in hooks:
+            hooks.append(hook)
+
+    def remove_hook(self, hook: RemoteHook) -> None:
+        """Unregister a hook added with `add_hook`.
+
+        Parameters
+        ----------
+        hook : `RemoteHook`
+            Hook to unregister. Unregistering a hook that is not registered
+            has no effect.
+        """
+        hooks = object.__getattribute__(self, "_hooks")
+        if hook in hooks:
+            hooks.remove(hook)
+
+    def get_remote(self, component: str, default: typing.Any = None) -> typing.Any:
+        """Get the stored remote of a component, bypassing the hooks.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        default : ``object``, optional
+            Value to return if there is no such component.
+
+        Returns
+        -------
+        remote : `salobj.Remote`, `LazyRemote` or `None`
+            The remote.
+        """
+        return object.__getattribute__(self, "__dict__").get(component, default)
+
+    def hook_remote(self, component: str, remote: typing.Any) -> typing.Any:
+        """Pass the topics of a remote through the hooks.
+
+        Use this when a remote obtained with `get_remote` (or the
+        `salobj.Remote` behind a `LazyRemote`) is handed to code outside of
+        the group, e.g. `salobj.set_summary_state`, so the hooks still see
+        its use.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        remote : `salobj.Remote` or `LazyRemote`
+            Remote of the component.
+
+        Returns
+        -------
+        remote : ``object``
+            A proxy of ``remote`` if there are hooks, ``remote`` otherwise.
+        """
+        if remote is None or not object.__getattribute__(self, "_hooks"):
+            return remote
+
+        return _HookedRemote(remote=remote, component=component, namespace=self)
+
+    def __getattribute__(self, name: str) -> typing.Any:
+        remotes = object.__getattribute__(self, "__dict__")
+
+        if name.startswith("_") or name not in remotes:
+            return super().__getattribute__(name)
+
+        return object.__getattribute__(self, "hook_remote")(name, remotes[name])
+
+
+class _HookedRemote:
+    """Proxy of a remote that passes its topics through the hooks.
+
+    Parameters
+    ----------
+    remote : `salobj.Remote`
+        Remote.
+    component : `str`
+        Name of the component.
+    namespace : `RemoteNamespace`
+        Namespace with the hooks.
+    """
+
+    def __init__(
+        self, remote: typing.Any, component: str, namespace: RemoteNamespace
+    ) -> None:
+        object.__setattr__(self, "_remote", remote)
+        object.__setattr__(self, "_component", component)
+        object.__setattr__(self, "_namespace", namespace)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        attr = getattr(self._remote, name)
+
+        if not name.startswith(TOPIC_PREFIXES):
+            return attr
+
+        for hook in self._namespace.hooks:
+            hook.on_topic_access(self._component, name)
+
+        return _HookedTopic(
+            topic=attr,
+            topic_name=name,
+            component=self._component,
+            namespace=self._namespace,
+        )
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        setattr(self._remote, name, value)
+
+
+class _HookedTopic:
+    """Proxy of a topic that routes some of its methods through the hooks.
+
+    Parameters
+    ----------
+    topic : `salobj.topics.BaseTopic`
+        Topic.
+    topic_name : `str`
+        Name of the topic attribute in the remote, e.g. "cmd_start".
+    component : `str`
+        Name of the component.
+    namespace : `RemoteNamespace`
+        Namespace with the hooks.
+    """
+
+    def __init__(
+        self,
+        topic: typing.Any,
+        topic_name: str,
+        component: str,
+        namespace: RemoteNamespace,
+    ) -> None:
+        object.__setattr__(self, "_topic", topic)
+        object.__setattr__(self, "_topic_name", topic_name)
+        object.__setattr__(self, "_component", component)
+        object.__setattr__(self, "_namespace", namespace)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        attr = getattr(self._topic, name)
+        prefix = self._topic_name[: self._topic_name.index("_") + 1]
+
+        if not any(
+            name in hook.call_methods.get(prefix, ()) for hook in self._namespace.hooks
+        ):
+            return attr
+
+        @functools.wraps(attr)
+        async def hooked_call(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            hooks = [
+                hook
+                for hook in self._namespace.hooks
+                if name in hook.call_methods.get(prefix, ())
+            ]
+
+            async def proceed(
+                index: int, *args: typing.Any, **kwargs: typing.Any
+            ) -> typing.Any:
+                if index == len(hooks):
+                    return await attr(*args, **kwargs)
+                return await hooks[index].call(
+                    self._component,
+                    self._topic_name,
+                    name,
+                    functools.partial(proceed, index + 1),
+                    *args,
+                    **kwargs,
+                )
+
+            return await proceed(0, *args, **kwargs)
+
+        return hooked_call
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        setattr(self._topic, name, value)
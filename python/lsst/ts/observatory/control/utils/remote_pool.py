@@ -0,0 +1,267 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["RemotePool"]
+
+import dataclasses
+import logging
+import typing
+
+from lsst.ts import salobj
+
+from .lazy_remote import LazyRemote
+
+
+@dataclasses.dataclass
+class _PoolEntry:
+    """A remote in the pool."""
+
+    domain: salobj.Domain
+    name: str
+    index: typing.Optional[int]
+    readonly: bool
+    include: typing.Optional[typing.FrozenSet[str]]
+    remote: typing.Union[salobj.Remote, LazyRemote]
+    refcount: int = 0
+
+    def covers(
+        self, readonly: bool, include: typing.Optional[typing.FrozenSet[str]]
+    ) -> bool:
+        """Can the remote be used for the given readonly and include?"""
+        if not readonly and self.readonly:
+            return False
+        if self.include is None:
+            return True
+        return include is not None and include <= self.include
+
+    def matches(self, remote: typing.Any) -> bool:
+        """Is ``remote`` the remote of this entry?"""
+        return remote is self.remote or (
+            isinstance(self.remote, LazyRemote)
+            and self.remote.is_created
+            and remote is self.remote.remote
+        )
+
+
+class RemotePool:
+    """Share `salobj.Remote` instances and a `salobj.Domain` between groups.
+
+    Groups created with ``shared=True`` get their remotes from the
+    process-wide pool returned by `get_default`. A remote is shared when an
+    existing one, for the same component and domain, can serve the request:
+    it must not be readonly if the request is not, and it must include all
+    the requested topics. Lazy remotes that were not created yet have their
+    include lists merged instead. Remotes are reference counted and closed
+    when the last group releases them.
+
+    Sharing a remote also shares its topic callbacks and read queues, so the
+    groups sharing a remote must not read the same topics with ``next`` (or
+    ``flush`` them) concurrently; see `RemoteGroup`.
+
+    Parameters
+    ----------
+    log : `logging.Logger`, optional
+        Logger.
+    """
+
+    _default: typing.Optional["RemotePool"] = None
+
+    def __init__(self, log: typing.Optional[logging.Logger] = None) -> None:
+        self.log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+
+        self._entries: typing.List[_PoolEntry] = []
+        self._domain: typing.Optional[salobj.Domain] = None
+        self._domain_refcount = 0
+
+    @classmethod
+    def get_default(cls) -> "RemotePool":
+        """Get the process-wide pool.
+
+        Returns
+        -------
+        remote_pool : `RemotePool`
+            The pool shared by all groups in the process.
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def num_remotes(self) -> int:
+        """Number of remotes in the pool."""
+        return len(self._entries)
+
+    def acquire_domain(self) -> salobj.Domain:
+        """Get the shared domain, creating it if needed.
+
+        Each call must be matched by a call to `release_domain`.
+
+        Returns
+        -------
+        domain : `salobj.Domain`
+            The shared domain.
+        """
+        if self._domain is None:
+            self._domain = salobj.Domain()
+        self._domain_refcount += 1
+        return self._domain
+
+    async def release_domain(self) -> None:
+        """Release the shared domain, closing it when no longer used."""
+        self._domain_refcount -= 1
+        if self._domain_refcount <= 0 and self._domain is not None:
+            domain = self._domain
+            self._domain = None
+            self._domain_refcount = 0
+            await domain.close()
+
+    def acquire(
+        self,
+        domain: salobj.Domain,
+        name: str,
+        index: typing.Optional[int],
+        readonly: bool,
+        include: typing.Optional[typing.Iterable[str]],
+        lazy: bool = False,
+    ) -> typing.Union[salobj.Remote, LazyRemote]:
+        """Get a remote from the pool, creating it if needed.
+
+        Each call must be matched by a call to `release`.
+
+        Parameters
+        ----------
+        domain : `salobj.Domain`
+            Domain of the remote.
+        name : `str`
+            Name of the SAL component.
+        index : `int` or `None`
+            SAL index.
+        readonly : `bool`
+            Is a readonly remote enough?
+        include : `list` [`str`] or `None`
+            Topics needed. `None` means all topics.
+        lazy : `bool`, optional
+            Create a `LazyRemote` if there is no remote to share?
+
+        Returns
+        -------
+        remote : `salobj.Remote` or `LazyRemote`
+            Shared remote. It may be a `LazyRemote` if a lazy remote for the
+            component was already in the pool, even if ``lazy=False``.
+        """
+        _include = None if include is None else frozenset(include)
+
+        candidates = [
+            entry
+            for entry in self._entries
+            if entry.domain is domain and entry.name == name and entry.index == index
+        ]
+
+        entry = next(
+            (entry for entry in candidates if entry.covers(readonly, _include)), None
+        )
+
+        if entry is None:
+            entry = next(
+                (
+                    entry
+                    for entry in candidates
+                    if isinstance(entry.remote, LazyRemote)
+                    and not entry.remote.is_created
+                    and (readonly or not entry.readonly)
+                ),
+                None,
+            )
+            if entry is not None:
+                entry.include = (
+                    None
+                    if entry.include is None or _include is None
+                    else entry.include | _include
+                )
+                typing.cast(LazyRemote, entry.remote).include = (
+                    None if entry.include is None else sorted(entry.include)
+                )
+                self.log.debug(f"Merged include lists for lazy remote {name}:{index}.")
+
+        if entry is None:
+            remote_include = None if _include is None else sorted(_include)
+            remote: typing.Union[salobj.Remote, LazyRemote] = (
+                LazyRemote(
+                    domain=domain,
+                    name=name,
+                    index=index,
+                    readonly=readonly,
+                    include=remote_include,
+                    log=self.log,
+                )
+                if lazy
+                else salobj.Remote(
+                    domain=domain,
+                    name=name,
+                    index=index,
+                    readonly=readonly,
+                    include=remote_include,
+                )
+            )
+            entry = _PoolEntry(
+                domain=domain,
+                name=name,
+                index=index,
+                readonly=readonly,
+                include=_include,
+                remote=remote,
+            )
+            self._entries.append(entry)
+        else:
+            self.log.debug(f"Sharing remote for {name}:{index}.")
+
+        entry.refcount += 1
+
+        return entry.remote
+
+    async def release(self, remote: typing.Any) -> None:
+        """Release a remote obtained with `acquire`, closing it when no
+        longer used.
+
+        Parameters
+        ----------
+        remote : `salobj.Remote` or `LazyRemote`
+            Remote to release.
+
+        Raises
+        ------
+        RuntimeError
+            If the remote is not in the pool.
+        """
+        entry = next((entry for entry in self._entries if entry.matches(remote)), None)
+
+        if entry is None:
+            raise RuntimeError(f"Remote {remote} not in the pool.")
+
+        entry.refcount -= 1
+
+        if entry.refcount <= 0:
+            self._entries.remove(entry)
+            await entry.remote.close()
@@ -0,0 +1,104 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["SlewPlan"]
+
+import enum
+import typing
+from dataclasses import dataclass
+
+from astropy.coordinates import ICRS, Angle
+
+from .enums import RotType
+
+
+@dataclass
+class SlewPlan:
+    """Store everything needed to send a slew to an ICRS target, computed
+    for a given time.
+
+    Plans are created with `BaseTCS.prepare_slew` and used with
+    `BaseTCS.slew_icrs`.
+    """
+
+    radec_icrs: ICRS
+    rot: float
+    rot_type: RotType
+    time_on_target: float
+    rot_angle: Angle
+    rot_frame: enum.IntEnum
+    rot_track_frame: enum.IntEnum
+    rot_angle_alternatives: typing.List[float]
+    az: float
+    el: float
+    dome_az: float
+    tai: float
+    validity: float
+
+    def is_valid(self, tai: float) -> bool:
+        """Can the plan be used at a given time?
+
+        Parameters
+        ----------
+        tai : `float`
+            TAI unix time (sec).
+
+        Returns
+        -------
+        valid : `bool`
+            Is ``tai`` within ``validity`` of the time of the plan?
+        """
+        return abs(tai - self.tai) <= self.validity
+
+    def matches(
+        self,
+        radec_icrs: ICRS,
+        rot: float,
+        rot_type: RotType,
+        time_on_target: float,
+        tolerance: float = 1.0e-6,
+    ) -> bool:
+        """Was the plan computed for a given slew?
+
+        Parameters
+        ----------
+        radec_icrs : `astropy.coordinates.ICRS`
+            Target coordinates.
+        rot : `float`
+            Rotation angle (deg).
+        rot_type : `RotType`
+            Rotation type.
+        time_on_target : `float`
+            Estimated time on target (sec).
+        tolerance : `float`, optional
+            Tolerance on the coordinates and angle (deg).
+
+        Returns
+        -------
+        matches : `bool`
+            Does the plan match the slew?
+        """
+        return bool(
+            self.radec_icrs.separation(radec_icrs).deg <= tolerance
+            and abs(Angle(self.rot - rot, unit="deg").wrap_at("180d").deg) <= tolerance
+            and self.rot_type == rot_type
+            and self.time_on_target == time_on_target
+        )
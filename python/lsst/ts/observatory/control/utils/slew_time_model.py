@@ -0,0 +1,413 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["AxisLimits", "SlewPosition", "SlewTimeModel", "order_by_cost"]
+
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from scipy.optimize import least_squares
+
+
+@dataclass
+class AxisLimits:
+    """Store the kinematic limits of an axis."""
+
+    velocity: float
+    acceleration: float
+
+    def move_time(self, distance: npt.ArrayLike) -> np.ndarray:
+        """Time to move the axis by a distance, with a trapezoidal (or
+        triangular, for short moves) velocity profile.
+
+        Parameters
+        ----------
+        distance : array-like
+            Distance to move (deg).
+
+        Returns
+        -------
+        move_time : `numpy.ndarray`
+            Time to move (sec).
+        """
+        _distance = np.abs(np.asarray(distance, dtype=float))
+        ramp_distance = self.velocity**2 / self.acceleration
+
+        return np.where(
+            _distance < ramp_distance,
+            2.0 * np.sqrt(_distance / self.acceleration),
+            _distance / self.velocity + self.velocity / self.acceleration,
+        )
+
+
+@dataclass
+class SlewPosition:
+    """Store the position of the telescope axes and dome (deg)."""
+
+    az: float
+    el: float
+    rot: float
+    dome_az: float
+
+
+class SlewTimeModel:
+    """Estimate how long it takes to slew between two positions.
+
+    The slew time is the time of the slowest of the azimuth, elevation and
+    rotator axes and the dome azimuth, plus the settle time. The dome is
+    assumed to move to the azimuth of the target. Parameters can be fit
+    from recorded slews, see `add_record` and `fit`.
+
+    Parameters
+    ----------
+    az : `AxisLimits`, optional
+        Azimuth axis limits.
+    el : `AxisLimits`, optional
+        Elevation axis limits.
+    rot : `AxisLimits`, optional
+        Rotator limits.
+    dome : `AxisLimits`, optional
+        Dome azimuth limits.
+    settle_time : `float`, optional
+        Time to settle after the slew (sec).
+    """
+
+    def __init__(
+        self,
+        az: typing.Optional[AxisLimits] = None,
+        el: typing.Optional[AxisLimits] = None,
+        rot: typing.Optional[AxisLimits] = None,
+        dome: typing.Optional[AxisLimits] = None,
+        settle_time: float = 3.0,
+    ) -> None:
+        self.az = AxisLimits(velocity=2.0, acceleration=1.0) if az is None else az
+        self.el = AxisLimits(velocity=2.0, acceleration=1.0) if el is None else el
+        self.rot = AxisLimits(velocity=2.0, acceleration=1.0) if rot is None else rot
+        self.dome = AxisLimits(velocity=1.5, acceleration=0.5) if dome is None else dome
+        self.settle_time = settle_time
+
+        self._records: typing.List[typing.Tuple[float, float, float, float, float]] = []
+
+    def estimate(
+        self,
+        start: SlewPosition,
+        az: npt.ArrayLike,
+        el: npt.ArrayLike,
+        rot: npt.ArrayLike,
+    ) -> np.ndarray:
+        """Estimate the slew time from a position to one or more targets.
+
+        Parameters
+        ----------
+        start : `SlewPosition`
+            Start position.
+        az : array-like
+            Target azimuth (deg).
+        el : array-like
+            Target elevation (deg).
+        rot : array-like
+            Target physical rotator angle (deg).
+
+        Returns
+        -------
+        slew_time : `numpy.ndarray`
+            Estimated slew time(s) (sec).
+        """
+        return self._estimate(
+            *self._get_distances(
+                start.az, start.el, start.rot, start.dome_az, az=az, el=el, rot=rot
+            ),
+            az=self.az,
+            el=self.el,
+            rot=self.rot,
+            dome=self.dome,
+            settle_time=self.settle_time,
+        )
+
+    def get_cost_matrix(
+        self,
+        start: SlewPosition,
+        az: npt.ArrayLike,
+        el: npt.ArrayLike,
+        rot: npt.ArrayLike,
+    ) -> np.ndarray:
+        """Estimate the slew times between all pairs of targets.
+
+        The dome is assumed to be at the azimuth of the previous target.
+
+        Parameters
+        ----------
+        start : `SlewPosition`
+            Current position.
+        az : array-like
+            Azimuth of the targets (deg).
+        el : array-like
+            Elevation of the targets (deg).
+        rot : array-like
+            Physical rotator angle of the targets (deg).
+
+        Returns
+        -------
+        cost : `numpy.ndarray`
+            Slew times (sec), with shape (n+1, n+1) for n targets. Element
+            [i, j] is the time from node i to node j, where node 0 is the
+            current position and node i the target i-1.
+        """
+        _az = np.atleast_1d(np.asarray(az, dtype=float))
+        _el = np.atleast_1d(np.asarray(el, dtype=float))
+        _rot = np.atleast_1d(np.asarray(rot, dtype=float))
+
+        distances = self._get_distances(
+            np.append(start.az, _az)[:, np.newaxis],
+            np.append(start.el, _el)[:, np.newaxis],
+            np.append(start.rot, _rot)[:, np.newaxis],
+            np.append(start.dome_az, _az)[:, np.newaxis],
+            az=np.append(start.az, _az)[np.newaxis, :],
+            el=np.append(start.el, _el)[np.newaxis, :],
+            rot=np.append(start.rot, _rot)[np.newaxis, :],
+        )
+        cost = self._estimate(
+            *distances,
+            az=self.az,
+            el=self.el,
+            rot=self.rot,
+            dome=self.dome,
+            settle_time=self.settle_time,
+        )
+        np.fill_diagonal(cost, 0.0)
+
+        return cost
+
+    def add_record(
+        self, start: SlewPosition, end: SlewPosition, duration: float
+    ) -> None:
+        """Add a recorded slew, to be used by `fit`.
+
+        Parameters
+        ----------
+        start : `SlewPosition`
+            Position before the slew.
+        end : `SlewPosition`
+            Position after the slew.
+        duration : `float`
+            Duration of the slew, including settling (sec).
+        """
+        az_distance, el_distance, rot_distance, dome_distance = self._get_distances(
+            start.az,
+            start.el,
+            start.rot,
+            start.dome_az,
+            az=end.az,
+            el=end.el,
+            rot=end.rot,
+        )
+        self._records.append(
+            (
+                float(az_distance),
+                float(el_distance),
+                float(rot_distance),
+                float(dome_distance),
+                duration,
+            )
+        )
+
+    def clear_records(self) -> None:
+        """Remove all recorded slews."""
+        self._records = []
+
+    @property
+    def n_records(self) -> int:
+        """Number of recorded slews."""
+        return len(self._records)
+
+    def fit(self, min_records: int = 10) -> bool:
+        """Fit the axis limits and the settle time to the recorded slews.
+
+        Parameters
+        ----------
+        min_records : `int`, optional
+            Minimum number of recorded slews needed to fit the model.
+
+        Returns
+        -------
+        fitted : `bool`
+            Was the model fit? If `False` there are not enough records and
+            the parameters are not changed.
+        """
+        if len(self._records) < max(min_records, 9):
+            return False
+
+        records = np.array(self._records)
+        az_distance, el_distance, rot_distance, dome_distance = records[:, :4].T
+        duration = records[:, 4]
+
+        def residuals(params: np.ndarray) -> np.ndarray:
+            return (
+                self._estimate(
+                    az_distance,
+                    el_distance,
+                    rot_distance,
+                    dome_distance,
+                    az=AxisLimits(*params[0:2]),
+                    el=AxisLimits(*params[2:4]),
+                    rot=AxisLimits(*params[4:6]),
+                    dome=AxisLimits(*params[6:8]),
+                    settle_time=params[8],
+                )
+                - duration
+            )
+
+        initial_params = np.array(
+            [
+                self.az.velocity,
+                self.az.acceleration,
+                self.el.velocity,
+                self.el.acceleration,
+                self.rot.velocity,
+                self.rot.acceleration,
+                self.dome.velocity,
+                self.dome.acceleration,
+                self.settle_time,
+            ]
+        )
+        lower_bounds = np.full_like(initial_params, 1.0e-3)
+        lower_bounds[-1] = 0.0
+
+        result = least_squares(
+            residuals,
+            initial_params,
+            bounds=(lower_bounds, np.inf),
+            loss="soft_l1",
+        )
+
+        params = result.x
+        self.az = AxisLimits(*params[0:2])
+        self.el = AxisLimits(*params[2:4])
+        self.rot = AxisLimits(*params[4:6])
+        self.dome = AxisLimits(*params[6:8])
+        self.settle_time = float(params[8])
+
+        return True
+
+    @staticmethod
+    def _get_distances(
+        start_az: npt.ArrayLike,
+        start_el: npt.ArrayLike,
+        start_rot: npt.ArrayLike,
+        start_dome_az: npt.ArrayLike,
+        az: npt.ArrayLike,
+        el: npt.ArrayLike,
+        rot: npt.ArrayLike,
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get the distance traveled by each axis and the dome (deg).
+
+        The start and target positions broadcast against each other.
+        """
+        return (
+            _wrapped_distance(start_az, az),
+            np.abs(np.asarray(el, dtype=float) - np.asarray(start_el, dtype=float)),
+            np.abs(np.asarray(rot, dtype=float) - np.asarray(start_rot, dtype=float)),
+            _wrapped_distance(start_dome_az, az),
+        )
+
+    @staticmethod
+    def _estimate(
+        az_distance: np.ndarray,
+        el_distance: np.ndarray,
+        rot_distance: np.ndarray,
+        dome_distance: np.ndarray,
+        az: AxisLimits,
+        el: AxisLimits,
+        rot: AxisLimits,
+        dome: AxisLimits,
+        settle_time: float,
+    ) -> np.ndarray:
+        """Estimate the slew time from the distances and parameters."""
+        return (
+            np.maximum.reduce(
+                [
+                    az.move_time(az_distance),
+                    el.move_time(el_distance),
+                    rot.move_time(rot_distance),
+                    dome.move_time(dome_distance),
+                ]
+            )
+            + settle_time
+        )
+
+
+def _wrapped_distance(start: npt.ArrayLike, end: npt.ArrayLike) -> np.ndarray:
+    """Shortest angular distance between two azimuths (deg)."""
+    difference = np.asarray(end, dtype=float) - np.asarray(start, dtype=float)
+    return np.abs((difference + 180.0) % 360.0 - 180.0)
+
+
+def order_by_cost(cost: npt.ArrayLike, max_iter: int = 100) -> typing.List[int]:
+    """Find a short path that starts at node 0 and visits all the other
+    nodes once.
+
+    The path is built by always moving to the cheapest unvisited node and
+    then improved by reversing segments (2-opt) while that reduces its
+    total cost.
+
+    Parameters
+    ----------
+    cost : array-like
+        Square matrix with the cost of moving from node i to node j.
+    max_iter : `int`, optional
+        Maximum number of improvement passes.
+
+    Returns
+    -------
+    order : `list` [`int`]
+        Nodes in the order they are visited, excluding node 0.
+    """
+    _cost = np.asarray(cost, dtype=float)
+    n_nodes = _cost.shape[0]
+
+    path = [0]
+    unvisited = set(range(1, n_nodes))
+    while unvisited:
+        current = path[-1]
+        next_node = min(unvisited, key=lambda node: _cost[current, node])
+        path.append(next_node)
+        unvisited.remove(next_node)
+
+    def path_cost(candidate: typing.List[int]) -> float:
+        return float(np.sum(_cost[candidate[:-1], candidate[1:]]))
+
+    best_cost = path_cost(path)
+
+    for _ in range(max_iter):
+        improved = False
+        for i in range(1, n_nodes - 1):
+            for j in range(i + 1, n_nodes):
+                candidate = path[:i] + path[i : j + 1][::-1] + path[j + 1 :]
+                candidate_cost = path_cost(candidate)
+                if candidate_cost < best_cost - 1.0e-9:
+                    path, best_cost = candidate, candidate_cost
+                    improved = True
+        if not improved:
+            break
+
+    return path[1:]
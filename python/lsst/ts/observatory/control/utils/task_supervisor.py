@@ -0,0 +1,276 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TaskSupervisor"]
+
+import asyncio
+import logging
+import time
+import typing
+
+
+class TaskSupervisor:
+    """Supervise a set of named child tasks.
+
+    The supervisor follows the semantics of `asyncio.TaskGroup`: as soon as
+    a child task fails all the other children are cancelled, even if nobody
+    is waiting on them, and no child outlives the supervisor. The failure is
+    raised by the next call to `wait`, or when leaving the context if it was
+    not raised before. Unlike `asyncio.TaskGroup` it allows waiting
+    for a subset of the children with different policies, the exception of
+    the failed child is raised as is (instead of wrapped in an
+    `ExceptionGroup`) and the execution time of each child is recorded.
+
+    Parameters
+    ----------
+    name : `str`, optional
+        Name of the supervisor, used in log messages.
+    log : `logging.Logger`, optional
+        Logger.
+
+    Examples
+    --------
+    >>> async with TaskSupervisor(name="slew") as supervisor:
+    ...     supervisor.create_task(wait_mount(), name="mount")
+    ...     supervisor.create_task(monitor(), name="monitor")
+    ...     await supervisor.wait(
+    ...         ["mount", "monitor"],
+    ...         return_when=TaskSupervisor.FIRST_COMPLETED,
+    ...     )
+    >>> supervisor.timings
+    {'mount': 12.3, 'monitor': 12.3}
+    """
+
+    FIRST_COMPLETED = asyncio.FIRST_COMPLETED
+    FIRST_EXCEPTION = asyncio.FIRST_EXCEPTION
+    ALL_COMPLETED = asyncio.ALL_COMPLETED
+
+    def __init__(self, name: str = "", log: typing.Optional[logging.Logger] = None):
+        self.name = name
+        self.log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+
+        self._tasks: typing.Dict[str, asyncio.Task] = dict()
+        self._start_time: typing.Dict[str, float] = dict()
+        self._end_time: typing.Dict[str, float] = dict()
+        self._failure: typing.Optional[BaseException] = None
+        self._failure_raised = False
+
+    @property
+    def names(self) -> typing.List[str]:
+        """Names of all the child tasks, in creation order."""
+        return list(self._tasks)
+
+    @property
+    def pending(self) -> typing.List[str]:
+        """Names of the child tasks that are not done."""
+        return [name for name, task in self._tasks.items() if not task.done()]
+
+    @property
+    def timings(self) -> typing.Dict[str, float]:
+        """Execution time of the child tasks that are done (sec).
+
+        Cancelled tasks are included with the time until they were
+        cancelled.
+        """
+        return dict(
+            (name, self._end_time[name] - self._start_time[name])
+            for name in self._tasks
+            if name in self._end_time
+        )
+
+    def create_task(self, coro: typing.Awaitable, name: str) -> asyncio.Task:
+        """Create a named child task.
+
+        Parameters
+        ----------
+        coro : ``coroutine``
+            Coroutine to run.
+        name : `str`
+            Name of the task. Must be unique in the supervisor.
+
+        Returns
+        -------
+        task : `asyncio.Task`
+            The child task.
+
+        Raises
+        ------
+        RuntimeError
+            If there is already a task with the same name.
+        """
+        if name in self._tasks:
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise RuntimeError(f"Task {name} already exists in supervisor {self.name}.")
+
+        self._start_time[name] = time.monotonic()
+        task = asyncio.ensure_future(coro)
+        task.add_done_callback(lambda done_task: self._task_done(name, done_task))
+        self._tasks[name] = task
+
+        if self._failure is not None:
+            # A child already failed; do not let new children run.
+            task.cancel()
+
+        return task
+
+    def add_task(self, task: asyncio.Future, name: str) -> asyncio.Future:
+        """Supervise an already created task.
+
+        Parameters
+        ----------
+        task : `asyncio.Future`
+            Task or future to supervise.
+        name : `str`
+            Name of the task. Must be unique in the supervisor.
+
+        Returns
+        -------
+        task : `asyncio.Future`
+            The input task.
+        """
+        return self.create_task(task, name=name)
+
+    def get_task(self, name: str) -> asyncio.Future:
+        """Get a child task by name.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the task.
+
+        Returns
+        -------
+        task : `asyncio.Future`
+            The child task.
+        """
+        return self._tasks[name]
+
+    async def wait(
+        self,
+        names: typing.Optional[typing.Iterable[str]] = None,
+        return_when: str = ALL_COMPLETED,
+        cancel_pending: bool = False,
+    ) -> typing.Dict[str, typing.Any]:
+        """Wait for child tasks.
+
+        If any child task of the supervisor finishes with an exception, all
+        the child tasks are cancelled and awaited, and the exception is
+        raised. A failure therefore always ends the wait, which makes
+        `ALL_COMPLETED` and `FIRST_EXCEPTION` equivalent.
+
+        Parameters
+        ----------
+        names : `list` [`str`], optional
+            Names of the tasks to wait for. If `None` (default) wait for all
+            child tasks.
+        return_when : `str`, optional
+            When to return, one of `FIRST_COMPLETED`, `FIRST_EXCEPTION` or
+            `ALL_COMPLETED` (default).
+        cancel_pending : `bool`, optional
+            Cancel the tasks in ``names`` that are still pending when the
+            wait condition is met? Default `False`.
+
+        Returns
+        -------
+        results : `dict` [`str`, ``object``]
+            Results of the tasks in ``names`` that are done.
+        """
+        names = self.names if names is None else list(names)
+        tasks = [self._tasks[name] for name in names]
+
+        if tasks:
+            await asyncio.wait(
+                tasks,
+                return_when=(
+                    self.FIRST_COMPLETED
+                    if return_when == self.FIRST_COMPLETED
+                    else self.FIRST_EXCEPTION
+                ),
+            )
+
+        if self._failure is not None:
+            await self.cancel()
+            self._failure_raised = True
+            raise self._failure
+
+        if cancel_pending:
+            await self.cancel(
+                [name for name, task in zip(names, tasks) if not task.done()]
+            )
+
+        return dict(
+            (name, task.result())
+            for name, task in zip(names, tasks)
+            if task.done() and not task.cancelled()
+        )
+
+    async def cancel(self, names: typing.Optional[typing.Iterable[str]] = None) -> None:
+        """Cancel child tasks and wait for them to finish.
+
+        Parameters
+        ----------
+        names : `list` [`str`], optional
+            Names of the tasks to cancel. If `None` (default) cancel all
+            child tasks.
+        """
+        names = self.names if names is None else list(names)
+        tasks = [self._tasks[name] for name in names if not self._tasks[name].done()]
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> "TaskSupervisor":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: typing.Optional[typing.Type[BaseException]],
+        *args: typing.Any,
+    ) -> None:
+        await self.cancel()
+
+        if exc_type is None and self._failure is not None and not self._failure_raised:
+            self._failure_raised = True
+            raise self._failure
+
+    def _task_done(self, name: str, task: asyncio.Future) -> None:
+        """Task done callback.
+
+        Record the end time of the task and, if it failed, cancel all the
+        other child tasks.
+        """
+        self._end_time[name] = time.monotonic()
+
+        if task.cancelled() or task.exception() is None or self._failure is not None:
+            return
+
+        self._failure = task.exception()
+        self.log.debug(f"Task {name} failed; cancelling all tasks.")
+        for other_task in self._tasks.values():
+            if not other_task.done():
+                other_task.cancel()
@@ -0,0 +1,251 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TimeService"]
+
+import logging
+import os
+import pathlib
+import shutil
+import typing
+
+import astropy.units as u
+import numpy as np
+import numpy.typing as npt
+from astropy.coordinates import EarthLocation, Longitude
+from astropy.time import Time
+from astropy.utils import data, iers
+from lsst.ts.utils import astropy_time_from_tai_unix
+
+
+class TimeService:
+    """Serve local sidereal time and `astropy.time.Time` objects quickly.
+
+    The mean local sidereal time is computed with astropy on a regular grid
+    covering a night and interpolated for any time in the grid, which
+    avoids the cost of `astropy.time.Time.sidereal_time` (and the IERS table
+    handling behind it) on every call. When a time outside of the grid is
+    requested, only the missing points are computed and added to it, unless
+    the time is more than ``duration`` away, in which case a new grid is
+    computed.
+
+    Parameters
+    ----------
+    location : `astropy.coordinates.EarthLocation`
+        Observatory location.
+    step : `float`, optional
+        Spacing of the grid (sec).
+    duration : `float`, optional
+        Minimum time span covered by the grid (sec).
+    log : `logging.Logger`, optional
+        Logger.
+
+    Notes
+    -----
+    Use `load_iers` to read the IERS table from a local file and stop astropy
+    from trying to download it, which stalls on machines with no network.
+    The file can be updated with `download_iers` on a machine that has
+    network access.
+    """
+
+    def __init__(
+        self,
+        location: EarthLocation,
+        step: float = 60.0,
+        duration: float = 16.0 * 3600.0,
+        log: typing.Optional[logging.Logger] = None,
+    ) -> None:
+        self.location = location
+        self.step = step
+        self.duration = duration
+        self.log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+
+        # Tuple of (TAI, unwrapped mean LST in rad) arrays, replaced as a
+        # whole so readers always see matching arrays.
+        self._grid: typing.Optional[typing.Tuple[np.ndarray, np.ndarray]] = None
+
+    def get_time(self, tai: npt.ArrayLike) -> Time:
+        """Get a time with the observatory location.
+
+        Parameters
+        ----------
+        tai : array-like
+            TAI unix time(s) (sec).
+
+        Returns
+        -------
+        time : `astropy.time.Time`
+            Time(s) with the observatory location.
+        """
+        time = astropy_time_from_tai_unix(tai)
+        time.location = self.location
+        return time
+
+    def get_lst(self, tai: npt.ArrayLike) -> Longitude:
+        """Get the mean local sidereal time.
+
+        Parameters
+        ----------
+        tai : array-like
+            TAI unix time(s) (sec).
+
+        Returns
+        -------
+        lst : `astropy.coordinates.Longitude`
+            Mean local sidereal time(s), in hourangle.
+        """
+        _tai = np.asarray(tai, dtype=float)
+
+        self.prepare(float(np.min(_tai)), float(np.max(_tai)))
+
+        assert self._grid is not None
+        grid_tai, grid_lst = self._grid
+
+        lst = np.interp(_tai, grid_tai, grid_lst)
+
+        return Longitude(lst * u.rad).to(u.hourangle)
+
+    def prepare(self, tai_start: float, tai_end: typing.Optional[float] = None) -> None:
+        """Make sure the grid covers a time range, computing it if needed.
+
+        Parameters
+        ----------
+        tai_start : `float`
+            Start of the time range, TAI unix time (sec).
+        tai_end : `float`, optional
+            End of the time range, TAI unix time (sec). The grid covers at
+            least `duration` from ``tai_start``.
+        """
+        _tai_end = tai_start if tai_end is None else tai_end
+
+        grid = self._grid
+
+        if grid is not None and grid[0][0] <= tai_start and _tai_end <= grid[0][-1]:
+            return
+
+        if (
+            grid is None
+            or tai_start > grid[0][-1] + self.duration
+            or _tai_end < grid[0][0] - self.duration
+        ):
+            grid_start = tai_start - self.step
+            grid_end = max(_tai_end, tai_start + self.duration) + self.step
+            grid_tai = np.arange(grid_start, grid_end + self.step, self.step)
+
+            self.log.debug(
+                f"Computing sidereal time grid with {len(grid_tai)} points, "
+                f"{self.step}s apart."
+            )
+
+            self._grid = (grid_tai, self._compute_lst(grid_tai))
+            return
+
+        # Extend the grid with points on the same spacing.
+        old_tai, old_lst = grid
+
+        num_before = (
+            int(np.ceil((old_tai[0] - tai_start) / self.step)) + 1
+            if tai_start < old_tai[0]
+            else 0
+        )
+        num_after = (
+            int(
+                np.ceil(
+                    (max(_tai_end, tai_start + self.duration) - old_tai[-1]) / self.step
+                )
+            )
+            + 1
+            if _tai_end > old_tai[-1]
+            else 0
+        )
+
+        before_tai = old_tai[0] - self.step * np.arange(num_before, 0, -1)
+        after_tai = old_tai[-1] + self.step * np.arange(1, num_after + 1)
+
+        self.log.debug(
+            f"Extending sidereal time grid with {num_before + num_after} points."
+        )
+
+        new_lst = self._compute_lst(np.concatenate([before_tai, after_tai]))
+
+        self._grid = (
+            np.concatenate([before_tai, old_tai, after_tai]),
+            np.unwrap(
+                np.concatenate([new_lst[:num_before], old_lst, new_lst[num_before:]])
+            ),
+        )
+
+    def clear(self) -> None:
+        """Remove the sidereal time grid."""
+        self._grid = None
+
+    def _compute_lst(self, tai: np.ndarray) -> np.ndarray:
+        """Compute the unwrapped mean local sidereal time (rad) with
+        astropy.
+        """
+        if len(tai) == 0:
+            return np.array([])
+        return np.unwrap(self.get_time(tai).sidereal_time("mean").radian)
+
+    def load_iers(self, path: typing.Union[str, pathlib.Path, None]) -> bool:
+        """Read the IERS table from a local file and disable IERS downloads.
+
+        Parameters
+        ----------
+        path : `str`, `pathlib.Path` or `None`
+            IERS-A file, e.g. written by `download_iers`. If `None` or if the
+            file does not exist, only disable the downloads, in which case
+            astropy uses the IERS-B table bundled with it.
+
+        Returns
+        -------
+        loaded : `bool`
+            Was the table read from ``path``?
+        """
+        iers.conf.auto_download = False
+
+        self.clear()
+
+        if path is None or not os.path.exists(path):
+            self.log.warning(
+                f"IERS file {path} not available; using the bundled IERS-B table."
+            )
+            iers.conf.iers_degraded_accuracy = "warn"
+            return False
+
+        iers.earth_orientation_table.set(iers.IERS_A.open(str(path)))
+        self.log.debug(f"Loaded IERS table from {path}.")
+        return True
+
+    @staticmethod
+    def download_iers(path: typing.Union[str, pathlib.Path]) -> None:
+        """Download the IERS-A table to a local file.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        shutil.copyfile(data.download_file(iers.IERS_A_URL, cache=False), path)
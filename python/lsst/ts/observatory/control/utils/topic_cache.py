@@ -0,0 +1,266 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TopicCache"]
+
+import asyncio
+import logging
+import typing
+
+from lsst.ts.utils import current_tai
+
+
+class TopicCache:
+    """Keep the latest sample of a topic and wake up waiters when it changes.
+
+    A single callback is registered in the topic and any number of
+    coroutines can wait for the next sample or for a condition on the
+    sample to become true, without each of them having to call ``next`` or
+    ``aget`` on the topic.
+
+    Parameters
+    ----------
+    topic : `salobj.topics.ReadTopic`
+        Topic to follow.
+    name : `str`, optional
+        Name used in log and error messages.
+    log : `logging.Logger`, optional
+        Logger.
+
+    Attributes
+    ----------
+    sample : ``object`` or `None`
+        Latest sample received, `None` if no sample was received yet.
+    seq : `int`
+        Sequence number of the latest sample. It is incremented every time a
+        new sample is received and is 0 if no sample was received yet.
+    timestamp : `float` or `None`
+        TAI unix time (in seconds) when the latest sample was received.
+
+    Notes
+    -----
+    Once the cache is registered, the topic has a callback and its ``next``
+    method can no longer be used. The topic must then be read through the
+    cache.
+    """
+
+    def __init__(
+        self,
+        topic: typing.Any,
+        name: str = "",
+        log: typing.Optional[logging.Logger] = None,
+    ) -> None:
+        self.topic = topic
+        self.name = name
+        self.log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+
+        self.sample: typing.Any = None
+        self.seq = 0
+        self.timestamp: typing.Optional[float] = None
+
+        self._listeners: typing.List[typing.Callable[[typing.Any], None]] = []
+        self._previous_callback: typing.Any = None
+        self._changed: typing.Optional[asyncio.Future] = None
+        self._registered = False
+
+    def register(self) -> None:
+        """Register the cache callback in the topic.
+
+        The latest sample already available in the topic (e.g. historical
+        data) is used to seed the cache. If the topic already had a callback
+        it will still be called for every new sample.
+        """
+        if self._registered:
+            return
+
+        self._previous_callback = getattr(self.topic, "callback", None)
+        self.topic.callback = self._update
+        self._registered = True
+
+        if self.sample is None:
+            sample = self.topic.get()
+            if sample is not None:
+                self._set(sample)
+
+    def unregister(self) -> None:
+        """Restore the topic callback and wake up all waiters with an
+        error.
+        """
+        if self._registered:
+            self.topic.callback = self._previous_callback
+            self._registered = False
+
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_exception(
+                RuntimeError(f"Topic cache {self.name} closed.")
+            )
+            # Retrieve exception to avoid "never retrieved" warnings when
+            # there are no waiters.
+            self._changed.exception()
+        self._changed = None
+
+    def add_listener(self, listener: typing.Callable[[typing.Any], None]) -> None:
+        """Add a function to be called with every new sample.
+
+        Parameters
+        ----------
+        listener : ``callable``
+            Synchronous function that receives the new sample.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: typing.Callable[[typing.Any], None]) -> None:
+        """Remove a listener added with `add_listener`.
+
+        Parameters
+        ----------
+        listener : ``callable``
+            Listener to remove.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def aget(self, timeout: typing.Optional[float] = None) -> typing.Any:
+        """Get the latest sample, waiting for one if none was received.
+
+        Parameters
+        ----------
+        timeout : `float`, optional
+            How long to wait for a sample if none was received yet (sec).
+
+        Returns
+        -------
+        sample : ``object``
+            Latest sample.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If no sample is received in `timeout` seconds.
+        """
+        if self.sample is not None:
+            return self.sample
+
+        return await self.next(seq=0, timeout=timeout)
+
+    async def next(
+        self, seq: typing.Optional[int] = None, timeout: typing.Optional[float] = None
+    ) -> typing.Any:
+        """Wait for a sample newer than a given sequence number.
+
+        Parameters
+        ----------
+        seq : `int`, optional
+            Sequence number of the last sample seen by the caller. If `None`
+            (default) wait for the next sample received after the call.
+        timeout : `float`, optional
+            How long to wait (sec).
+
+        Returns
+        -------
+        sample : ``object``
+            Latest sample.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If no new sample is received in `timeout` seconds.
+        """
+        last_seq = self.seq if seq is None else seq
+
+        async def wait_newer() -> typing.Any:
+            while self.seq <= last_seq:
+                await self._wait_change()
+            return self.sample
+
+        return await asyncio.wait_for(wait_newer(), timeout=timeout)
+
+    async def wait_for(
+        self,
+        predicate: typing.Callable[[typing.Any], bool],
+        timeout: typing.Optional[float] = None,
+    ) -> typing.Any:
+        """Wait until the latest sample satisfies a condition.
+
+        Parameters
+        ----------
+        predicate : ``callable``
+            Function that receives a sample and returns `True` when the
+            condition is met.
+        timeout : `float`, optional
+            How long to wait (sec).
+
+        Returns
+        -------
+        sample : ``object``
+            Sample that satisfied the condition.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the condition is not met in `timeout` seconds.
+        """
+
+        async def wait_predicate() -> typing.Any:
+            while self.sample is None or not predicate(self.sample):
+                await self._wait_change()
+            return self.sample
+
+        return await asyncio.wait_for(wait_predicate(), timeout=timeout)
+
+    async def _wait_change(self) -> None:
+        """Wait for the next sample."""
+        if self._changed is None:
+            self._changed = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._changed)
+
+    def _update(self, sample: typing.Any) -> None:
+        """Topic callback."""
+        self._set(sample)
+
+        if self._previous_callback is not None:
+            try:
+                result = self._previous_callback(sample)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception:
+                self.log.exception(f"Error in previous callback for {self.name}.")
+
+    def _set(self, sample: typing.Any) -> None:
+        """Store a new sample, call listeners and wake up waiters."""
+        self.sample = sample
+        self.seq += 1
+        self.timestamp = current_tai()
+
+        for listener in self._listeners:
+            try:
+                listener(sample)
+            except Exception:
+                self.log.exception(f"Error in listener for {self.name}.")
+
+        if self._changed is not None:
+            if not self._changed.done():
+                self._changed.set_result(None)
+            self._changed = None
@@ -0,0 +1,148 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TopicSnapshot"]
+
+import dataclasses
+import types
+import typing
+
+
+@dataclasses.dataclass(frozen=True)
+class TopicSnapshot:
+    """Immutable set of topic samples from several components.
+
+    Parameters
+    ----------
+    timestamp : `float`
+        TAI unix time when the snapshot was completed (sec).
+    samples : `dict` [`str`, `dict` [`str`, ``object``]]
+        Dictionary of component: topic name: sample, for the topics that
+        were retrieved successfully.
+    sample_timestamps : `dict` [`str`, `dict` [`str`, `float`]]
+        Dictionary of component: topic name: TAI unix time of the sample
+        (sec), with the same structure as ``samples``.
+    errors : `dict` [`str`, `dict` [`str`, `BaseException`]]
+        Dictionary of component: topic name: exception, for the topics that
+        could not be retrieved.
+
+    Notes
+    -----
+    The dictionaries are converted to read-only mappings on construction.
+    The samples themselves are the objects returned by the topics and should
+    be treated as read-only.
+    """
+
+    timestamp: float
+    samples: typing.Mapping[str, typing.Mapping[str, typing.Any]]
+    sample_timestamps: typing.Mapping[str, typing.Mapping[str, float]]
+    errors: typing.Mapping[str, typing.Mapping[str, BaseException]]
+
+    def __post_init__(self) -> None:
+        for field in ("samples", "sample_timestamps", "errors"):
+            object.__setattr__(
+                self,
+                field,
+                types.MappingProxyType(
+                    dict(
+                        (component, types.MappingProxyType(dict(topics)))
+                        for component, topics in getattr(self, field).items()
+                    )
+                ),
+            )
+
+    @property
+    def ok(self) -> bool:
+        """Were all the topics retrieved successfully?"""
+        return len(self.errors) == 0
+
+    def get(self, component: str, topic_name: str) -> typing.Any:
+        """Get a sample from the snapshot.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in the group
+            ``components_attr``.
+        topic_name : `str`
+            Name of the topic, e.g. "evt_summaryState".
+
+        Returns
+        -------
+        sample : ``object``
+            Topic sample.
+
+        Raises
+        ------
+        BaseException
+            The exception raised while retrieving the sample, if any.
+        KeyError
+            If the topic is not part of the snapshot.
+        """
+        error = self.errors.get(component, dict()).get(topic_name)
+        if error is not None:
+            raise error
+
+        return self.samples[component][topic_name]
+
+    def age(self, component: str, topic_name: str) -> float:
+        """Get the age of a sample when the snapshot was completed.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        topic_name : `str`
+            Name of the topic.
+
+        Returns
+        -------
+        age : `float`
+            Age of the sample (sec).
+        """
+        return self.timestamp - self.sample_timestamps[component][topic_name]
+
+    def for_topic(
+        self, topic_name: str
+    ) -> typing.Dict[str, typing.Union[typing.Any, BaseException]]:
+        """Get the samples of a topic for all the components in the
+        snapshot.
+
+        Parameters
+        ----------
+        topic_name : `str`
+            Name of the topic.
+
+        Returns
+        -------
+        samples : `dict` [`str`, ``object``]
+            Dictionary of component: sample. If the sample could not be
+            retrieved, the exception is returned instead.
+        """
+        samples: typing.Dict[str, typing.Any] = dict()
+
+        for component in {**self.samples, **self.errors}:
+            if topic_name in self.errors.get(component, dict()):
+                samples[component] = self.errors[component][topic_name]
+            elif topic_name in self.samples.get(component, dict()):
+                samples[component] = self.samples[component][topic_name]
+
+        return samples
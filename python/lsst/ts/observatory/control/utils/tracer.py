@@ -0,0 +1,304 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["Span", "Tracer", "traced"]
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import itertools
+import json
+import pathlib
+import typing
+
+from lsst.ts.utils import current_tai
+
+from .remote_hooks import RemoteHook
+
+# Coroutine methods of the topics that are traced, by topic prefix.
+TRACED_TOPIC_METHODS: typing.Dict[str, typing.Tuple[str, ...]] = {
+    "cmd_": ("start", "set_start"),
+    "evt_": ("next", "aget"),
+    "tel_": ("next", "aget"),
+}
+
+
+@dataclasses.dataclass
+class Span:
+    """Timing information about an operation.
+
+    Attributes
+    ----------
+    span_id : `int`
+        Unique identifier of the span.
+    parent_id : `int` or `None`
+        Identifier of the span that was active when this span started, `None`
+        for top-level spans.
+    name : `str`
+        Name of the operation, e.g. "slew_icrs" or "cmd_start.start".
+    component : `str` or `None`
+        Name of the component the operation acts on, if any.
+    start : `float`
+        TAI unix time when the operation started (sec).
+    end : `float` or `None`
+        TAI unix time when the operation finished (sec), `None` if it is
+        still running.
+    outcome : `str`
+        One of "running", "ok", "timeout", "cancelled" or "error".
+    error : `str` or `None`
+        Description of the exception raised by the operation, if any.
+    """
+
+    span_id: int
+    parent_id: typing.Optional[int]
+    name: str
+    component: typing.Optional[str]
+    start: float
+    end: typing.Optional[float] = None
+    outcome: str = "running"
+    error: typing.Optional[str] = None
+
+    @property
+    def duration(self) -> typing.Optional[float]:
+        """Duration of the operation (sec), `None` if still running."""
+        return None if self.end is None else self.end - self.start
+
+
+class Tracer(RemoteHook):
+    """Record nested timing spans of the operations executed by a group.
+
+    When started, the tracer is registered as a hook of the group remotes
+    and records a span for every ``cmd_*.start``/``cmd_*.set_start`` and
+    ``evt_*.next``/``evt_*.aget`` (and ``tel_*``) call. Spans are stored in
+    a ring buffer and are nested under the span that was active when they
+    started, e.g. the top-level span created by the `traced` decorator for
+    ``slew_icrs``.
+
+    Parameters
+    ----------
+    group : `RemoteGroup`, optional
+        Group to trace. If `None`, only spans created explicitly with `span`
+        are recorded.
+    maxlen : `int`, optional
+        Maximum number of spans to keep. Older spans are discarded.
+
+    Examples
+    --------
+    >>> tracer = Tracer(mtcs)
+    >>> with tracer:
+    ...     await mtcs.slew_icrs(ra=1.0, dec=-30.0)
+    >>> tracer.get_traces()[0]["children"]
+    [{'name': 'cmd_raDecTarget.set_start', 'component': 'mtptg', ...}, ...]
+    """
+
+    call_methods = TRACED_TOPIC_METHODS
+
+    def __init__(self, group: typing.Any = None, maxlen: int = 10000) -> None:
+        self.group = group
+        self.spans: typing.Deque[Span] = collections.deque(maxlen=maxlen)
+
+        self._span_id = itertools.count(1)
+        self._current: contextvars.ContextVar[typing.Optional[Span]] = (
+            contextvars.ContextVar("tracer_current_span", default=None)
+        )
+
+    def start(self) -> None:
+        """Start tracing the group remotes."""
+        if self.group is not None:
+            self.group.add_remote_hook(self)
+
+    def stop(self) -> None:
+        """Stop tracing the group remotes."""
+        if self.group is not None:
+            self.group.remove_remote_hook(self)
+
+    def __enter__(self) -> "Tracer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.stop()
+
+    @contextlib.asynccontextmanager
+    async def span(
+        self, name: str, component: typing.Optional[str] = None
+    ) -> typing.AsyncIterator[Span]:
+        """Record a span for the enclosed block.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the operation.
+        component : `str`, optional
+            Name of the component the operation acts on.
+
+        Yields
+        ------
+        span : `Span`
+            The span being recorded.
+        """
+        parent = self._current.get()
+        span = Span(
+            span_id=next(self._span_id),
+            parent_id=None if parent is None else parent.span_id,
+            name=name,
+            component=component,
+            start=current_tai(),
+        )
+        self.spans.append(span)
+        token = self._current.set(span)
+        try:
+            yield span
+        except asyncio.TimeoutError as e:
+            span.outcome = "timeout"
+            span.error = repr(e)
+            raise
+        except asyncio.CancelledError:
+            span.outcome = "cancelled"
+            raise
+        except BaseException as e:
+            span.outcome = "error"
+            span.error = repr(e)
+            raise
+        else:
+            span.outcome = "ok"
+        finally:
+            span.end = current_tai()
+            self._current.reset(token)
+
+    async def call(
+        self,
+        component: str,
+        topic_name: str,
+        method_name: str,
+        proceed: typing.Callable[..., typing.Awaitable],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        async with self.span(f"{topic_name}.{method_name}", component=component):
+            return await proceed(*args, **kwargs)
+
+    def clear(self) -> None:
+        """Remove all recorded spans."""
+        self.spans.clear()
+
+    def get_traces(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Get the recorded spans as nested traces.
+
+        Spans whose parent was discarded from the ring buffer are returned as
+        top-level spans.
+
+        Returns
+        -------
+        traces : `list` [`dict`]
+            One dictionary per top-level span, with the span fields, its
+            duration and a "children" list with the nested spans.
+        """
+        nodes = dict(
+            (
+                span.span_id,
+                dict(**dataclasses.asdict(span), duration=span.duration, children=[]),
+            )
+            for span in self.spans
+        )
+
+        traces = []
+        for span in self.spans:
+            if span.parent_id in nodes:
+                nodes[span.parent_id]["children"].append(nodes[span.span_id])
+            else:
+                traces.append(nodes[span.span_id])
+
+        return traces
+
+    def to_records(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Get the recorded spans as a flat list of dictionaries.
+
+        Returns
+        -------
+        records : `list` [`dict`]
+            One dictionary per span, with the span fields and its duration.
+        """
+        return [
+            dict(**dataclasses.asdict(span), duration=span.duration)
+            for span in self.spans
+        ]
+
+    def write_json(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Write the recorded spans to a json file, as nested traces.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        with open(path, "w") as fp:
+            json.dump(self.get_traces(), fp, indent=2)
+
+    def write_parquet(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Write the recorded spans to a parquet file, one row per span.
+
+        Requires pandas and a parquet engine (e.g. pyarrow).
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        import pandas
+
+        pandas.DataFrame.from_records(
+            self.to_records(), columns=[*Span.__dataclass_fields__, "duration"]
+        ).to_parquet(path, index=False)
+
+
+def traced(method: typing.Callable) -> typing.Callable:
+    """Decorate a coroutine method of a group to record it as a span.
+
+    The span is only recorded if the group ``tracer`` attribute is set,
+    otherwise the method is executed as is.
+
+    Parameters
+    ----------
+    method : ``coroutine``
+        Method to decorate.
+
+    Returns
+    -------
+    wrapper : ``coroutine``
+        Decorated method.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(
+        self: typing.Any, *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.Any:
+        tracer = getattr(self, "tracer", None)
+        if tracer is None:
+            return await method(self, *args, **kwargs)
+
+        async with tracer.span(method.__name__):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
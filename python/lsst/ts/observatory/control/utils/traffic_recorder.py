@@ -0,0 +1,609 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TrafficRecorder", "TrafficReplay"]
+
+import asyncio
+import collections
+import functools
+import json
+import logging
+import math
+import pathlib
+import types
+import typing
+
+import numpy as np
+from lsst.ts import salobj
+from lsst.ts.utils import current_tai, make_done_future
+
+from .remote_hooks import RemoteHook
+
+# Name of the table with the commands in the recording file.
+COMMANDS_TABLE = "commands"
+
+# Name of the column with the time the sample was received.
+RCV_TAI_COLUMN = "rcv_tai"
+
+
+class TrafficRecorder(RemoteHook):
+    """Record the events and telemetry received by the components of a
+    group and the commands the group sends to them.
+
+    Samples are received by readonly remotes owned by the recorder, so
+    recording does not interfere with the remotes of the group (e.g. by
+    setting topic callbacks). Commands are recorded by registering the
+    recorder as a hook of the group remotes, in the same way as `Tracer`.
+
+    Parameters
+    ----------
+    group : `RemoteGroup`
+        Group to record.
+    components : `list` [`str`], optional
+        Components to record, as they appear in the group
+        ``components_attr``. If `None` (default) record all components.
+    include : `dict` [`str`, `list` [`str`]], optional
+        Topics to record for each component, without prefix, in the format
+        used by the ``include`` argument of `salobj.Remote`. Components not
+        in the dictionary are recorded in full.
+
+    Notes
+    -----
+    The recording is written by `write` to a compressed numpy ``.npz`` file
+    with one array per topic field, named ``<component>/<topic>/<field>``,
+    plus a ``rcv_tai`` column with the TAI time each sample was received.
+    Commands are stored in the ``commands`` table, with the command data
+    stored as json.
+    """
+
+    call_methods = {"cmd_": ("start", "set_start")}
+
+    def __init__(
+        self,
+        group: typing.Any,
+        components: typing.Optional[typing.List[str]] = None,
+        include: typing.Optional[typing.Dict[str, typing.List[str]]] = None,
+    ) -> None:
+        self.group = group
+        self.components = (
+            list(group.components_attr) if components is None else list(components)
+        )
+        self.include = dict() if include is None else include
+        self.log = group.log.getChild(type(self).__name__)
+
+        # Dict of (component, topic): list of (rcv_tai, sample vars).
+        self.samples: typing.Dict[
+            typing.Tuple[str, str],
+            typing.List[typing.Tuple[float, typing.Dict[str, typing.Any]]],
+        ] = collections.defaultdict(list)
+        # List of dicts with component, command, start_tai, end_tai, outcome
+        # and data.
+        self.commands: typing.List[typing.Dict[str, typing.Any]] = []
+
+        self._remotes: typing.Dict[str, salobj.Remote] = dict()
+
+    async def start(self) -> None:
+        """Create the recorder remotes and start recording."""
+        if self._remotes:
+            return
+
+        names = dict(zip(self.group.components_attr, self.group.components))
+
+        for component in self.components:
+            name, index = salobj.name_to_name_index(names[component])
+            self._remotes[component] = salobj.Remote(
+                domain=self.group.domain,
+                name=name,
+                index=index,
+                readonly=True,
+                include=self.include.get(component),
+            )
+
+        await asyncio.gather(*[remote.start_task for remote in self._remotes.values()])
+
+        for component, remote in self._remotes.items():
+            topic_names = [f"evt_{name}" for name in remote.salinfo.event_names] + [
+                f"tel_{name}" for name in remote.salinfo.telemetry_names
+            ]
+            for topic_name in topic_names:
+                topic = getattr(remote, topic_name, None)
+                if topic is not None:
+                    topic.callback = functools.partial(
+                        self._record_sample, component, topic_name
+                    )
+
+        self.group.add_remote_hook(self)
+
+    async def stop(self) -> None:
+        """Stop recording, closing the recorder remotes."""
+        self.group.remove_remote_hook(self)
+
+        await asyncio.gather(*[remote.close() for remote in self._remotes.values()])
+        self._remotes = dict()
+
+    async def __aenter__(self) -> "TrafficRecorder":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.stop()
+
+    def record_command(
+        self,
+        component: str,
+        command: str,
+        start_tai: float,
+        end_tai: float,
+        outcome: str,
+        data: typing.Dict[str, typing.Any],
+    ) -> None:
+        """Record a command sent to a component.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        command : `str`
+            Name of the command, e.g. "cmd_start".
+        start_tai : `float`
+            TAI time when the command was sent (sec).
+        end_tai : `float`
+            TAI time when the command finished (sec).
+        outcome : `str`
+            "ok", or the name of the exception raised by the command.
+        data : `dict`
+            Command parameters.
+        """
+        self.commands.append(
+            dict(
+                component=component,
+                command=command,
+                start_tai=start_tai,
+                end_tai=end_tai,
+                outcome=outcome,
+                data=json.dumps(data, default=str),
+            )
+        )
+
+    async def call(
+        self,
+        component: str,
+        topic_name: str,
+        method_name: str,
+        proceed: typing.Callable[..., typing.Awaitable],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        if component not in self.components:
+            return await proceed(*args, **kwargs)
+
+        data = dict(
+            (key, value)
+            for key, value in kwargs.items()
+            if key not in ("timeout", "wait_done")
+        )
+        start_tai = current_tai()
+        outcome = "ok"
+        try:
+            return await proceed(*args, **kwargs)
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            self.record_command(
+                component=component,
+                command=topic_name,
+                start_tai=start_tai,
+                end_tai=current_tai(),
+                outcome=outcome,
+                data=data,
+            )
+
+    def write(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Write the recording to a compressed numpy file.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        # Values are typed Any because the numpy stubs match the keyword
+        # arguments of savez_compressed against allow_pickle too.
+        arrays: typing.Dict[str, typing.Any] = dict()
+
+        for (component, topic_name), rows in self.samples.items():
+            if not rows:
+                continue
+            prefix = f"{component}/{topic_name}"
+            arrays[f"{prefix}/{RCV_TAI_COLUMN}"] = np.array([rcv for rcv, _ in rows])
+            for field in rows[0][1]:
+                arrays[f"{prefix}/{field}"] = np.array(
+                    [sample_vars[field] for _, sample_vars in rows]
+                )
+
+        for field in (
+            "component",
+            "command",
+            "start_tai",
+            "end_tai",
+            "outcome",
+            "data",
+        ):
+            arrays[f"{COMMANDS_TABLE}/{field}"] = np.array(
+                [command[field] for command in self.commands]
+            )
+
+        np.savez_compressed(path, **arrays)
+
+    def _record_sample(
+        self, component: str, topic_name: str, sample: typing.Any
+    ) -> None:
+        """Topic callback."""
+        self.samples[(component, topic_name)].append((current_tai(), sample.get_vars()))
+
+
+class TrafficReplay:
+    """Replay a recording made with `TrafficRecorder` in place of the
+    remotes of a group.
+
+    The remotes of the recorded components are replaced by stand-ins (as
+    `RemoteGroupAsyncMock` does with mocks) whose topics re-emit the recorded
+    samples with the recorded timing, scaled by ``speed``. Commands complete
+    after the duration they took when recorded (also scaled), and return
+    immediately if they were not recorded.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`
+        Recording file.
+    speed : `float`, optional
+        Replay speed factor; 1 is real time, `math.inf` emits all samples as
+        fast as possible.
+    log : `logging.Logger`, optional
+        Logger.
+
+    Notes
+    -----
+    Replay is open loop: the emitted samples do not depend on the commands
+    sent by the group. It is meant for benchmarking the processing of the
+    group methods against realistic message timing, not for testing their
+    logic against different scenarios.
+    """
+
+    def __init__(
+        self,
+        path: typing.Union[str, pathlib.Path],
+        speed: float = 1.0,
+        log: typing.Optional[logging.Logger] = None,
+    ) -> None:
+        self.speed = speed
+        self.log = (
+            logging.getLogger(type(self).__name__)
+            if log is None
+            else log.getChild(type(self).__name__)
+        )
+
+        # Dict of (component, topic): dict of column: array.
+        self.tables: typing.Dict[
+            typing.Tuple[str, str], typing.Dict[str, np.ndarray]
+        ] = collections.defaultdict(dict)
+        commands: typing.Dict[str, np.ndarray] = dict()
+
+        with np.load(path) as recording:
+            for key in recording.files:
+                table, column = key.rsplit("/", maxsplit=1)
+                if table == COMMANDS_TABLE:
+                    commands[column] = recording[key]
+                else:
+                    component, topic_name = table.split("/", maxsplit=1)
+                    self.tables[(component, topic_name)][column] = recording[key]
+
+        # Dict of (component, command): durations in the recorded order.
+        self.command_durations: typing.Dict[
+            typing.Tuple[str, str], typing.Deque[float]
+        ] = collections.defaultdict(collections.deque)
+        for component, command, start_tai, end_tai in zip(
+            commands.get("component", []),
+            commands.get("command", []),
+            commands.get("start_tai", []),
+            commands.get("end_tai", []),
+        ):
+            self.command_durations[(str(component), str(command))].append(
+                float(end_tai - start_tai)
+            )
+
+        self.remotes: typing.Dict[str, _ReplayRemote] = dict()
+        self._original_remotes: typing.Dict[str, typing.Any] = dict()
+        self._task: typing.Optional[asyncio.Task] = None
+        self._group: typing.Any = None
+
+    @property
+    def components(self) -> typing.List[str]:
+        """Components in the recording."""
+        return sorted({component for component, _ in self.tables})
+
+    def install(self, group: typing.Any) -> None:
+        """Replace the remotes of the recorded components in a group.
+
+        Parameters
+        ----------
+        group : `RemoteGroup`
+            Group to replay the recording to.
+        """
+        self._group = group
+
+        for component in self.components:
+            if component not in group.components_attr:
+                continue
+            self.remotes[component] = _ReplayRemote(component=component, replay=self)
+            self._original_remotes[component] = group.rem.get_remote(component)
+            setattr(group.rem, component, self.remotes[component])
+
+    def uninstall(self) -> None:
+        """Restore the group remotes."""
+        for component, remote in self._original_remotes.items():
+            setattr(self._group.rem, component, remote)
+        self._original_remotes = dict()
+        self.remotes = dict()
+
+    def start(self) -> None:
+        """Start emitting the recorded samples."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._emit())
+
+    async def stop(self) -> None:
+        """Stop emitting samples."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_done(self) -> None:
+        """Wait until all the recorded samples are emitted."""
+        if self._task is not None:
+            await self._task
+
+    async def __aenter__(self) -> "TrafficReplay":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.stop()
+
+    async def wait_command(self, component: str, command: str) -> None:
+        """Wait for the recorded duration of the next execution of a
+        command.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        command : `str`
+            Name of the command, e.g. "cmd_start".
+        """
+        durations = self.command_durations.get((component, command))
+        if durations and math.isfinite(self.speed):
+            await asyncio.sleep(durations.popleft() / self.speed)
+        else:
+            await asyncio.sleep(0)
+
+    def get_sample(self, component: str, topic_name: str, row: int) -> typing.Any:
+        """Get a recorded sample.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        topic_name : `str`
+            Name of the topic.
+        row : `int`
+            Index of the sample.
+
+        Returns
+        -------
+        sample : `types.SimpleNamespace`
+            Sample with the recorded fields.
+        """
+        table = self.tables[(component, topic_name)]
+        return types.SimpleNamespace(
+            **dict(
+                (column, values[row].tolist())
+                for column, values in table.items()
+                if column != RCV_TAI_COLUMN
+            )
+        )
+
+    async def _emit(self) -> None:
+        """Emit the recorded samples with the recorded timing."""
+        events = sorted(
+            (float(rcv_tai), component, topic_name, row)
+            for (component, topic_name), table in self.tables.items()
+            if component in self.remotes
+            for row, rcv_tai in enumerate(table[RCV_TAI_COLUMN])
+        )
+
+        if not events:
+            return
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        first_tai = events[0][0]
+
+        for rcv_tai, component, topic_name, row in events:
+            if math.isfinite(self.speed):
+                delay = start_time + (rcv_tai - first_tai) / self.speed - loop.time()
+                await asyncio.sleep(max(delay, 0.0))
+            else:
+                await asyncio.sleep(0)
+            self.remotes[component].get_topic(topic_name).put(
+                self.get_sample(component, topic_name, row)
+            )
+
+
+class _ReplayRemote:
+    """Stand-in for a remote that replays recorded samples.
+
+    Parameters
+    ----------
+    component : `str`
+        Name of the component.
+    replay : `TrafficReplay`
+        Replay the remote belongs to.
+    """
+
+    def __init__(self, component: str, replay: TrafficReplay) -> None:
+        self._component = component
+        self._replay = replay
+        self._topics: typing.Dict[str, _ReplayTopic] = dict()
+        self._commands: typing.Dict[str, _ReplayCommand] = dict()
+        self.start_task = make_done_future()
+
+    def get_topic(self, topic_name: str) -> "_ReplayTopic":
+        """Get the stand-in for a topic, creating it if needed."""
+        if topic_name not in self._topics:
+            self._topics[topic_name] = _ReplayTopic(
+                columns=list(
+                    self._replay.tables.get((self._component, topic_name), dict())
+                )
+            )
+        return self._topics[topic_name]
+
+    async def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith(("evt_", "tel_")):
+            return self.get_topic(name)
+        if name.startswith("cmd_"):
+            if name not in self._commands:
+                self._commands[name] = _ReplayCommand(
+                    component=self._component, command_name=name, replay=self._replay
+                )
+            return self._commands[name]
+        raise AttributeError(name)
+
+
+class _ReplayTopic:
+    """Stand-in for a read topic fed by `TrafficReplay`.
+
+    Parameters
+    ----------
+    columns : `list` [`str`]
+        Recorded fields of the topic.
+    """
+
+    def __init__(self, columns: typing.List[str]) -> None:
+        self._columns = [column for column in columns if column != RCV_TAI_COLUMN]
+        self._latest: typing.Any = None
+        self._queue: typing.Deque[typing.Any] = collections.deque()
+        self._new_data = asyncio.Event()
+        self.callback: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None
+
+    def DataType(self) -> types.SimpleNamespace:
+        return types.SimpleNamespace(**dict((column, None) for column in self._columns))
+
+    def put(self, sample: typing.Any) -> None:
+        """Add a new sample."""
+        self._latest = sample
+        if self.callback is not None:
+            result = self.callback(sample)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        else:
+            self._queue.append(sample)
+        self._new_data.set()
+
+    def get(self) -> typing.Any:
+        return self._latest
+
+    def flush(self) -> None:
+        self._queue.clear()
+
+    async def aget(self, timeout: typing.Optional[float] = None) -> typing.Any:
+        if self._latest is not None:
+            return self._latest
+        return await self.next(flush=False, timeout=timeout)
+
+    async def next(
+        self, *, flush: bool, timeout: typing.Optional[float] = None
+    ) -> typing.Any:
+        if flush:
+            self.flush()
+
+        async def wait_sample() -> typing.Any:
+            while not self._queue:
+                self._new_data.clear()
+                await self._new_data.wait()
+            return self._queue.popleft()
+
+        return await asyncio.wait_for(wait_sample(), timeout=timeout)
+
+
+class _ReplayCommand:
+    """Stand-in for a remote command that completes after the recorded
+    duration.
+
+    Parameters
+    ----------
+    component : `str`
+        Name of the component.
+    command_name : `str`
+        Name of the command.
+    replay : `TrafficReplay`
+        Replay the command belongs to.
+    """
+
+    def __init__(self, component: str, command_name: str, replay: TrafficReplay):
+        self._component = component
+        self._command_name = command_name
+        self._replay = replay
+        self.data = types.SimpleNamespace()
+
+    def DataType(self) -> types.SimpleNamespace:
+        return types.SimpleNamespace()
+
+    def set(self, **kwargs: typing.Any) -> bool:
+        for key, value in kwargs.items():
+            setattr(self.data, key, value)
+        return True
+
+    async def start(
+        self,
+        data: typing.Any = None,
+        timeout: typing.Optional[float] = None,
+        wait_done: bool = True,
+    ) -> types.SimpleNamespace:
+        await asyncio.wait_for(
+            self._replay.wait_command(self._component, self._command_name),
+            timeout=timeout,
+        )
+        return types.SimpleNamespace(
+            ack=salobj.SalRetCode.CMD_COMPLETE, error=0, result="Replayed."
+        )
+
+    async def set_start(
+        self, timeout: typing.Optional[float] = None, **kwargs: typing.Any
+    ) -> types.SimpleNamespace:
+        self.set(**kwargs)
+        return await self.start(timeout=timeout)
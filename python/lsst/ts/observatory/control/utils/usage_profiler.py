@@ -0,0 +1,297 @@
+# This file is part of ts_observatory_control.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["UsageProfiler"]
+
+import asyncio
+import contextlib
+import contextvars
+import json
+import pathlib
+import sys
+import typing
+
+from .remote_hooks import RemoteHook
+
+
+class UsageProfiler(RemoteHook):
+    """Record which topics of the remotes in a group are used by each
+    method of the group.
+
+    The profiler is registered as a hook of the group remotes and records
+    every access to a ``cmd_*``, ``evt_*`` or ``tel_*`` attribute. Accesses
+    are recorded under a label, which is either set explicitly with
+    `profile` or, by default, the name of the outermost method of the group
+    in the call stack. While the profiler runs, tasks inherit the label of
+    the code that created them (the profiler installs a task factory in the
+    event loop), so the topics used by tasks created by a method, e.g. the
+    state and position checks started by ``slew_icrs``, are recorded under
+    the method name. It is meant to be used in a "profiling" run, e.g.
+    against the async mocks, to generate the minimum list of topics each
+    operation needs.
+
+    Parameters
+    ----------
+    group : `RemoteGroup`
+        Group to profile.
+
+    Examples
+    --------
+    >>> profiler = UsageProfiler(mtcs)
+    >>> with profiler:
+    ...     await mtcs.slew_icrs(ra=1.0, dec=-30.0)
+    >>> profiler.get_include("slew_icrs")
+    {'mtmount': ['summaryState', ...], 'mtptg': ['raDecTarget', ...], ...}
+    """
+
+    def __init__(self, group: typing.Any) -> None:
+        self.group = group
+
+        # Dict of label: dict of component: set of topics (with prefix).
+        self.topics: typing.Dict[str, typing.Dict[str, typing.Set[str]]] = dict()
+
+        self._label: contextvars.ContextVar[typing.Optional[str]] = (
+            contextvars.ContextVar("usage_profiler_label", default=None)
+        )
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._previous_task_factory: typing.Any = None
+
+    def start(self) -> None:
+        """Start recording the topic accesses of the group."""
+        self.group.add_remote_hook(self)
+
+        if self._loop is not None:
+            return
+
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop; labels of new tasks cannot be propagated.
+            return
+
+        self._previous_task_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+
+    def stop(self) -> None:
+        """Stop recording the topic accesses of the group."""
+        self.group.remove_remote_hook(self)
+
+        if self._loop is not None:
+            if self._loop.get_task_factory() == self._task_factory:
+                self._loop.set_task_factory(self._previous_task_factory)
+            self._loop = None
+            self._previous_task_factory = None
+
+    def __enter__(self) -> "UsageProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.stop()
+
+    @contextlib.contextmanager
+    def profile(self, label: str) -> typing.Iterator[None]:
+        """Record topic accesses under a given label.
+
+        Parameters
+        ----------
+        label : `str`
+            Label to record accesses under, e.g. the name of an operation.
+        """
+        token = self._label.set(label)
+        try:
+            yield
+        finally:
+            self._label.reset(token)
+
+    def record(self, component: str, topic: str) -> None:
+        """Record that a topic of a component was accessed.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component, as it appears in the group
+            ``components_attr``.
+        topic : `str`
+            Name of the topic attribute, e.g. "cmd_start".
+        """
+        label = self._label.get()
+        if label is None:
+            label = self._get_caller_label()
+
+        self.topics.setdefault(label, dict()).setdefault(component, set()).add(topic)
+
+    def on_topic_access(self, component: str, topic_name: str) -> None:
+        self.record(component, topic_name)
+
+    def get_include(
+        self, labels: typing.Union[None, str, typing.Iterable[str]] = None
+    ) -> typing.Dict[str, typing.List[str]]:
+        """Get the list of topics to include for each component.
+
+        Parameters
+        ----------
+        labels : `str` or `list` of `str`, optional
+            Labels to combine. If `None` (default) combine all labels.
+
+        Returns
+        -------
+        include : `dict` [`str`, `list` [`str`]]
+            Dictionary with component name and sorted list of topic names
+            without prefix, in the format used by the ``include`` argument of
+            `salobj.Remote` and by `UsagesResources`.
+        """
+        if labels is None:
+            labels = list(self.topics)
+        elif isinstance(labels, str):
+            labels = [labels]
+
+        include: typing.Dict[str, typing.Set[str]] = dict()
+
+        for label in labels:
+            for component, topics in self.topics.get(label, dict()).items():
+                include.setdefault(component, set()).update(
+                    topic.split("_", maxsplit=1)[1] for topic in topics
+                )
+
+        return dict(
+            (component, sorted(topics)) for component, topics in include.items()
+        )
+
+    def uses_commands(
+        self,
+        component: str,
+        labels: typing.Union[None, str, typing.Iterable[str]] = None,
+    ) -> bool:
+        """Check whether any command of a component was accessed.
+
+        Parameters
+        ----------
+        component : `str`
+            Name of the component.
+        labels : `str` or `list` of `str`, optional
+            Labels to check. If `None` (default) check all labels.
+
+        Returns
+        -------
+        `bool`
+            `True` if at least one command was accessed.
+        """
+        if labels is None:
+            labels = list(self.topics)
+        elif isinstance(labels, str):
+            labels = [labels]
+
+        return any(
+            topic.startswith("cmd_")
+            for label in labels
+            for topic in self.topics.get(label, dict()).get(component, set())
+        )
+
+    def to_dict(self) -> typing.Dict[str, typing.Dict[str, typing.List[str]]]:
+        """Return the recorded profile as a dictionary.
+
+        Returns
+        -------
+        profile : `dict`
+            Dictionary of label: component: sorted list of topics.
+        """
+        return dict(
+            (
+                label,
+                dict(
+                    (component, sorted(topics))
+                    for component, topics in components.items()
+                ),
+            )
+            for label, components in self.topics.items()
+        )
+
+    def write(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Write the recorded profile to a json file.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        with open(path, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=2, sort_keys=True)
+
+    def read(self, path: typing.Union[str, pathlib.Path]) -> None:
+        """Read a profile written with `write`, merging it with the recorded
+        profile.
+
+        Parameters
+        ----------
+        path : `str` or `pathlib.Path`
+            File name.
+        """
+        with open(path) as fp:
+            profile = json.load(fp)
+
+        for label, components in profile.items():
+            for component, topics in components.items():
+                self.topics.setdefault(label, dict()).setdefault(
+                    component, set()
+                ).update(topics)
+
+    def _task_factory(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: typing.Union[
+            typing.Coroutine[typing.Any, typing.Any, typing.Any],
+            typing.Generator[typing.Any, None, typing.Any],
+        ],
+        **kwargs: typing.Any,
+    ) -> "asyncio.Future[typing.Any]":
+        """Create a task whose context holds the label of the code creating
+        it.
+
+        Context variables are copied into new tasks, but the call stack is
+        not, so the label is resolved at creation time, while the method
+        creating the task is still in the stack.
+        """
+        context = kwargs.pop("context", None)
+        if context is None:
+            context = contextvars.copy_context()
+
+        if context.get(self._label) is None:
+            label = self._get_caller_label()
+            if label != "unknown":
+                context.run(self._label.set, label)
+
+        if self._previous_task_factory is not None:
+            return self._previous_task_factory(loop, coro, context=context, **kwargs)
+
+        return asyncio.Task(coro, loop=loop, context=context, **kwargs)
+
+    def _get_caller_label(self) -> str:
+        """Get the name of the outermost method of the group in the call
+        stack.
+        """
+        label = "unknown"
+        frame = sys._getframe(2)
+        while frame is not None:
+            if frame.f_locals.get("self") is self.group:
+                label = frame.f_code.co_name
+            frame = frame.f_back  # type: ignore[assignment]
+        return label
@@ -24,6 +24,7 @@ __all__ = [
     "get_catalogs_path",
     "get_data_path",
     "cast_int_or_str",
+    "NoTargetError",
 ]
 
 import pathlib
@@ -134,3 +135,11 @@ def cast_int_or_str(value: typing.Any) -> typing.Union[int, str]:
         Recasted value.
     """
     return int(value) if isinstance(value, int) else str(value)
+
+
+class NoTargetError(RuntimeError):
+    """Raised when a target search completes and finds no target matching
+    the search criteria, as opposed to a search that fails.
+    """
+
+    pass
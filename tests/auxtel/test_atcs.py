@@ -21,6 +21,8 @@
 import asyncio
 import copy
 import logging
+import pathlib
+import tempfile
 import typing
 import unittest
 import unittest.mock
@@ -33,7 +35,7 @@ from astropy.coordinates import Angle
 from astroquery.simbad import Simbad
 from lsst.ts import salobj
 from lsst.ts.observatory.control.mock.atcs_async_mock import ATCSAsyncMock
-from lsst.ts.observatory.control.utils import RotType
+from lsst.ts.observatory.control.utils import NoTargetError, RotType
 from lsst.ts.xml.enums import ATDome, ATPneumatics
 
 
@@ -100,6 +102,52 @@ class TestATTCS(ATCSAsyncMock):
 
         assert len(self.atcs._object_list) == 0
 
+    async def test_object_list_aget_name_resolver_cache(self) -> None:
+        name = "Fake star for name resolver cache test"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            name_resolver_cache = self.atcs.enable_name_resolver_cache(
+                path=pathlib.Path(tmp_dir) / "name_resolver.sqlite"
+            )
+            name_resolver_cache.seed([(name, 30.0, -60.0)])
+
+            try:
+                radec_icrs = await self.atcs.object_list_aget(name)
+            finally:
+                self.atcs.name_resolver_cache = None
+                self.atcs.object_list_clear()
+
+        assert radec_icrs.ra.deg == pytest.approx(30.0)
+        assert radec_icrs.dec.deg == pytest.approx(-60.0)
+
+    async def test_object_list_aget_catalog_before_name_resolver_cache(
+        self,
+    ) -> None:
+        self.atcs.clear_catalog()
+        self.atcs.load_catalog("hd_catalog_6th_mag")
+        name = str(self.atcs._catalog["MAIN_ID"][0])
+        other_name = str(self.atcs._catalog["MAIN_ID"][1])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            name_resolver_cache = self.atcs.enable_name_resolver_cache(
+                path=pathlib.Path(tmp_dir) / "name_resolver.sqlite"
+            )
+            name_resolver_cache.seed([(name, 30.0, -60.0)])
+
+            try:
+                radec_icrs = await self.atcs.object_list_aget(name)
+                await self.atcs.object_list_aget(other_name)
+
+                # Catalog objects are not stored in the shared cache.
+                assert name_resolver_cache.get(other_name) is None
+            finally:
+                self.atcs.name_resolver_cache = None
+                self.atcs.object_list_clear()
+                self.atcs.clear_catalog()
+
+        assert radec_icrs.ra.deg != pytest.approx(30.0)
+        assert radec_icrs.dec.deg != pytest.approx(-60.0)
+
     def test_list_available_catalogs(self) -> None:
         available_catalogs = self.atcs.list_available_catalogs()
 
@@ -208,6 +256,103 @@ class TestATTCS(ATCSAsyncMock):
 
         self.atcs.object_list_clear()
 
+    async def test_find_target_concurrent_sources(self) -> None:
+        async def find_target_slow(**kwargs: typing.Any) -> str:
+            await asyncio.sleep(0.5)
+            return "slow"
+
+        find_target_no_target = unittest.mock.AsyncMock(
+            side_effect=NoTargetError("No target.")
+        )
+        find_target_fast = unittest.mock.AsyncMock(return_value="fast")
+
+        with unittest.mock.patch.object(
+            self.atcs, "find_target_local_catalog", find_target_slow
+        ), unittest.mock.patch.object(
+            self.atcs, "find_target_simbad", find_target_fast
+        ):
+            # Higher priority source within the latency budget.
+            name = await self.atcs.find_target(
+                az=-180.0,
+                el=30.0,
+                mag_limit=4.0,
+                sources=["local_catalog", "simbad"],
+                latency_budget=5.0,
+            )
+            assert name == "slow"
+
+            # Higher priority source too slow for the latency budget.
+            name = await self.atcs.find_target(
+                az=-180.0,
+                el=30.0,
+                mag_limit=4.0,
+                sources=["local_catalog", "simbad"],
+                latency_budget=0.1,
+            )
+            assert name == "fast"
+
+        with unittest.mock.patch.object(
+            self.atcs, "find_target_local_catalog", find_target_no_target
+        ), unittest.mock.patch.object(
+            self.atcs, "find_target_simbad", find_target_fast
+        ):
+            for _ in range(2):
+                name = await self.atcs.find_target(
+                    az=-180.0,
+                    el=30.0,
+                    mag_limit=4.0,
+                    sources=["local_catalog", "simbad"],
+                )
+                assert name == "fast"
+
+            # Local catalog has no target in the region, so it is searched
+            # only once.
+            find_target_no_target.assert_awaited_once()
+
+            # A search outside of the region, or for a wider magnitude range,
+            # is not skipped.
+            await self.atcs.find_target(
+                az=-179.0,
+                el=30.0,
+                mag_limit=4.0,
+                sources=["local_catalog", "simbad"],
+            )
+            await self.atcs.find_target(
+                az=-180.0,
+                el=30.0,
+                mag_limit=4.0,
+                mag_range=3.0,
+                sources=["local_catalog", "simbad"],
+            )
+            assert find_target_no_target.await_count == 3
+
+            # Failed searches are not remembered.
+            self.atcs.clear_find_target_negative_cache()
+            find_target_no_target.reset_mock()
+            find_target_no_target.side_effect = RuntimeError("Query failed.")
+
+            for _ in range(2):
+                await self.atcs.find_target(
+                    az=-180.0,
+                    el=30.0,
+                    mag_limit=4.0,
+                    sources=["local_catalog", "simbad"],
+                )
+
+            assert find_target_no_target.await_count == 2
+
+            self.atcs.clear_find_target_negative_cache()
+            find_target_fast.return_value = None
+            find_target_fast.side_effect = RuntimeError("No target.")
+
+            with pytest.raises(RuntimeError):
+                await self.atcs.find_target(
+                    az=-180.0,
+                    el=30.0,
+                    mag_limit=4.0,
+                    sources=["local_catalog", "simbad"],
+                )
+
     async def test_slew_dome_to_check_false(self) -> None:
         az = 45.0
         self.atcs.check.atdome = False
@@ -20,17 +20,19 @@
 
 import asyncio
 import copy
+import functools
 import logging
+import types
 import typing
 import unittest.mock
 
 import astropy.units as units
 import numpy as np
 import pytest
-from astropy.coordinates import Angle
+from astropy.coordinates import ICRS, Angle
 from lsst.ts import salobj, utils, xml
 from lsst.ts.observatory.control.mock.mtcs_async_mock import MTCSAsyncMock
-from lsst.ts.observatory.control.utils import RotType
+from lsst.ts.observatory.control.utils import RotType, SlewPosition
 from lsst.ts.xml.enums import MTM1M3, MTM2, MTDome, MTMount, MTRotator
 
 
@@ -70,6 +72,101 @@ class TestMTCS(MTCSAsyncMock):
         assert el == pytest.approx(azel.alt.value, abs=5e-6)
         assert pa.value == pytest.approx(3.1269, abs=5e-2)
 
+    async def test_coord_facility_batch(self) -> None:
+        az = np.array([0.0, 90.0, 180.0, 270.0])
+        el = np.array([75.0, 60.0, 45.0, 30.0])
+
+        obs_time = utils.astropy_time_from_tai_unix(utils.current_tai() + 60.0)
+
+        radec = self.mtcs.radec_from_azel_batch(az=az, el=el, time=obs_time)
+
+        azel = self.mtcs.azel_from_radec_batch(
+            ra=radec.ra, dec=radec.dec, time=obs_time
+        )
+
+        pa = self.mtcs.parallactic_angle_batch(
+            ra=radec.ra, dec=radec.dec, time=obs_time
+        )
+
+        assert azel.shape == az.shape
+        assert pa.shape == az.shape
+
+        for i in range(len(az)):
+            utils.assert_angles_almost_equal(az[i], azel.az[i], max_diff=5e-5)
+            assert el[i] == pytest.approx(azel.alt[i].value, abs=5e-6)
+            assert pa[i].value == pytest.approx(
+                self.mtcs.parallactic_angle(
+                    ra=radec.ra[i], dec=radec.dec[i], time=obs_time
+                ).value
+            )
+
+        # A single target over an array of times.
+        obs_times = utils.astropy_time_from_tai_unix(
+            utils.current_tai() + np.arange(0.0, 3600.0, 600.0)
+        )
+
+        azel = self.mtcs.azel_from_radec_batch(
+            ra=radec.ra[0], dec=radec.dec[0], time=obs_times
+        )
+
+        assert azel.shape == obs_times.shape
+
+    async def test_order_targets(self) -> None:
+        start = SlewPosition(az=0.0, el=60.0, rot=0.0, dome_az=0.0)
+        ra = np.array([0.0, 6.0, 12.0, 18.0, 0.1])
+        dec = np.array([-30.0, -60.0, -30.0, -60.0, -31.0])
+
+        slew_time = await self.mtcs.estimate_slew_time(
+            ra=ra[0], dec=dec[0], start=start
+        )
+        order = await self.mtcs.order_targets(ra=ra, dec=dec, start=start)
+
+        assert slew_time >= self.mtcs.slew_time_model.settle_time
+        assert sorted(order) == list(range(len(ra)))
+        # Targets 0 and 4 are next to each other.
+        assert abs(order.index(0) - order.index(4)) == 1
+
+    async def test_coordinate_engine(self) -> None:
+        az = np.array([0.0, 90.0, 180.0, 270.0])
+        el = np.array([75.0, 60.0, 45.0, 30.0])
+
+        obs_time = utils.astropy_time_from_tai_unix(utils.current_tai() + 60.0)
+
+        radec = self.mtcs.radec_from_azel_batch(az=az, el=el, time=obs_time)
+        azel = self.mtcs.azel_from_radec_batch(
+            ra=radec.ra, dec=radec.dec, time=obs_time
+        )
+        pa = self.mtcs.parallactic_angle_batch(
+            ra=radec.ra, dec=radec.dec, time=obs_time
+        )
+
+        coordinate_engine = self.mtcs.enable_coordinate_engine(max_error=1.0)
+
+        try:
+            assert coordinate_engine.get_error(obs_time.unix_tai) < 1.0
+            assert coordinate_engine.validate(obs_time.unix_tai, seed=42) < 1.0
+
+            radec_engine = self.mtcs.radec_from_azel_batch(az=az, el=el, time=obs_time)
+            azel_engine = self.mtcs.azel_from_radec_batch(
+                ra=radec.ra, dec=radec.dec, time=obs_time
+            )
+            pa_engine = self.mtcs.parallactic_angle_batch(
+                ra=radec.ra, dec=radec.dec, time=obs_time
+            )
+            azel_engine_scalar = self.mtcs.azel_from_radec(
+                ra=radec.ra[0], dec=radec.dec[0], time=obs_time
+            )
+        finally:
+            self.mtcs.disable_coordinate_engine()
+
+        assert np.all(radec.separation(radec_engine).arcsec < 1.0)
+        assert np.all(azel.separation(azel_engine).arcsec < 1.0)
+        assert azel.separation(azel_engine_scalar)[0].arcsec < 1.0
+        # The engine computes the parallactic angle with the same formula,
+        # so the rotator angles do not change when it is enabled.
+        pa_diff = (pa_engine.deg - pa.deg + 180.0) % 360.0 - 180.0
+        assert np.all(np.abs(pa_diff) < 1.0e-6)
+
     async def test_set_azel_slew_checks(self) -> None:
         original_check = copy.copy(self.mtcs.check)
 
@@ -339,6 +436,149 @@ class TestMTCS(MTCSAsyncMock):
         self.mtcs.rem.mtptg.cmd_raDecTarget.start.assert_called()
         self.mtcs.rem.mtptg.cmd_poriginOffset.start.assert_not_awaited()
 
+    async def test_slew_icrs_rotator_feasibility_check(self) -> None:
+        await self.mtcs.enable()
+        await self.mtcs.assert_all_enabled()
+
+        self.mtcs.rotator_feasibility_check = True
+
+        name = "HD 185975"
+        ra = "20:28:18.74"
+        dec = "-87:28:19.9"
+        rot = 135.0
+
+        # Alternatives are 135, 315, -45, 225 and 45; only -45 and 45 are
+        # within the rotator limits.
+        radec_icrs = ICRS(Angle(ra, unit=units.hourangle), Angle(dec, unit=units.deg))
+        rot_angle_alternatives = self.mtcs.get_feasible_rot_angle_alternatives(
+            radec_icrs=radec_icrs,
+            rot_angle=rot,
+            rot_frame=self.mtcs.RotFrame.FIXED,
+            rot_track_frame=self.mtcs.RotFrame.FIXED,
+            time_on_target=600.0,
+        )
+        assert rot_angle_alternatives == [-45.0, 45.0]
+
+        await self.mtcs.slew_icrs(
+            ra=ra,
+            dec=dec,
+            rot=rot,
+            rot_type=RotType.Physical,
+            target_name=name,
+            time_on_target=600.0,
+        )
+
+        self.mtcs.rem.mtptg.cmd_raDecTarget.set.assert_called_once_with(
+            ra=Angle(ra, unit=units.hourangle).hour,
+            declination=Angle(dec, unit=units.deg).deg,
+            targetName=name,
+            frame=self.mtcs.CoordFrame.ICRS,
+            rotAngle=-45.0,
+            rotStartFrame=self.mtcs.RotFrame.FIXED,
+            rotTrackFrame=self.mtcs.RotFrame.FIXED,
+            azWrapStrategy=self.mtcs.WrapStrategy.MAXTIMEONTARGET,
+            timeOnTarget=600.0,
+            epoch=2000,
+            equinox=2000,
+            parallax=0,
+            pmRA=0,
+            pmDec=0,
+            rv=0,
+            dRA=0.0,
+            dDec=0.0,
+            rotMode=self.mtcs.RotMode.FIELD,
+        )
+
+    async def test_slew_icrs_plan(self) -> None:
+        await self.mtcs.enable()
+        await self.mtcs.assert_all_enabled()
+
+        name = "HD 185975"
+        ra = "20:28:18.74"
+        dec = "-87:28:19.9"
+        rot = 45.0
+
+        plan = await self.mtcs.prepare_slew(
+            ra=ra, dec=dec, rot=rot, rot_type=RotType.Physical, lead_time=10.0
+        )
+
+        assert plan.rot_angle.deg == pytest.approx(rot)
+        assert plan.rot_frame == self.mtcs.RotFrame.FIXED
+        assert plan.is_valid(plan.tai - 10.0)
+
+        with unittest.mock.patch.object(
+            self.mtcs, "_compute_slew_plan", wraps=self.mtcs._compute_slew_plan
+        ) as compute_slew_plan:
+            await self.mtcs.slew_icrs(
+                ra=ra,
+                dec=dec,
+                rot=rot,
+                rot_type=RotType.Physical,
+                target_name=name,
+                plan=plan,
+            )
+
+            compute_slew_plan.assert_not_called()
+
+            # Plan for a different rotation is ignored.
+            await self.mtcs.slew_icrs(
+                ra=ra,
+                dec=dec,
+                rot=0.0,
+                rot_type=RotType.Physical,
+                target_name=name,
+                plan=plan,
+            )
+
+            compute_slew_plan.assert_called_once()
+
+        self.mtcs.rem.mtptg.cmd_raDecTarget.set.assert_called_with(
+            ra=Angle(ra, unit=units.hourangle).hour,
+            declination=Angle(dec, unit=units.deg).deg,
+            targetName=name,
+            frame=self.mtcs.CoordFrame.ICRS,
+            rotAngle=0.0,
+            rotStartFrame=self.mtcs.RotFrame.FIXED,
+            rotTrackFrame=self.mtcs.RotFrame.FIXED,
+            azWrapStrategy=self.mtcs.WrapStrategy.MAXTIMEONTARGET,
+            timeOnTarget=0.0,
+            epoch=2000,
+            equinox=2000,
+            parallax=0,
+            pmRA=0,
+            pmDec=0,
+            rv=0,
+            dRA=0.0,
+            dDec=0.0,
+            rotMode=self.mtcs.RotMode.FIELD,
+        )
+
+    async def test_prepare_slew_parallactic_validity(self) -> None:
+        ra = "20:28:18.74"
+        dec = "-87:28:19.9"
+
+        plan = await self.mtcs.prepare_slew(
+            ra=ra, dec=dec, rot=0.0, rot_type=RotType.Parallactic
+        )
+
+        assert 0.0 <= plan.validity <= self.mtcs.slew_plan_validity
+
+        # The parallactic angle changes between any two samples, so the plan
+        # can only be used at the time it was computed for.
+        self.mtcs.slew_plan_rot_tolerance = 0.0
+
+        plan = await self.mtcs.prepare_slew(
+            ra=ra, dec=dec, rot=0.0, rot_type=RotType.Parallactic
+        )
+
+        assert plan.validity == 0.0
+
+        plan = await self.mtcs.prepare_slew(
+            ra=ra, dec=dec, rot=0.0, rot_type=RotType.Physical
+        )
+
+        assert plan.validity == self.mtcs.slew_plan_validity
+
     async def test_slew_icrs_rot_physical_sky(self) -> None:
         await self.mtcs.enable()
         await self.mtcs.assert_all_enabled()
@@ -834,6 +1074,128 @@ class TestMTCS(MTCSAsyncMock):
 
         assert self.mtcs.rem.mtdome.evt_azMotion.inPosition
 
+    async def test_monitor_position_streaming(self) -> None:
+        self.mtcs.monitor_position_streaming = True
+        self.mtcs.rem.mtdome.tel_azimuth.get.return_value = None
+
+        check = copy.copy(self.mtcs.check)
+        check.mtmount = False
+        check.mtrotator = False
+
+        self.mtcs._dome_az_in_position.clear()
+
+        monitor_position_task = asyncio.create_task(
+            self.mtcs.monitor_position(check=check)
+        )
+
+        try:
+            await asyncio.sleep(0.1)
+
+            # Samples arrive through the topic callback.
+            self.mtcs.rem.mtdome.tel_azimuth.callback(
+                types.SimpleNamespace(positionActual=10.0, positionCommanded=15.0)
+            )
+            assert not self.mtcs._dome_az_in_position.is_set()
+
+            self.mtcs.rem.mtdome.tel_azimuth.callback(
+                types.SimpleNamespace(positionActual=14.0, positionCommanded=15.0)
+            )
+            assert self.mtcs._dome_az_in_position.is_set()
+            assert not monitor_position_task.done()
+        finally:
+            monitor_position_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await monitor_position_task
+
+        self.mtcs.rem.mtdome.tel_azimuth.next.assert_not_called()
+
+    async def test_pre_position_dome(self) -> None:
+        await self.mtcs.enable()
+        await self.mtcs.assert_all_enabled()
+        await self.mtcs.enable_dome_following()
+
+        # Tolerance is 1.5 deg with a 0.5 deg margin.
+        assert self.mtcs.get_dome_pre_position_azimuth(
+            az=40.0, telescope_az=10.0
+        ) == pytest.approx(11.0)
+        assert self.mtcs.get_dome_pre_position_azimuth(
+            az=350.0, telescope_az=0.5
+        ) == pytest.approx(359.5)
+        assert self.mtcs.get_dome_pre_position_azimuth(
+            az=10.5, telescope_az=10.0
+        ) == pytest.approx(10.5)
+
+        with unittest.mock.patch.object(
+            self.mtcs,
+            "get_slew_position",
+            return_value=SlewPosition(az=10.0, el=60.0, rot=0.0, dome_az=10.0),
+        ):
+            dome_az = await self.mtcs.pre_position_dome(az=40.0)
+
+        assert dome_az == pytest.approx(11.0)
+        self.mtcs.rem.mtdometrajectory.cmd_setFollowingMode.set_start.assert_awaited_with(
+            enable=False, timeout=self.mtcs.fast_timeout
+        )
+        self.mtcs.rem.mtdome.cmd_moveAz.set_start.assert_awaited_with(
+            position=dome_az, velocity=0.0, timeout=self.mtcs.long_long_timeout
+        )
+        assert not await self.mtcs.check_dome_following()
+
+        await self.mtcs.slew_icrs(ra="20:28:18.74", dec="-87:28:19.9")
+
+        assert await self.mtcs.check_dome_following()
+
+        # Other telescope motions also resume dome following.
+        with unittest.mock.patch.object(
+            self.mtcs,
+            "get_slew_position",
+            return_value=SlewPosition(az=10.0, el=60.0, rot=0.0, dome_az=10.0),
+        ):
+            await self.mtcs.pre_position_dome(az=40.0)
+
+        assert not await self.mtcs.check_dome_following()
+
+        await self.mtcs.point_azel(az=40.0, el=60.0)
+
+        assert await self.mtcs.check_dome_following()
+
+        for move in (
+            self.mtcs.start_tracking,
+            functools.partial(self.mtcs.move_p2p_azel, az=40.0, el=60.0),
+        ):
+            with unittest.mock.patch.object(
+                self.mtcs,
+                "get_slew_position",
+                return_value=SlewPosition(az=10.0, el=60.0, rot=0.0, dome_az=10.0),
+            ):
+                await self.mtcs.pre_position_dome(az=40.0)
+
+            assert not await self.mtcs.check_dome_following()
+
+            await move()
+
+            assert await self.mtcs.check_dome_following()
+
+    async def test_pre_position_dome_without_dome_trajectory(self) -> None:
+        await self.mtcs.enable()
+        await self.mtcs.assert_all_enabled()
+        await self.mtcs.enable_dome_following()
+
+        self.mtcs.check.mtdometrajectory = False
+
+        with unittest.mock.patch.object(
+            self.mtcs,
+            "get_slew_position",
+            return_value=SlewPosition(az=10.0, el=60.0, rot=0.0, dome_az=10.0),
+        ):
+            await self.mtcs.pre_position_dome(az=40.0)
+
+        # Dome following was not disabled, so it is not resumed either.
+        assert not self.mtcs._dome_pre_positioned
+        self.mtcs.rem.mtdometrajectory.cmd_setFollowingMode.set_start.assert_awaited_with(
+            enable=True, timeout=self.mtcs.fast_timeout
+        )
+
     async def test_slew_dome_to_with_mtdometrajectory_ignored_and_following_enabled(
         self,
     ) -> None:
@@ -17,8 +17,13 @@
 # GNU General Public License for more details.
 #
 # You should have received a copy of the GNU General Public License
+import asyncio
+import math
+import os
+import tempfile
 import typing
 import unittest
+import unittest.mock
 
 import pytest
 from lsst.ts import salobj
@@ -27,7 +32,13 @@ from lsst.ts.observatory.control.remote_group import (
     Usages,
     UsagesResources,
 )
-from lsst.ts.observatory.control.utils import RemoteGroupTestCase
+from lsst.ts.observatory.control.utils import (
+    RemoteGroupTestCase,
+    RemotePool,
+    TrafficRecorder,
+    TrafficReplay,
+    UsageProfiler,
+)
 
 HB_TIMEOUT = 5  # Heartbeat timeout (sec)
 MAKE_TIMEOUT = 60  # Timeout for make_script (sec)
@@ -145,6 +156,500 @@ class TestBaseGroup(RemoteGroupTestCase, unittest.IsolatedAsyncioTestCase):
 
             await self.basegroup.assert_liveliness()
 
+    async def test_topic_cache(self) -> None:
+        async with self.make_group(
+            usage=Usages.StateTransition + Usages.MonitorHeartBeat
+        ):
+            self.basegroup.use_topic_cache = True
+
+            for comp in self.basegroup.components_attr:
+                with self.subTest(msg=f"Check cached state for {comp}.", comp=comp):
+                    ss = await self.basegroup.get_state(comp)
+                    assert ss == salobj.State.STANDBY
+                    await self.basegroup.get_heartbeat(comp)
+                    await self.basegroup.next_heartbeat(comp)
+
+            state_cache = self.basegroup.get_topic_cache("test_1", "evt_summaryState")
+
+            assert state_cache is self.basegroup.get_topic_cache(
+                "test_1", "evt_summaryState"
+            )
+
+            seq = state_cache.seq
+
+            check_state_task = asyncio.create_task(
+                self.basegroup.check_component_state(
+                    "test_1", desired_state=salobj.State.STANDBY
+                )
+            )
+
+            await self.basegroup.set_state(salobj.State.DISABLED, components=["test_1"])
+
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(check_state_task, timeout=HB_TIMEOUT)
+
+            assert state_cache.seq > seq
+            assert await self.basegroup.get_state("test_1") == salobj.State.DISABLED
+
+            with pytest.raises(RuntimeError):
+                self.basegroup.get_topic_cache("bad_1", "evt_summaryState")
+
+    async def test_lazy(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            lazy_group = RemoteGroup(
+                components=self.basegroup.components,
+                intended_usage=Usages.StateTransition,
+                lazy=True,
+            )
+
+            try:
+                assert lazy_group.start_task is None
+
+                for comp in lazy_group.components_attr:
+                    assert not lazy_group.is_remote_created(comp)
+
+                lazy_group.check.test_2 = False
+                lazy_group.check.test_3 = False
+                lazy_group.check.test_4 = False
+
+                await lazy_group.enable()
+
+                assert lazy_group.is_remote_created("test_1")
+                for comp in ["test_2", "test_3", "test_4"]:
+                    assert not lazy_group.is_remote_created(comp)
+
+                assert await lazy_group.get_state("test_1") == salobj.State.ENABLED
+
+                # Accessing a topic creates the remote and waits for it to
+                # start before sending the command.
+                await lazy_group.rem.test_2.cmd_start.start(timeout=HB_TIMEOUT)
+
+                assert lazy_group.is_remote_created("test_2")
+                assert await lazy_group.get_state("test_2") == salobj.State.DISABLED
+            finally:
+                await lazy_group.close()
+
+    async def test_usage_profiler(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            with UsageProfiler(self.basegroup) as profiler:
+                await self.basegroup.enable()
+                await self.basegroup.assert_liveliness()
+                with profiler.profile("custom"):
+                    await self.basegroup.rem.test_1.evt_heartbeat.next(
+                        flush=True, timeout=HB_TIMEOUT
+                    )
+
+            for comp in self.basegroup.components_attr:
+                assert isinstance(getattr(self.basegroup.rem, comp), salobj.Remote)
+
+            include = profiler.get_include("enable")
+
+            assert set(include) == set(self.basegroup.components_attr)
+            for comp in include:
+                assert "summaryState" in include[comp]
+                assert "start" in include[comp]
+                assert "enable" in include[comp]
+                assert "heartbeat" not in include[comp]
+
+            assert profiler.get_include("custom") == dict(test_1=["heartbeat"])
+
+            # The heartbeats are read in tasks created by assert_liveliness,
+            # which inherit its label.
+            assert profiler.get_include("assert_liveliness") == dict(
+                (comp, ["heartbeat"]) for comp in self.basegroup.components_attr
+            )
+
+            resources = self.basegroup.get_usages_resources_from_profile(
+                profiler, "custom"
+            )
+
+            assert resources.readonly
+            assert resources.include == {"heartbeat"}
+
+            # State transitions send commands through the hooks.
+            assert profiler.uses_commands("test_1", "enable")
+            assert not self.basegroup.get_usages_resources_from_profile(
+                profiler, "enable"
+            ).readonly
+
+            lazy_group = RemoteGroup(
+                components=self.basegroup.components,
+                intended_usage=Usages.StateTransition,
+                lazy=True,
+            )
+
+            try:
+                lazy_group.set_lazy_include(include)
+
+                await lazy_group.enable()
+
+                await lazy_group.assert_all_enabled()
+
+                with pytest.raises(RuntimeError):
+                    lazy_group.set_lazy_include(include)
+            finally:
+                await lazy_group.close()
+
+    async def test_tracing(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            tracer = self.basegroup.start_tracing(maxlen=100)
+
+            async with self.basegroup.trace_span("enable"):
+                await self.basegroup.enable()
+                await self.basegroup.settle(0.1, component="test_1")
+
+            assert self.basegroup.stop_tracing() is tracer
+            assert self.basegroup.tracer is None
+
+            for comp in self.basegroup.components_attr:
+                assert isinstance(getattr(self.basegroup.rem, comp), salobj.Remote)
+
+            traces = tracer.get_traces()
+
+            assert len(traces) == 1
+            assert traces[0]["name"] == "enable"
+            assert traces[0]["outcome"] == "ok"
+            assert traces[0]["duration"] > 0.1
+
+            children = traces[0]["children"]
+            child_names = {(child["component"], child["name"]) for child in children}
+            for comp in self.basegroup.components_attr:
+                assert (comp, "cmd_enable.start") in child_names
+            assert ("test_1", "settle") in child_names
+            assert all(child["outcome"] == "ok" for child in children)
+
+            assert len(tracer.to_records()) == len(tracer.spans) <= 100
+
+    async def test_remote_hooks(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            tracer = self.basegroup.start_tracing()
+            latency_model = self.basegroup.start_latency_model(min_samples=1)
+
+            # Hooks can be stopped in any order; the latency model keeps
+            # recording after the tracer is stopped.
+            self.basegroup.stop_tracing()
+
+            await self.basegroup.enable()
+
+            assert len(tracer.spans) == 0
+            assert latency_model.get_percentile("test_1", "cmd_start") is not None
+
+            self.basegroup.stop_latency_model()
+
+            assert self.basegroup.rem.hooks == []
+            for comp in self.basegroup.components_attr:
+                assert isinstance(getattr(self.basegroup.rem, comp), salobj.Remote)
+
+    async def test_snapshot(self) -> None:
+        async with self.make_group(
+            usage=Usages.StateTransition + Usages.MonitorHeartBeat
+        ):
+            snapshot = await self.basegroup.snapshot(
+                dict(
+                    (comp, ["evt_summaryState", "evt_heartbeat"])
+                    for comp in self.basegroup.components_attr
+                ),
+                timeout=HB_TIMEOUT,
+            )
+
+            assert snapshot.ok
+            for comp in self.basegroup.components_attr:
+                assert (
+                    snapshot.get(comp, "evt_summaryState").summaryState
+                    == salobj.State.STANDBY
+                )
+                assert snapshot.age(comp, "evt_heartbeat") >= 0.0
+
+            with pytest.raises(TypeError):
+                snapshot.samples["test_1"]["evt_heartbeat"] = None
+
+            # Heartbeats are published every second, so samples older than
+            # max_age must be replaced by a new one.
+            await asyncio.sleep(2.0)
+            fresh_snapshot = await self.basegroup.snapshot(
+                dict(test_1=["evt_heartbeat"]), max_age=1.5, timeout=HB_TIMEOUT
+            )
+            assert fresh_snapshot.age("test_1", "evt_heartbeat") < 2.0
+
+            self.basegroup.use_topic_cache = True
+            cached_snapshot = await self.basegroup.snapshot(
+                dict(test_1=["evt_summaryState"]), timeout=HB_TIMEOUT
+            )
+            assert cached_snapshot.ok
+
+            with pytest.raises(RuntimeError):
+                await self.basegroup.snapshot(dict(invalid=["evt_summaryState"]))
+
+    async def test_latency_model(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "latencies.json")
+
+                latency_model = self.basegroup.start_latency_model(
+                    path=path, min_samples=1, safety_factor=3.0, min_timeout=0.5
+                )
+
+                assert self.basegroup.get_timeout("test_1", "cmd_start", 10.0) == 10.0
+
+                await self.basegroup.enable()
+
+                for comp in self.basegroup.components_attr:
+                    duration = latency_model.get_percentile(comp, "cmd_start")
+                    assert duration is not None
+                    assert self.basegroup.get_timeout(
+                        comp, "cmd_start", 0.1
+                    ) == pytest.approx(max(duration * 3.0, 0.5))
+                    # The learned timeout never shortens the caller's.
+                    assert self.basegroup.get_timeout(comp, "cmd_start", 60.0) == 60.0
+
+                assert self.basegroup.stop_latency_model() is latency_model
+                assert self.basegroup.get_timeout("test_1", "cmd_start", 10.0) == 10.0
+
+                for comp in self.basegroup.components_attr:
+                    assert isinstance(getattr(self.basegroup.rem, comp), salobj.Remote)
+
+                assert os.path.exists(path)
+
+                new_latency_model = self.basegroup.start_latency_model(
+                    path=path, min_samples=1
+                )
+                try:
+                    assert new_latency_model.get_percentile(
+                        "test_1", "cmd_start", percentile=100.0
+                    ) == pytest.approx(
+                        latency_model.get_percentile(
+                            "test_1", "cmd_start", percentile=100.0
+                        )
+                    )
+                finally:
+                    self.basegroup.stop_latency_model()
+
+    async def test_shared(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            remote_pool = RemotePool.get_default()
+            num_remotes = remote_pool.num_remotes
+
+            group_all = RemoteGroup(
+                components=self.basegroup.components,
+                intended_usage=Usages.StateTransition,
+                shared=True,
+            )
+            group_subset = RemoteGroup(
+                components=self.basegroup.components[:2],
+                intended_usage=Usages.StateTransition,
+                shared=True,
+            )
+            group_all_closed = False
+
+            try:
+                await asyncio.gather(group_all.start_task, group_subset.start_task)
+
+                assert group_all.domain is group_subset.domain
+                assert remote_pool.num_remotes == num_remotes + self.ntest
+
+                for comp in group_subset.components_attr:
+                    assert getattr(group_subset.rem, comp) is getattr(
+                        group_all.rem, comp
+                    )
+
+                await group_all.close()
+                group_all_closed = True
+
+                # The remotes are still used by group_subset.
+                assert remote_pool.num_remotes == num_remotes + 2
+                for comp in group_subset.components_attr:
+                    assert await group_subset.get_state(comp) == salobj.State.STANDBY
+            finally:
+                if not group_all_closed:
+                    await group_all.close()
+                await group_subset.close()
+
+            assert remote_pool.num_remotes == num_remotes
+
+    async def test_traffic_recorder(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            recorder = TrafficRecorder(
+                self.basegroup,
+                components=["test_1"],
+                include=dict(test_1=["summaryState"]),
+            )
+
+            async with recorder:
+                await self.basegroup.enable()
+
+            assert isinstance(self.basegroup.rem.test_1, salobj.Remote)
+            assert len(recorder.samples[("test_1", "evt_summaryState")]) >= 2
+            assert {command["command"] for command in recorder.commands} >= {
+                "cmd_start",
+                "cmd_enable",
+            }
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "recording.npz")
+                recorder.write(path)
+                replay = TrafficReplay(path, speed=math.inf)
+
+            assert replay.components == ["test_1"]
+
+            replay.install(self.basegroup)
+            try:
+                async with replay:
+                    await replay.wait_done()
+
+                    assert (
+                        await self.basegroup.get_state("test_1") == salobj.State.ENABLED
+                    )
+                    await self.basegroup.rem.test_1.cmd_disable.start(
+                        timeout=self.basegroup.fast_timeout
+                    )
+            finally:
+                replay.uninstall()
+
+            assert isinstance(self.basegroup.rem.test_1, salobj.Remote)
+
+    async def test_set_state_dependencies(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            self.basegroup.state_transition_dependencies = dict(
+                test_2=["test_1"], test_3=["test_2"]
+            )
+            self.basegroup.max_concurrent_state_transitions = 2
+
+            dependencies = self.basegroup.get_state_transition_dependencies(
+                salobj.State.ENABLED, self.basegroup.components_attr
+            )
+
+            assert dependencies["test_2"] == ["test_1"]
+            assert dependencies["test_3"] == ["test_2"]
+            assert dependencies["test_4"] == []
+
+            dependencies = self.basegroup.get_state_transition_dependencies(
+                salobj.State.STANDBY, self.basegroup.components_attr
+            )
+
+            assert dependencies["test_1"] == ["test_2"]
+            assert dependencies["test_2"] == ["test_3"]
+
+            await self.basegroup.enable()
+            await self.basegroup.assert_all_enabled()
+
+            await self.basegroup.standby()
+
+            for comp in self.basegroup.components_attr:
+                assert await self.basegroup.get_state(comp) == salobj.State.STANDBY
+
+            self.basegroup.state_transition_dependencies["test_1"] = ["test_3"]
+
+            with pytest.raises(RuntimeError):
+                await self.basegroup.enable()
+
+    async def test_run_with_dependencies(self) -> None:
+        order = []
+
+        async def transition(name: str, fail: bool = False) -> str:
+            order.append(f"start {name}")
+            await asyncio.sleep(0.1)
+            order.append(f"end {name}")
+            if fail:
+                raise RuntimeError(f"Failed {name}.")
+            return name
+
+        results = await RemoteGroup._run_with_dependencies(
+            coroutines=dict(
+                a=transition("a"), b=transition("b"), c=transition("c", fail=True)
+            ),
+            dependencies=dict(a=["b"], b=[], c=[]),
+            max_concurrency=None,
+        )
+
+        assert results["a"] == "a"
+        assert results["b"] == "b"
+        assert isinstance(results["c"], RuntimeError)
+        assert order.index("end b") < order.index("start a")
+        assert order.index("start c") < order.index("end b")
+
+        order.clear()
+
+        results = await RemoteGroup._run_with_dependencies(
+            coroutines=dict(c=transition("c", fail=True), a=transition("a")),
+            dependencies=dict(a=["c"], c=[]),
+            max_concurrency=1,
+        )
+
+        assert isinstance(results["a"], RuntimeError)
+        assert "start a" not in order
+
+    async def test_plan_state_transition(self) -> None:
+        async with self.make_group(usage=Usages.StateTransition):
+            plan = await self.basegroup.plan_state_transition(salobj.State.ENABLED)
+
+            for comp in self.basegroup.components_attr:
+                assert plan[comp] == ["start", "enable"]
+
+            await self.basegroup.set_state(salobj.State.ENABLED, components=["test_1"])
+
+            plan = await self.basegroup.plan_state_transition(
+                salobj.State.ENABLED, components=["test_1", "test_2"]
+            )
+
+            assert plan == dict(test_1=[], test_2=["start", "enable"])
+
+            plan = await self.basegroup.plan_state_transition(salobj.State.STANDBY)
+
+            assert plan["test_1"] == ["disable", "standby"]
+            assert plan["test_2"] == []
+
+            await self.basegroup.enable()
+            await self.basegroup.assert_all_enabled()
+
+            # Re-enabling a healthy group should not send any command.
+            with unittest.mock.patch.object(
+                salobj, "set_summary_state", side_effect=RuntimeError("Unexpected.")
+            ):
+                await self.basegroup.enable()
+
+    async def test_liveliness_monitor(self) -> None:
+        async with self.make_group(
+            usage=Usages.StateTransition + Usages.MonitorHeartBeat
+        ):
+            with pytest.raises(RuntimeError):
+                self.basegroup.liveliness()
+
+            silent_components: typing.List[str] = []
+
+            liveliness_monitor = self.basegroup.start_liveliness_monitor(timeout=3.0)
+            liveliness_monitor.subscribe(silent_components.append)
+
+            await asyncio.sleep(2.0)
+
+            liveliness = self.basegroup.liveliness()
+
+            assert set(liveliness) == set(self.basegroup.components_attr)
+            assert all(liveliness.values())
+
+            await self.basegroup.assert_liveliness()
+
+            # The heartbeat topic is now read through the cache.
+            await self.basegroup.next_heartbeat("test_1")
+
+            check_heartbeat_task = asyncio.create_task(
+                self.basegroup.check_comp_heartbeat("test_1")
+            )
+
+            await self.basegroup.set_state(salobj.State.OFFLINE, components=["test_1"])
+
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(check_heartbeat_task, timeout=HB_TIMEOUT * 2)
+
+            assert silent_components == ["test_1"]
+            assert not self.basegroup.liveliness()["test_1"]
+
+            with pytest.raises(AssertionError):
+                await self.basegroup.assert_liveliness()
+
+            await self.basegroup.stop_liveliness_monitor()
+
+            assert self.basegroup.liveliness_monitor is None
+
     async def test_assert_enabled(self) -> None:
         async with self.make_group(
             usage=Usages.StateTransition + Usages.MonitorHeartBeat
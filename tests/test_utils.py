@@ -19,14 +19,37 @@
 # You should have received a copy of the GNU General Public License
 
 import asyncio
+import math
+import pathlib
+import tempfile
+import time
+import types
+import typing
 import unittest
 
 import astropy.units as u
+import numpy as np
 import pytest
 from astropy.coordinates import ICRS, Angle, EarthLocation
 from lsst.ts.observatory.control.utils import (
+    AxisLimits,
+    CatalogIndex,
+    LatencyModel,
+    LivelinessMonitor,
+    NameResolverCache,
+    RemoteNamespace,
+    SlewPosition,
+    SlewTimeModel,
+    TaskSupervisor,
+    TimeService,
+    TopicCache,
+    VirtualClock,
     calculate_parallactic_angle,
+    convert_catalog,
+    get_catalogs_path,
     handle_exception_in_dict_items,
+    order_by_cost,
+    read_catalog,
 )
 from lsst.ts.utils import astropy_time_from_tai_unix, current_tai
 
@@ -88,3 +111,441 @@ class TestUtils(unittest.TestCase):
                 object_with_two_exceptions_to_handle,
                 "Proving some additional message for the exception.",
             )
+
+    def test_convert_catalog(self) -> None:
+        catalog_path = get_catalogs_path() / "hd_catalog_6th_mag.pd"
+        catalog = read_catalog(catalog_path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = convert_catalog(
+                catalog_path, pathlib.Path(tmp_dir) / "hd_catalog_6th_mag.npy"
+            )
+
+            converted_catalog = read_catalog(output_path)
+
+            assert converted_catalog.colnames == catalog.colnames
+            assert len(converted_catalog) == len(catalog)
+            assert list(converted_catalog["MAIN_ID"]) == list(catalog["MAIN_ID"])
+            assert np.allclose(
+                Angle(converted_catalog["RA"], unit=u.hourangle).deg,
+                Angle(catalog["RA"], unit=u.hourangle).deg,
+            )
+            assert np.allclose(converted_catalog["FLUX_V"], catalog["FLUX_V"])
+
+            del converted_catalog
+
+
+class TestTaskSupervisor(unittest.IsolatedAsyncioTestCase):
+    async def test_first_completed(self) -> None:
+        async with TaskSupervisor(name="test") as supervisor:
+            fast_task = supervisor.create_task(asyncio.sleep(0.1, "fast"), "fast")
+            slow_task = supervisor.create_task(asyncio.sleep(10.0), "slow")
+
+            results = await supervisor.wait(return_when=TaskSupervisor.FIRST_COMPLETED)
+
+            assert results == dict(fast="fast")
+            assert fast_task.done()
+            assert not slow_task.done()
+            assert supervisor.pending == ["slow"]
+
+        # Leaving the context cancels and awaits the pending tasks.
+        assert slow_task.cancelled()
+        assert set(supervisor.timings) == {"fast", "slow"}
+        assert supervisor.timings["fast"] == pytest.approx(0.1, abs=0.1)
+
+    async def test_cancel_pending(self) -> None:
+        async with TaskSupervisor() as supervisor:
+            supervisor.create_task(asyncio.sleep(0.1), "fast")
+            slow_task = supervisor.create_task(asyncio.sleep(10.0), "slow")
+            other_task = supervisor.create_task(asyncio.sleep(10.0), "other")
+
+            await supervisor.wait(
+                ["fast", "slow"],
+                return_when=TaskSupervisor.FIRST_COMPLETED,
+                cancel_pending=True,
+            )
+
+            assert slow_task.cancelled()
+            assert not other_task.done()
+
+    async def test_exception_cancels_all(self) -> None:
+        async def fail() -> None:
+            await asyncio.sleep(0.1)
+            raise RuntimeError("Failed.")
+
+        supervisor = TaskSupervisor()
+
+        with pytest.raises(RuntimeError, match="Failed."):
+            async with supervisor:
+                supervisor.create_task(fail(), "fail")
+                slow_task = supervisor.create_task(asyncio.sleep(10.0), "slow")
+                other_task = supervisor.create_task(asyncio.sleep(10.0), "other")
+                await supervisor.wait(["fail", "slow"])
+
+        assert slow_task.cancelled()
+        assert other_task.cancelled()
+
+    async def test_exception_without_wait(self) -> None:
+        async def fail() -> None:
+            await asyncio.sleep(0.1)
+            raise RuntimeError("Failed.")
+
+        supervisor = TaskSupervisor()
+
+        with pytest.raises(RuntimeError, match="Failed."):
+            async with supervisor:
+                supervisor.create_task(fail(), "fail")
+                slow_task = supervisor.create_task(asyncio.sleep(10.0), "slow")
+                await asyncio.sleep(0.5)
+
+                # The sibling is cancelled although nobody is waiting.
+                assert slow_task.cancelled()
+
+    async def test_duplicated_name(self) -> None:
+        async with TaskSupervisor() as supervisor:
+            supervisor.create_task(asyncio.sleep(0.1), "task")
+
+            with pytest.raises(RuntimeError):
+                supervisor.create_task(asyncio.sleep(0.1), "task")
+
+
+class TestLatencyModel(unittest.IsolatedAsyncioTestCase):
+    async def test_timeouts(self) -> None:
+        timeouts = []
+
+        class Command:
+            duration = 0.2
+
+            async def start(
+                self,
+                data: typing.Any = None,
+                timeout: float = 1.0,
+                wait_done: bool = True,
+            ) -> None:
+                timeouts.append(timeout)
+                await asyncio.sleep(min(timeout, self.duration))
+                if timeout < self.duration:
+                    raise asyncio.TimeoutError()
+
+        rem = RemoteNamespace(test=types.SimpleNamespace(cmd_move=Command()))
+        group = types.SimpleNamespace(
+            rem=rem,
+            add_remote_hook=rem.add_hook,
+            remove_remote_hook=rem.remove_hook,
+        )
+        latency_model = LatencyModel(
+            group, min_samples=1, safety_factor=2.0, min_timeout=0.0
+        )
+
+        assert not latency_model.apply_timeouts
+
+        latency_model.apply_timeouts = True
+        latency_model.start()
+
+        # A timeout is recorded as a lower bound of the duration.
+        with pytest.raises(asyncio.TimeoutError):
+            await rem.test.cmd_move.start(None, 0.1)
+
+        assert latency_model.get_percentile("test", "cmd_move") >= 0.1
+
+        # The learned timeout extends the (positional) timeout of the caller
+        # but never shortens it.
+        await rem.test.cmd_move.start(None, 0.1)
+        await rem.test.cmd_move.start(timeout=10.0)
+
+        assert timeouts[1] >= 0.2
+        assert timeouts[2] == 10.0
+
+        latency_model.stop()
+
+        assert rem.hooks == []
+
+
+class TestLivelinessMonitor(unittest.IsolatedAsyncioTestCase):
+    async def test_virtual_clock(self) -> None:
+        clock = VirtualClock(start_tai=1000.0)
+        topic = types.SimpleNamespace(callback=None, get=lambda: None)
+        heartbeat_cache = TopicCache(topic, name="heartbeat")
+        heartbeat_cache.register()
+
+        monitor = LivelinessMonitor(timeout=3.0, clock=clock)
+        monitor.add_component("test", heartbeat_cache)
+        silent_at = []
+        monitor.subscribe(lambda component: silent_at.append(clock.time()))
+        monitor.start()
+
+        async def send_heartbeats() -> None:
+            for _ in range(5):
+                topic.callback(object())
+                await clock.sleep(1.0)
+
+        await send_heartbeats()
+        await monitor.wait_silent("test")
+
+        # Silence is detected at the deadline, one timeout after the last
+        # heartbeat (sent at t=4).
+        assert silent_at == [pytest.approx(7.0)]
+        assert not monitor.liveliness()["test"]
+
+        topic.callback(object())
+        assert monitor.liveliness()["test"]
+
+        wait_task = asyncio.create_task(monitor.wait_silent("test"))
+        await asyncio.sleep(0)
+        await monitor.stop()
+
+        with pytest.raises(RuntimeError):
+            await wait_task
+
+
+class TestVirtualClock(unittest.IsolatedAsyncioTestCase):
+    async def test_sleep(self) -> None:
+        clock = VirtualClock(start_tai=1000.0)
+        wake_times = []
+
+        async def sleeper(delay: float) -> None:
+            await clock.sleep(delay)
+            wake_times.append(clock.time())
+
+        await asyncio.wait_for(
+            asyncio.gather(sleeper(3600.0), sleeper(60.0), sleeper(600.0)),
+            timeout=5.0,
+        )
+
+        assert wake_times == [60.0, 600.0, 3600.0]
+        assert clock.time() == 3600.0
+        assert clock.tai() == 4600.0
+
+    async def test_wait_for(self) -> None:
+        clock = VirtualClock()
+        event = asyncio.Event()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(clock.wait_for(event.wait(), timeout=300.0), 5.0)
+
+        assert clock.time() == 300.0
+
+        async def set_event() -> None:
+            await clock.sleep(10.0)
+            event.set()
+
+        set_event_task = asyncio.create_task(set_event())
+        assert await clock.wait_for(event.wait(), timeout=300.0)
+        await set_event_task
+
+        assert clock.time() == 310.0
+
+    async def test_wait_for_real_work(self) -> None:
+        clock = VirtualClock()
+        sleep_task = asyncio.create_task(clock.sleep(100.0))
+
+        # Real work does not take virtual time, so it is not timed out.
+        assert await clock.wait_for(asyncio.sleep(0.2, "done"), timeout=1.0) == "done"
+
+        loop = asyncio.get_running_loop()
+        await clock.wait_for(loop.run_in_executor(None, time.sleep, 0.2), timeout=1.0)
+
+        assert clock.time() == 0.0
+
+        await asyncio.wait_for(sleep_task, timeout=5.0)
+
+        assert clock.time() == 100.0
+
+
+class TestTimeService(unittest.TestCase):
+    def test_get_lst(self) -> None:
+        location = EarthLocation.from_geodetic(
+            lon=-70.747698 * u.deg, lat=-30.244728 * u.deg, height=2663.0 * u.m
+        )
+        time_service = TimeService(location=location)
+
+        tai = current_tai() + np.linspace(0.0, 12.0 * 3600.0, 37)
+
+        lst = time_service.get_lst(tai)
+
+        expected_lst = time_service.get_time(tai).sidereal_time("mean")
+
+        assert lst.shape == tai.shape
+        lst_diff = (lst - expected_lst).wrap_at(12 * u.hourangle)
+        assert np.max(np.abs(lst_diff.arcsec)) < 1e-2
+
+        # Times outside the grid extend it.
+        tai_next_day = current_tai() + 36.0 * 3600.0
+        lst = time_service.get_lst(tai_next_day)
+        expected_lst = time_service.get_time(tai_next_day).sidereal_time("mean")
+
+        assert abs((lst - expected_lst).wrap_at(12 * u.hourangle).arcsec) < 1e-2
+
+    def test_prepare_extends_grid(self) -> None:
+        location = EarthLocation.from_geodetic(
+            lon=-70.747698 * u.deg, lat=-30.244728 * u.deg, height=2663.0 * u.m
+        )
+        time_service = TimeService(location=location, step=60.0, duration=3600.0)
+
+        tai = current_tai()
+        time_service.prepare(tai)
+        assert time_service._grid is not None
+        grid_start = time_service._grid[0][0]
+
+        # A time just past the end of the grid only adds points to it.
+        tai_next = time_service._grid[0][-1] + 1800.0
+        lst = time_service.get_lst(tai_next)
+        expected_lst = time_service.get_time(tai_next).sidereal_time("mean")
+
+        grid_tai = time_service._grid[0]
+        assert grid_tai[0] == grid_start
+        assert grid_tai[-1] >= tai_next
+        assert np.allclose(np.diff(grid_tai), 60.0)
+        assert abs((lst - expected_lst).wrap_at(12 * u.hourangle).arcsec) < 1e-2
+
+
+class TestCatalogIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(42)
+        self.ra = rng.uniform(0.0, 360.0, 10000)
+        self.dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, 10000)))
+        self.mag = rng.uniform(0.0, 10.0, 10000)
+        self.catalog_index = CatalogIndex(ra=self.ra, dec=self.dec, mag=self.mag)
+        self.coordinates = ICRS(ra=self.ra * u.deg, dec=self.dec * u.deg)
+
+    def get_separations(self, ra: float, dec: float) -> np.ndarray:
+        return ICRS(ra=ra * u.deg, dec=dec * u.deg).separation(self.coordinates).deg
+
+    def test_cone_search(self) -> None:
+        indices, separations = self.catalog_index.cone_search(
+            ra=120.0, dec=-30.0, radius=5.0, mag_min=4.0, mag_max=6.0
+        )
+
+        all_separations = self.get_separations(120.0, -30.0)
+        expected_indices = np.where(
+            (all_separations <= 5.0) & (self.mag >= 4.0) & (self.mag <= 6.0)
+        )[0]
+
+        assert set(indices) == set(expected_indices)
+        assert np.all(np.diff(separations) >= 0.0)
+        assert separations == pytest.approx(all_separations[indices])
+
+    def test_nearest(self) -> None:
+        all_separations = self.get_separations(120.0, -30.0)
+        mask = (self.mag >= 4.0) & (self.mag <= 6.0)
+        expected_index = np.where(mask)[0][np.argmin(all_separations[mask])]
+
+        for radius in (0.01, 10.0):
+            index, separation = self.catalog_index.nearest(
+                ra=120.0, dec=-30.0, mag_min=4.0, mag_max=6.0, radius=radius
+            )
+
+            assert index == expected_index
+            assert separation == pytest.approx(all_separations[expected_index])
+
+        assert (
+            self.catalog_index.nearest(ra=120.0, dec=-30.0, mag_min=11.0, mag_max=12.0)
+            is None
+        )
+        assert self.catalog_index.count_in_mag_range(4.0, 6.0) == np.sum(mask)
+
+
+class TestSlewTimeModel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = SlewTimeModel(
+            az=AxisLimits(velocity=2.0, acceleration=1.0),
+            el=AxisLimits(velocity=1.0, acceleration=1.0),
+            rot=AxisLimits(velocity=1.0, acceleration=0.5),
+            dome=AxisLimits(velocity=1.5, acceleration=0.5),
+            settle_time=3.0,
+        )
+
+    def test_move_time(self) -> None:
+        axis = AxisLimits(velocity=2.0, acceleration=1.0)
+
+        # Short move, never reaches the maximum velocity.
+        assert axis.move_time(1.0) == pytest.approx(2.0)
+        # Long move, 2s to accelerate and decelerate, 4 deg.
+        assert axis.move_time(-24.0) == pytest.approx(14.0)
+
+    def test_estimate(self) -> None:
+        start = SlewPosition(az=350.0, el=60.0, rot=0.0, dome_az=350.0)
+
+        slew_time = self.model.estimate(start, az=[10.0, 350.0], el=60.0, rot=0.0)
+
+        # Azimuth moves 20 deg across 0, dome is the slowest.
+        assert slew_time == pytest.approx(
+            [float(self.model.dome.move_time(20.0)) + 3.0, 3.0]
+        )
+
+    def test_order(self) -> None:
+        start = SlewPosition(az=0.0, el=60.0, rot=0.0, dome_az=0.0)
+        az = np.array([30.0, 10.0, 40.0, 20.0])
+
+        cost = self.model.get_cost_matrix(
+            start, az=az, el=np.full(4, 60.0), rot=np.zeros(4)
+        )
+
+        assert cost.shape == (5, 5)
+        assert cost[0, 2] == pytest.approx(
+            float(self.model.estimate(start, az=10.0, el=60.0, rot=0.0))
+        )
+        assert order_by_cost(cost) == [1, 3, 0, 2]
+
+    def test_fit(self) -> None:
+        rng = np.random.default_rng(42)
+        fit_model = SlewTimeModel(
+            az=AxisLimits(velocity=3.0, acceleration=1.5),
+            el=AxisLimits(velocity=1.5, acceleration=1.5),
+            rot=AxisLimits(velocity=1.5, acceleration=0.75),
+            dome=AxisLimits(velocity=2.0, acceleration=0.75),
+            settle_time=5.0,
+        )
+
+        assert not fit_model.fit()
+
+        for _ in range(100):
+            start = SlewPosition(*rng.uniform([0, 20, -90, 0], [360, 90, 90, 360]))
+            end = SlewPosition(*rng.uniform([0, 20, -90, 0], [360, 90, 90, 360]))
+            duration = float(
+                self.model.estimate(start, az=end.az, el=end.el, rot=end.rot)
+            )
+            fit_model.add_record(start, end, duration)
+
+        assert fit_model.n_records == 100
+        assert fit_model.fit()
+
+        start = SlewPosition(az=0.0, el=30.0, rot=0.0, dome_az=0.0)
+        az = rng.uniform(0.0, 360.0, 20)
+        el = rng.uniform(20.0, 90.0, 20)
+        rot = rng.uniform(-90.0, 90.0, 20)
+        assert fit_model.estimate(start, az=az, el=el, rot=rot) == pytest.approx(
+            self.model.estimate(start, az=az, el=el, rot=rot), rel=0.05
+        )
+
+
+class TestNameResolverCache(unittest.TestCase):
+    def test_name_resolver_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir) / "cache" / "name_resolver.sqlite"
+            cache = NameResolverCache(path=path, ttl=0.1)
+
+            cache.put("HD 185975", ra=307.0, dec=-87.5)
+            cache.put("HD 1", ra=1.0, dec=2.0, ttl=math.inf)
+            assert cache.seed([("HD 2", 3.0, 4.0)]) == 1
+
+            assert cache.get("HD 185975") == (307.0, -87.5)
+            assert cache.get("unknown") is None
+
+            time.sleep(0.2)
+
+            assert cache.get("HD 185975") is None
+            assert cache.get("HD 185975", allow_expired=True) == (307.0, -87.5)
+            assert cache.get("HD 1") == (1.0, 2.0)
+            assert cache.get("HD 2") == (3.0, 4.0)
+
+            # A cache using the same file sees the same entries.
+            other_cache = NameResolverCache(path=path)
+            assert other_cache.names() == {"HD 185975", "HD 1", "HD 2"}
+
+            cache.clear(expired_only=True)
+            assert other_cache.names() == {"HD 1", "HD 2"}
+
+            cache.remove("HD 1")
+            cache.clear()
+            assert other_cache.names() == set()